@@ -1,8 +1,31 @@
-from typing import Optional
-
-from simplini.core import IniConfigBase, IniConfigOption, IniConfigSection, IniFlavour
+from simplini.config import IniConfig
+from simplini.converters import register_converter
+from simplini.core import (
+    ConversionError,
+    IniConfigBase,
+    IniConfigOption,
+    IniConfigSection,
+    IniFlavour,
+    KeyCollisionError,
+)
+from simplini.diffing import diff, merge3
+from simplini.events import Subscription
+from simplini.frozen import FrozenIniConfig
+from simplini.interning import InterningPool
+from simplini.interpolation import (
+    InterpolationCycleError,
+    InterpolationError,
+    Interpolator,
+)
+from simplini.overlay import EnvironmentOption, EnvironmentOverlay
 from simplini.parser import IniParser, ParsingError
+from simplini.rcu import ConcurrentIniConfig
 from simplini.renderer import IniConfigRenderer
+from simplini.schema import Schema, SchemaValidationError
+from simplini.stack import IniConfigStack
+from simplini.stream import IniStreamWriter
+from simplini.tracing import AccessTracer
+from simplini.watch import awatch
 
 __all__ = [
     "IniFlavour",
@@ -10,33 +33,28 @@ __all__ = [
     "IniConfigSection",
     "IniConfigOption",
     "ParsingError",
+    "IniStreamWriter",
+    "ConversionError",
+    "register_converter",
+    "Schema",
+    "SchemaValidationError",
+    "IniConfigStack",
+    "diff",
+    "merge3",
+    "KeyCollisionError",
+    "Interpolator",
+    "InterpolationError",
+    "InterpolationCycleError",
+    "EnvironmentOverlay",
+    "EnvironmentOption",
+    "InterningPool",
+    "FrozenIniConfig",
+    "ConcurrentIniConfig",
+    "Subscription",
+    "AccessTracer",
+    "awatch",
+    # kept importable from the package root for backward compatibility
+    "IniConfigBase",
+    "IniParser",
+    "IniConfigRenderer",
 ]
-
-
-class IniConfig(IniConfigBase):
-    def __init__(self) -> None:
-        super().__init__()
-        self.encoding = "utf-8"
-        self.flavour = IniFlavour()
-        self.renderer: IniConfigRenderer = IniConfigRenderer()
-
-    def save(self, path: str) -> None:
-        with open(path, "w", encoding=self.encoding) as file:
-            self.renderer.render(file, self, self.flavour)
-
-    @staticmethod
-    def load(
-        path: str,
-        encoding: str = "utf-8",
-        parser: Optional[IniParser] = None,
-        flavour: Optional[IniFlavour] = None,
-    ) -> "IniConfig":
-        parser = parser or IniParser()
-
-        # note that by default text reader will translate new lines into
-        # LF-style even on Windows with CRLF new lines
-        with open(path, "r", encoding=encoding) as file:
-            config = IniConfig()
-            config.flavour = flavour or IniFlavour()
-            parser.parse(file, config, config.flavour)
-            return config
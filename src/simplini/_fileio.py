@@ -0,0 +1,100 @@
+import hashlib
+import os
+import tempfile
+from typing import Optional, Tuple
+
+CHUNK_SIZE = 64 * 1024
+
+
+def file_digest(path: str) -> bytes:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.digest()
+
+
+def has_same_content(path: str, data: bytes) -> bool:
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return False
+
+    # cheap check first, files of different size can not be the same
+    if size != len(data):
+        return False
+
+    return file_digest(path) == hashlib.sha256(data).digest()
+
+
+# flags of the temp file, binary mode matters on Windows only
+TEMP_FILE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+
+
+def create_temp_file(path: str) -> Tuple[int, str]:
+    # unlike mkstemp, the file is created with the default mode the new files
+    # get, the kernel applies umask, so that there is no need to read it
+    directory, name = os.path.split(path)
+    for _ in range(tempfile.TMP_MAX):
+        temp_path = os.path.join(directory, f".{name}.{os.urandom(6).hex()}.tmp")
+        try:
+            return os.open(temp_path, TEMP_FILE_FLAGS, 0o666), temp_path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No usable temporary file name found for {path}")
+
+
+def fsync_directory(path: str) -> None:
+    # directories can not be opened on Windows, and rename is durable there
+    if os.name == "nt":
+        return
+
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    path = os.path.abspath(path)
+    directory = os.path.dirname(path)
+
+    # mode of the existing file is kept
+    try:
+        mode: Optional[int] = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = None
+
+    # temp file has to be in the same directory, otherwise replace
+    # is not guaranteed to be atomic (or even possible)
+    fd, temp_path = create_temp_file(path)
+
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        if mode is not None:
+            os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+    fsync_directory(directory)
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    # changes whenever the file is written or replaced, None when missing
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
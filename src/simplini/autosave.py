@@ -0,0 +1,186 @@
+import atexit
+import logging
+import threading
+import time
+from typing import Callable, Dict, Generic, Optional
+
+from simplini.core import UNNAMED_SECTION_NAME, ConfigT
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Autosaver:
+    # Coalesces the changes and saves them from the background thread once
+    # there were no changes for "debounce" seconds, but no later than
+    # "max_delay" seconds after the first unsaved change, so that the amount of
+    # writes is bounded regardless of how often the values change.
+    def __init__(
+        self,
+        save_fn: Callable[[], None],
+        debounce: float = 1.0,
+        max_delay: float = 5.0,
+    ):
+        if debounce < 0 or max_delay < debounce:
+            raise ValueError("Expected 0 <= debounce <= max_delay")
+
+        self.save_fn = save_fn
+        self.debounce = debounce
+        self.max_delay = max_delay
+
+        self.condition = threading.Condition()
+        # serializes the saves from the background thread and explicit flushes
+        self.save_lock = threading.Lock()
+
+        self.dirty = False
+        self.first_change_at: Optional[float] = None
+        self.last_change_at: Optional[float] = None
+        self.closed = False
+
+        self.thread = threading.Thread(
+            target=self.run,
+            name="simplini-autosave",
+            daemon=True,
+        )
+        self.thread.start()
+
+        atexit.register(self.flush)
+
+    def mark_dirty(self) -> None:
+        with self.condition:
+            now = time.monotonic()
+            if not self.dirty:
+                self.dirty = True
+                self.first_change_at = now
+            self.last_change_at = now
+            self.condition.notify()
+
+    def save_due_at(self) -> float:
+        assert self.first_change_at is not None
+        assert self.last_change_at is not None
+        return min(
+            self.last_change_at + self.debounce,
+            self.first_change_at + self.max_delay,
+        )
+
+    def run(self) -> None:
+        with self.condition:
+            while not self.closed:
+                if not self.dirty:
+                    self.condition.wait()
+                    continue
+
+                delay = self.save_due_at() - time.monotonic()
+
+                if delay > 0:
+                    self.condition.wait(delay)
+                    continue
+
+                # do not hold the condition while saving, so that changes are
+                # not blocked by the disk writes
+                self.condition.release()
+                try:
+                    self.flush(background=True)
+                finally:
+                    self.condition.acquire()
+
+    def flush(self, background: bool = False) -> bool:
+        # returns whether anything was saved
+        with self.save_lock:
+            with self.condition:
+                if not self.dirty:
+                    return False
+                self.dirty = False
+                self.first_change_at = self.last_change_at = None
+
+            try:
+                self.save_fn()
+            except Exception:
+                # changes are still pending, retry no earlier than in
+                # "max_delay" seconds unless there are new changes
+                with self.condition:
+                    now = time.monotonic()
+                    if not self.dirty:
+                        self.dirty = True
+                        self.first_change_at = now
+                        self.last_change_at = now + self.max_delay
+
+                if not background:
+                    raise
+
+                LOGGER.exception("autosave failed, will retry")
+
+                return False
+
+            return True
+
+    def close(self, flush: bool = True) -> None:
+        atexit.unregister(self.flush)
+
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+        self.thread.join()
+
+        if flush:
+            self.flush()
+
+
+class ConfigSnapshot(Generic[ConfigT]):
+    # Copy-on-write clone of the config, so that the background thread renders
+    # a consistent state and never reads the config while it is being
+    # modified. The changes only record the names of the changed sections,
+    # which are cloned once per save under the write lock of the config.
+    def __init__(self, config: ConfigT):
+        config.enable_write_lock()
+        self.config = config
+        self.copy = config.clone()
+        # names of the changed sections, in the order of the changes
+        self.dirty: Dict[str, None] = {}
+        # set when the sections were moved or renamed
+        self.stale = False
+
+    def mark(self, section_name: str) -> None:
+        with self.config.write_locked():
+            self.dirty[section_name] = None
+
+    def invalidate(self) -> None:
+        with self.config.write_locked():
+            self.stale = True
+
+    def take(self) -> ConfigT:
+        config = self.config
+        with config.write_locked():
+            if self.stale:
+                self.copy = config.clone()
+            else:
+                self.sync()
+            self.stale = False
+            self.dirty.clear()
+            # rendered without holding the lock
+            return self.copy.clone()
+
+    def sync(self) -> None:
+        config = self.config
+        copy = self.copy
+        for section_name in self.dirty:
+            if section_name == UNNAMED_SECTION_NAME:
+                section = config.unnamed_section
+            else:
+                section = config.sections.get(section_name)
+
+            if section is None:
+                copy.sections.pop(section_name, None)
+                continue
+
+            cloned = section.clone()
+            cloned.owner = copy
+            if section_name == UNNAMED_SECTION_NAME:
+                copy.unnamed_section = cloned
+            else:
+                copy.sections[section_name] = cloned
+
+        trailing_comment = config.trailing_comment
+        copy.trailing_comment = (
+            None if trailing_comment is None else list(trailing_comment)
+        )
@@ -0,0 +1,352 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import io
+import os
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
+
+from simplini._fileio import file_signature, has_same_content, write_atomic
+from simplini.autosave import Autosaver, ConfigSnapshot
+from simplini.core import IniConfigBase, IniFlavour, SimpliniError, Transaction
+from simplini.frozen import FrozenIniConfig
+from simplini.journal import JOURNAL_SUFFIX, IniJournal
+from simplini.parser import IniParser
+from simplini.query import QueryIndex, QueryResult
+from simplini.renderer import IniConfigRenderer, RenderPlan
+
+# loads running in the executors, shared by the concurrent aload calls
+IN_FLIGHT_LOADS: Dict[Tuple, asyncio.Future] = {}
+
+
+class IniConfig(IniConfigBase):
+    def __init__(self) -> None:
+        super().__init__()
+        self.encoding = "utf-8"
+        self.flavour = IniFlavour()
+        self.renderer: IniConfigRenderer = IniConfigRenderer()
+        self.autosaver: Optional[Autosaver] = None
+        self.autosave_snapshot: Optional[ConfigSnapshot["IniConfig"]] = None
+        self.journal: Optional[IniJournal] = None
+        # file the config was loaded from, used for reloading
+        self.path: Optional[str] = None
+        # built on the first query
+        self.query_index: Optional[QueryIndex] = None
+
+    def empty_copy(self) -> "IniConfig":
+        # autosave, journal and the path are not inherited
+        config = IniConfig()
+        config.encoding = self.encoding
+        config.flavour = self.flavour
+        config.renderer = self.renderer
+        return config
+
+    def freeze(self) -> FrozenIniConfig:
+        return FrozenIniConfig(self)
+
+    def enable_autosave(
+        self,
+        path: str,
+        debounce: float = 1.0,
+        max_delay: float = 5.0,
+        atomic: bool = True,
+    ) -> None:
+        # changes are saved from the background thread after "debounce"
+        # seconds of inactivity, but no later than "max_delay" seconds after
+        # the first unsaved change; pending changes are also saved on exit
+        if self.autosaver is not None:
+            raise SimpliniError("Autosave is already enabled")
+
+        snapshot = ConfigSnapshot(self)
+
+        def save() -> None:
+            snapshot.take().save(path, atomic=atomic, skip_unchanged=True)
+
+        self.autosaver = Autosaver(save, debounce=debounce, max_delay=max_delay)
+        self.autosave_snapshot = snapshot
+        self.add_change_listener(self.on_change_autosave)
+        self.add_structure_listener(self.mark_dirty)
+
+    def disable_autosave(self, flush: bool = True) -> None:
+        if self.autosaver is None:
+            return
+
+        self.remove_change_listener(self.on_change_autosave)
+        self.remove_structure_listener(self.mark_dirty)
+        autosaver, self.autosaver = self.autosaver, None
+        self.autosave_snapshot = None
+        autosaver.close(flush=flush)
+
+    def on_change_autosave(self, section_name: str, option_name: Optional[str]):
+        assert self.autosaver is not None
+        assert self.autosave_snapshot is not None
+        self.autosave_snapshot.mark(section_name)
+        self.autosaver.mark_dirty()
+
+    def mark_dirty(self) -> None:
+        # changes done directly to the options or comments are not tracked,
+        # mark the config as dirty explicitly to get them saved
+        if self.autosaver is not None:
+            assert self.autosave_snapshot is not None
+            self.autosave_snapshot.invalidate()
+            self.autosaver.mark_dirty()
+
+    def flush(self) -> bool:
+        # saves pending autosave changes right away,
+        # returns whether anything was saved
+        if self.autosaver is None:
+            return False
+        return self.autosaver.flush()
+
+    def query(
+        self,
+        section_glob: str = "*",
+        option_glob: str = "*",
+        value_regex: Union[str, Pattern, None] = None,
+        comment_regex: Union[str, Pattern, None] = None,
+    ) -> QueryResult:
+        # (section name, option) pairs sorted by the names for options matching
+        # the globs and having the patterns found in their values and comments;
+        # indexes are kept up to date with the changes reported to the change
+        # listeners, options modified directly have to be reported with
+        # "notify_change" of their section
+        if self.query_index is None:
+            self.query_index = QueryIndex(self)
+
+        return self.query_index.query(
+            section_glob,
+            option_glob,
+            value_regex=value_regex,
+            comment_regex=comment_regex,
+        )
+
+    @contextlib.contextmanager
+    def transaction(
+        self,
+        save: bool = False,
+        atomic: bool = True,
+    ) -> Iterator[Transaction]:
+        # optionally saves the config to the file it was loaded from once the
+        # transaction is committed, so the file never has partial changes
+        if save and self.path is None:
+            raise SimpliniError("Config was not loaded from the file")
+
+        with super().transaction() as transaction:
+            yield transaction
+
+        if save:
+            assert self.path is not None
+            self.save(self.path, atomic=atomic, skip_unchanged=True)
+
+    def enable_journal(
+        self,
+        path: str,
+        compact_threshold: int = 1024 * 1024,
+        fsync: bool = True,
+    ) -> None:
+        # changes are appended to the journal next to the config file at given
+        # path instead of rewriting it, pending journal records are replayed
+        # on top of the config first; once the journal grows over the
+        # threshold (in bytes) it is compacted back into the config file,
+        # and so it is on reordering and renaming
+        if self.journal is not None:
+            raise SimpliniError("Journal is already enabled")
+
+        def compact() -> None:
+            self.save(path, atomic=True)
+
+        journal = IniJournal(
+            self,
+            path + JOURNAL_SUFFIX,
+            compact_fn=compact,
+            compact_threshold=compact_threshold,
+            fsync=fsync,
+        )
+        journal.open()
+        self.journal = journal
+
+    def compact_journal(self) -> None:
+        if self.journal is None:
+            raise SimpliniError("Journal is not enabled")
+        self.journal.compact()
+
+    def disable_journal(self, compact: bool = True) -> None:
+        if self.journal is None:
+            return
+
+        if compact:
+            self.journal.compact()
+
+        journal, self.journal = self.journal, None
+        journal.close()
+
+    def compile_render_plan(
+        self,
+        holes: Optional[Iterable[Tuple[str, str]]] = None,
+    ) -> RenderPlan:
+        return self.renderer.compile(self, self.flavour, holes)
+
+    def render_bytes(self) -> bytes:
+        buffer = io.StringIO()
+        self.renderer.render(buffer, self, self.flavour)
+        text = buffer.getvalue()
+
+        # mimic new lines translation done by files opened in text mode
+        if os.linesep != "\n":
+            text = text.replace("\n", os.linesep)
+
+        return text.encode(self.encoding)
+
+    def save(
+        self,
+        path: str,
+        atomic: bool = False,
+        skip_unchanged: bool = False,
+    ) -> bool:
+        # returns whether the file was actually written
+        if not atomic and not skip_unchanged:
+            with open(path, "w", encoding=self.encoding) as file:
+                self.renderer.render(file, self, self.flavour)
+            return True
+
+        data = self.render_bytes()
+
+        if skip_unchanged and has_same_content(path, data):
+            return False
+
+        if atomic:
+            # readers will either see the old or the new file, never a partial one
+            write_atomic(path, data)
+        else:
+            with open(path, "wb") as file:
+                file.write(data)
+
+        return True
+
+    @staticmethod
+    def load(
+        path: str,
+        encoding: str = "utf-8",
+        parser: Optional[IniParser] = None,
+        flavour: Optional[IniFlavour] = None,
+        key_normalizer: Optional[Callable[[str], str]] = None,
+    ) -> "IniConfig":
+        parser = parser or IniParser()
+
+        # note that by default text reader will translate new lines into
+        # LF-style even on Windows with CRLF new lines
+        with open(path, "r", encoding=encoding) as file:
+            config = IniConfig()
+            config.encoding = encoding
+            config.flavour = flavour or IniFlavour()
+            config.path = path
+            if key_normalizer is not None:
+                # enabled upfront so that colliding keys fail the loading
+                config.enable_key_index(key_normalizer)
+            parser.parse(file, config, config.flavour)
+            return config
+
+    @staticmethod
+    async def aload(
+        path: str,
+        encoding: str = "utf-8",
+        parser: Optional[IniParser] = None,
+        flavour: Optional[IniFlavour] = None,
+        key_normalizer: Optional[Callable[[str], str]] = None,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> "IniConfig":
+        # loads the file in the executor without blocking the event loop;
+        # concurrent loads of the same file version with the same settings
+        # share a single parse, every caller gets its own copy-on-write clone
+        loop = asyncio.get_running_loop()
+        signature = await loop.run_in_executor(executor, file_signature, path)
+        key = (
+            loop,
+            os.path.abspath(path),
+            signature,
+            encoding,
+            parser,
+            flavour,
+            key_normalizer,
+        )
+
+        future = IN_FLIGHT_LOADS.get(key)
+
+        if future is None:
+            future = loop.run_in_executor(
+                executor,
+                functools.partial(
+                    IniConfig.load,
+                    path,
+                    encoding=encoding,
+                    parser=parser,
+                    flavour=flavour,
+                    key_normalizer=key_normalizer,
+                ),
+            )
+            IN_FLIGHT_LOADS[key] = future
+
+            def forget(_: asyncio.Future) -> None:
+                if IN_FLIGHT_LOADS.get(key) is future:
+                    del IN_FLIGHT_LOADS[key]
+
+            future.add_done_callback(forget)
+
+        # cancelled caller does not cancel the load for the others
+        loaded = await asyncio.shield(future)
+
+        config = loaded.clone()
+        config.path = loaded.path
+        return config
+
+    async def asave(
+        self,
+        path: str,
+        atomic: bool = False,
+        skip_unchanged: bool = False,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> bool:
+        # renders and writes the copy-on-write snapshot taken once the save
+        # starts in the executor, so the config can be changed while it is
+        # being saved
+        snapshot = self.clone()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor,
+            functools.partial(
+                snapshot.save,
+                path,
+                atomic=atomic,
+                skip_unchanged=skip_unchanged,
+            ),
+        )
+
+    def reload(self, parser: Optional[IniParser] = None) -> None:
+        # re-reads the file in place, change listeners are notified about
+        # every section as any of them might have been changed
+        if self.path is None:
+            raise SimpliniError("Config was not loaded from a file")
+
+        if self.journal is not None:
+            raise SimpliniError("Reloading is not supported with journal enabled")
+
+        loaded = IniConfig.load(
+            self.path,
+            encoding=self.encoding,
+            parser=parser,
+            flavour=self.flavour,
+            key_normalizer=None
+            if self.key_index is None
+            else self.key_index.normalizer,
+        )
+
+        self.replace_contents(loaded)
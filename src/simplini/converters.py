@@ -0,0 +1,100 @@
+import datetime
+import functools
+import math
+import re
+from typing import Any, Callable, Dict, Tuple, Union
+
+Converter = Callable[[str], Any]
+
+TRUE_VALUES = ("1", "yes", "true", "on")
+FALSE_VALUES = ("0", "no", "false", "off")
+
+DURATION_UNITS = {
+    "ms": 0.001,
+    "s": 1,
+    "m": 60,
+    "h": 60 * 60,
+    "d": 24 * 60 * 60,
+    "w": 7 * 24 * 60 * 60,
+}
+
+DURATION_PART_RE = re.compile(r"\s*(\d+(?:\.\d*)?|\.\d+)\s*(ms|s|m|h|d|w)\s*")
+
+
+def to_bool(value: str) -> bool:
+    normalized = value.strip().lower()
+    if normalized in TRUE_VALUES:
+        return True
+    if normalized in FALSE_VALUES:
+        return False
+    raise ValueError(f'Not a boolean: "{value}"')
+
+
+def to_duration(value: str) -> datetime.timedelta:
+    # accepts plain number of seconds or combination of number and unit
+    # pairs like "1h 30m" or "1.5s"
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = parse_duration_parts(value)
+
+    if math.isnan(seconds):
+        raise ValueError(f'Not a duration: "{value}"')
+
+    # infinite and too large durations overflow
+    try:
+        return datetime.timedelta(seconds=seconds)
+    except OverflowError as err:
+        raise ValueError(f'Duration is out of range: "{value}"') from err
+
+
+def parse_duration_parts(value: str) -> float:
+    seconds = 0.0
+    position = 0
+
+    while position < len(value):
+        match = DURATION_PART_RE.match(value, position)
+        if match is None:
+            raise ValueError(f'Not a duration: "{value}"')
+        seconds += float(match.group(1)) * DURATION_UNITS[match.group(2)]
+        position = match.end()
+
+    if position == 0:
+        raise ValueError(f'Not a duration: "{value}"')
+
+    return seconds
+
+
+@functools.lru_cache(maxsize=None)
+def list_converter(separator: str = ",") -> Converter:
+    # cached so that the same converter instance is used for the same
+    # separator as the last converted value is memoized with its converter;
+    # tuples are returned because memoized results are shared between the
+    # callers
+    def to_list(value: str) -> Tuple[str, ...]:
+        if not value.strip():
+            return ()
+        return tuple(item.strip() for item in value.split(separator))
+
+    return to_list
+
+
+CONVERTERS: Dict[str, Converter] = {
+    "int": int,
+    "float": float,
+    "bool": to_bool,
+    "list": list_converter(","),
+    "duration": to_duration,
+}
+
+
+def register_converter(name: str, converter: Converter) -> None:
+    CONVERTERS[name] = converter
+
+
+def resolve_converter(converter: Union[str, Converter]) -> Converter:
+    if callable(converter):
+        return converter
+    if converter not in CONVERTERS:
+        raise KeyError(f'Converter "{converter}" is not registered')
+    return CONVERTERS[converter]
@@ -1,8 +1,47 @@
+import contextlib
+import datetime
 import enum
-from typing import Dict, List, Optional
+import hashlib
+import threading
+import unicodedata
+from collections.abc import ItemsView, KeysView, ValuesView
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from simplini.converters import Converter, list_converter, resolve_converter
+from simplini.events import EventDispatcher, Subscription, SubscriptionCallback
+from simplini.ordered import OrderedNodes
+from simplini.tracing import AccessTracer
 
 UNNAMED_SECTION_NAME = ""
 
+# called with section name and option name (None for section-level changes)
+ChangeListener = Callable[[str, Optional[str]], None]
+
+# called when the sections or options are reordered or renamed, or the whole
+# section is replaced, which the per key change notifications do not describe
+StructureListener = Callable[[], None]
+
+ConfigT = TypeVar("ConfigT", bound="IniConfigBase")
+
+# stands for the write lock of the configs which do not have one
+UNLOCKED = contextlib.nullcontext()
+
 
 class ValuePresentationStyle(enum.Enum):
     UNQUOTED = 0
@@ -14,6 +53,105 @@ class SimpliniError(Exception):
     pass
 
 
+class ConversionError(SimpliniError, ValueError):
+    pass
+
+
+def check_anchors(
+    nodes: OrderedNodes,
+    before: Optional[str],
+    after: Optional[str],
+    scope: str,
+) -> None:
+    if before is not None and after is not None:
+        raise SimpliniError("Either before or after can be given, not both")
+    anchor = before if after is None else after
+    if anchor is not None and anchor not in nodes:
+        raise KeyError(f'"{anchor}" not found in {scope}')
+
+
+def move_node(
+    nodes: OrderedNodes,
+    key: str,
+    before: Optional[str],
+    after: Optional[str],
+) -> None:
+    # moves to the end when neither before nor after is given
+    if before is not None:
+        nodes.move_before(key, before)
+    elif after is not None:
+        nodes.move_after(key, after)
+    else:
+        nodes.move_to_end(key)
+
+
+def fingerprint_state(state: Tuple) -> bytes:
+    return hashlib.blake2b(repr(state).encode("utf-8"), digest_size=16).digest()
+
+
+def comment_state(comment: Optional[List[str]]) -> Optional[Tuple[str, ...]]:
+    # parsed nodes have empty comment lists while created ones have None
+    return tuple(comment) if comment else None
+
+
+class KeyCollisionError(SimpliniError):
+    def __init__(self, message: str, collisions: List[Tuple[str, str]]):
+        super().__init__(message)
+        # pairs of the keys normalized to the same value
+        self.collisions = collisions
+
+
+def default_key_normalizer(key: str) -> str:
+    return unicodedata.normalize("NFC", key).casefold()
+
+
+class KeyIndex:
+    # Secondary index of the original keys by their normalized form, used for
+    # case-insensitive and unicode normalized lookups.
+    def __init__(self, normalizer: Callable[[str], str], scope: str):
+        self.normalizer = normalizer
+        # used in the error messages
+        self.scope = scope
+        self.keys: Dict[str, str] = {}
+
+    def collision_error(self, collisions: List[Tuple[str, str]]) -> KeyCollisionError:
+        described = ", ".join(f'"{a}" and "{b}"' for a, b in collisions)
+        return KeyCollisionError(
+            f"Keys colliding after normalization in {self.scope}: {described}",
+            collisions,
+        )
+
+    def build(self, keys: Iterable[str]) -> List[Tuple[str, str]]:
+        # returns all the collisions
+        collisions = []
+        for key in keys:
+            normalized = self.normalizer(key)
+            existing = self.keys.get(normalized)
+            if existing is not None and existing != key:
+                collisions.append((existing, key))
+            else:
+                self.keys[normalized] = key
+        return collisions
+
+    def add(self, key: str) -> None:
+        normalized = self.normalizer(key)
+        existing = self.keys.get(normalized)
+        if existing is not None and existing != key:
+            raise self.collision_error([(existing, key)])
+        self.keys[normalized] = key
+
+    def remove(self, key: str) -> None:
+        del self.keys[self.normalizer(key)]
+
+    def find(self, key: str) -> Optional[str]:
+        return self.keys.get(self.normalizer(key))
+
+    def copy(self) -> "KeyIndex":
+        key_index = KeyIndex(self.normalizer, self.scope)
+        key_index.keys = dict(self.keys)
+        return key_index
+
+
 class IniFlavour:
     def __init__(self):
         self.allow_unquoted_values = True
@@ -39,51 +177,483 @@ class IniFlavour:
 
 
 class IniConfigOption:
+    # options are created in large numbers, rarely used attributes default to
+    # the class level values to keep the construction cheap
+    comment: Optional[List[str]] = None
+    inline_comment: Optional[str] = None
+    style: Optional[ValuePresentationStyle] = None
+    # (converter, raw value, converted value) of the last conversion, a single
+    # slot so that the ad-hoc converters are not kept around
+    converted: Optional[Tuple[Converter, str, Any]] = None
+    # (state, digest) of the last fingerprint computed
+    fingerprint_cache: Optional[Tuple[Tuple, bytes]] = None
+
     def __init__(self, name: str, value: str):
-        super().__init__()
         self.name = name
         self.value = value
-        self.comment: Optional[List[str]] = None
-        self.inline_comment: Optional[str] = None
-        self.style: Optional[ValuePresentationStyle] = None
 
     def __repr__(self) -> str:
         return f"IniConfigOption({self.name!r}, {self.value!r})"
 
+    def copy(self, name: Optional[str] = None) -> "IniConfigOption":
+        option = IniConfigOption(self.name if name is None else name, self.value)
+        option.comment = None if self.comment is None else list(self.comment)
+        option.inline_comment = self.inline_comment
+        option.style = self.style
+        # still valid as long as the state matches, name included
+        option.fingerprint_cache = self.fingerprint_cache
+        return option
+
+    def fingerprint(self) -> bytes:
+        # digest of the name, value, style and comments; like the converted
+        # values it is validated against the current state instead of being
+        # reset on every change, so options can be modified directly
+        state = (
+            self.name,
+            self.value,
+            self.style,
+            comment_state(self.comment),
+            self.inline_comment,
+        )
+        cached = self.fingerprint_cache
+        if cached is not None and cached[0] == state:
+            return cached[1]
+        digest = fingerprint_state(state)
+        self.fingerprint_cache = (state, digest)
+        return digest
+
+    def convert(self, converter: Converter) -> Any:
+        value = self.value
+
+        cached = self.converted
+        # cached value is only valid for the same raw value, so that changing
+        # the value invalidates it without any extra work on set
+        if cached is not None and cached[0] is converter and cached[1] is value:
+            return cached[2]
+
+        result = converter(value)
+        self.converted = (converter, value, result)
+        return result
+
+
+class OptionValuesView(ValuesView):
+    # reads values right from the options without going through __getitem__
+    def __iter__(self) -> Iterator[str]:
+        for option in self._mapping.options.values():
+            yield option.value
+
+
+class OptionItemsView(ItemsView):
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        for option_name, option in self._mapping.options.items():
+            yield option_name, option.value
+
+
+class IniConfigSection(MutableMapping[str, str]):
+    # Mapping of the option names to the values, the views are live and
+    # backed by the options without copying.
+
+    # sections are nodes of the config tree and compared by identity,
+    # unlike regular mappings
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
 
-class IniConfigSection:
     def __init__(self, name: Optional[str]):
         super().__init__()
         self.name: Optional[str] = name
-        self.options: Dict[str, IniConfigOption] = {}
+        # ordered, options can be moved and renamed in place
+        self.options: OrderedNodes[IniConfigOption] = OrderedNodes()
         self.comment: Optional[List[str]] = None
         self.inline_comment: Optional[str] = None
+        # config this section belongs to, notified about the changes
+        self.owner: Optional["IniConfigBase"] = None
+        # optional normalized option names index, see enable_key_index
+        self.key_index: Optional[KeyIndex] = None
+        # options dict and options themselves can be shared with the clones,
+        # in which case they are copied on the first write; names of the
+        # options already copied are tracked, None when nothing is shared
+        self.options_shared = False
+        self.owned_options: Optional[Set[str]] = None
+        # (header comments, digest) of the last fingerprint computed, reset by
+        # the changes of the options
+        self.fingerprint_cache: Optional[Tuple[Tuple, bytes]] = None
+        # counts the lookups when tracing is enabled for the config
+        self.tracer: Optional[AccessTracer] = None
+
+    def clone(self) -> "IniConfigSection":
+        # O(1) copy sharing the options until either of the sections changes
+        owner = self.owner
+        if owner is not None and owner.active_transaction is not None:
+            owner.active_transaction.cloned_sections.add(self)
+
+        section = IniConfigSection(self.name)
+
+        with self.write_locked():
+            section.comment = None if self.comment is None else list(self.comment)
+            section.inline_comment = self.inline_comment
+
+            if self.key_index is not None:
+                section.key_index = self.key_index.copy()
+
+            section.options = self.options
+            section.fingerprint_cache = self.fingerprint_cache
+            section.options_shared = self.options_shared = True
+            section.owned_options = set()
+            self.owned_options = set()
+
+        return section
+
+    def write_locked(self) -> ContextManager:
+        # write lock of the config the section belongs to, if any
+        owner = self.owner
+        if owner is None or owner.write_lock is None:
+            return UNLOCKED
+        return owner.write_lock
+
+    def own_options(self) -> OrderedNodes[IniConfigOption]:
+        # private options dict to be modified, options might be still shared
+        if self.options_shared:
+            self.options = self.options.copy()
+            self.options_shared = False
+        return self.options
+
+    def own_option(self, option_name: str) -> IniConfigOption:
+        # private copy of the existing option to be modified
+        options = self.own_options()
+        option = options[option_name]
+
+        owned_options = self.owned_options
+        if owned_options is not None and option_name not in owned_options:
+            option = options[option_name] = option.copy()
+            owned_options.add(option_name)
+
+        return option
+
+    def enable_key_index(
+        self,
+        normalizer: Callable[[str], str] = default_key_normalizer,
+    ) -> None:
+        key_index = KeyIndex(normalizer, f'section "{self.name}"')
+        collisions = key_index.build(self.options)
+        if collisions:
+            raise key_index.collision_error(collisions)
+        self.key_index = key_index
+
+    def find_option(self, option_name: str) -> Optional[IniConfigOption]:
+        # lookup by normalized option name
+        if self.key_index is None:
+            raise SimpliniError(f'Key index is not enabled for section "{self.name}"')
+        original_name = self.key_index.find(option_name)
+        if original_name is None:
+            return None
+        return self.options.get(original_name)
+
+    def find(self, option_name: str) -> Optional[str]:
+        option = self.find_option(option_name)
+        if option is None:
+            return None
+        return option.value
+
+    def notify_change(self, option_name: Optional[str]) -> None:
+        if self.owner is not None:
+            self.owner.notify_change(self.name or UNNAMED_SECTION_NAME, option_name)
+
+    def notify_structure_change(self) -> None:
+        if self.owner is not None:
+            self.owner.notify_structure_change()
+
+    def before_change(self) -> None:
+        # resets the digest and lets the transaction in progress record the
+        # section state
+        self.fingerprint_cache = None
+        owner = self.owner
+        if owner is not None and owner.active_transaction is not None:
+            owner.active_transaction.record_section(self)
+
+    def fingerprint(self) -> bytes:
+        # digest of the comments and the options in their order, the name is
+        # not included; it is cached until the options change, then only the
+        # changed options are hashed again. Options modified directly after
+        # the digest was taken are not tracked, see reset_fingerprint
+        header = (comment_state(self.comment), self.inline_comment)
+        cached = self.fingerprint_cache
+        if cached is not None and cached[0] == header:
+            return cached[1]
+
+        digest = hashlib.blake2b(repr(header).encode("utf-8"), digest_size=16)
+        for option in self.options.values():
+            digest.update(option.fingerprint())
+
+        result = digest.digest()
+        self.fingerprint_cache = (header, result)
+        return result
+
+    def reset_fingerprint(self) -> None:
+        self.fingerprint_cache = None
+
+    def subscribe(
+        self,
+        callback: SubscriptionCallback,
+        option_name: Optional[str] = None,
+    ) -> Subscription:
+        # same as subscribing to the section in the config it belongs to
+        if self.owner is None:
+            raise SimpliniError(
+                f'Section "{self.name}" does not belong to any config to subscribe'
+            )
+        return self.owner.subscribe(
+            callback, self.name or UNNAMED_SECTION_NAME, option_name
+        )
 
     def get_option(
         self,
         option_name: str,
     ) -> Optional[IniConfigOption]:
-        return self.options.get(option_name)
+        if self.tracer is not None:
+            self.tracer.record(self.name or UNNAMED_SECTION_NAME, option_name)
+        # options are returned for modification, so the shared ones are copied
+        with self.write_locked():
+            self.before_change()
+            if self.owned_options is not None and option_name in self.options:
+                return self.own_option(option_name)
+            return self.options.get(option_name)
 
-    def get(
+    def get(  # type: ignore[override]
         self,
         option_name: str,
+        default: Optional[str] = None,
     ) -> Optional[str]:
+        if self.tracer is not None:
+            self.tracer.record(self.name or UNNAMED_SECTION_NAME, option_name)
         option = self.options.get(option_name)
         if option is None:
-            return None
+            return default
         return option.value
 
+    def get_as(
+        self,
+        option_name: str,
+        converter: Union[str, Converter],
+        default: Any = None,
+    ) -> Any:
+        if self.tracer is not None:
+            self.tracer.record(self.name or UNNAMED_SECTION_NAME, option_name)
+        option = self.options.get(option_name)
+        if option is None:
+            return default
+        converter = resolve_converter(converter)
+        try:
+            return option.convert(converter)
+        except ValueError as err:
+            raise ConversionError(
+                f'Unable to convert option "{option_name}" '
+                f'in section "{self.name}": {err}'
+            ) from err
+
+    def get_int(
+        self,
+        option_name: str,
+        default: Optional[int] = None,
+    ) -> Optional[int]:
+        return self.get_as(option_name, int, default)
+
+    def get_float(
+        self,
+        option_name: str,
+        default: Optional[float] = None,
+    ) -> Optional[float]:
+        return self.get_as(option_name, float, default)
+
+    def get_bool(
+        self,
+        option_name: str,
+        default: Optional[bool] = None,
+    ) -> Optional[bool]:
+        return self.get_as(option_name, "bool", default)
+
+    def get_list(
+        self,
+        option_name: str,
+        default: Optional[List[str]] = None,
+        separator: str = ",",
+    ) -> Optional[List[str]]:
+        result = self.get_as(option_name, list_converter(separator))
+        if result is None:
+            return default
+        return list(result)
+
+    def get_duration(
+        self,
+        option_name: str,
+        default: Optional[datetime.timedelta] = None,
+    ) -> Optional[datetime.timedelta]:
+        return self.get_as(option_name, "duration", default)
+
     def set(
         self,
         option_name: str,
         value: str,
     ) -> IniConfigOption:
-        if option_name in self.options:
-            self.options[option_name].value = value
-        else:
-            self.options[option_name] = IniConfigOption(option_name, value)
-        return self.options[option_name]
+        with self.write_locked():
+            self.before_change()
+            option = self.options.get(option_name)
+            if option is None:
+                if self.key_index is not None:
+                    self.key_index.add(option_name)
+                option = IniConfigOption(option_name, value)
+                self.own_options()[option_name] = option
+                if self.owned_options is not None:
+                    self.owned_options.add(option_name)
+            else:
+                if self.owned_options is not None:
+                    option = self.own_option(option_name)
+                option.value = value
+        self.notify_change(option_name)
+        return option
+
+    def changes_batch(self) -> ContextManager:
+        if self.owner is None:
+            return contextlib.nullcontext()
+        return self.owner.batch()
+
+    def insert_option(
+        self,
+        option_name: str,
+        value: str,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+    ) -> IniConfigOption:
+        # sets the option placing it before or after the given one, the
+        # existing option is moved there
+        check_anchors(self.options, before, after, f'section "{self.name}"')
+        with self.changes_batch():
+            option = self.set(option_name, value)
+            if before is not None or after is not None:
+                with self.write_locked():
+                    move_node(self.own_options(), option_name, before, after)
+                self.notify_structure_change()
+        return option
+
+    def move_option(
+        self,
+        option_name: str,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+    ) -> None:
+        # moves to the end when neither before nor after is given
+        if option_name not in self.options:
+            raise KeyError(f'Option "{option_name}" not found in section "{self.name}"')
+        check_anchors(self.options, before, after, f'section "{self.name}"')
+        with self.write_locked():
+            self.before_change()
+            move_node(self.own_options(), option_name, before, after)
+        self.notify_change(option_name)
+        self.notify_structure_change()
+
+    def rename_option(
+        self,
+        option_name: str,
+        new_name: str,
+    ) -> IniConfigOption:
+        # option keeps its position and comments
+        if option_name not in self.options:
+            raise KeyError(f'Option "{option_name}" not found in section "{self.name}"')
+        if new_name == option_name:
+            return self.options[option_name]
+        if new_name in self.options:
+            raise SimpliniError(
+                f'Option "{new_name}" already exists in section "{self.name}"'
+            )
+
+        with self.write_locked():
+            if self.key_index is not None:
+                self.key_index.remove(option_name)
+                try:
+                    self.key_index.add(new_name)
+                except KeyCollisionError:
+                    self.key_index.add(option_name)
+                    raise
+
+            self.before_change()
+            option = self.own_option(option_name)
+            option.name = new_name
+            self.own_options().rename(option_name, new_name)
+
+            if self.owned_options is not None:
+                self.owned_options.discard(option_name)
+                self.owned_options.add(new_name)
+
+        with self.changes_batch():
+            self.notify_change(option_name)
+            self.notify_change(new_name)
+        self.notify_structure_change()
+
+        return option
+
+    def set_many(
+        self,
+        items: Union[
+            Mapping[str, Union[str, IniConfigOption]],
+            Iterable[Tuple[str, Union[str, IniConfigOption]]],
+        ],
+    ) -> None:
+        # values can be either strings or options to carry comments and style
+        if isinstance(items, Mapping):
+            items = items.items()
+
+        # avoid collecting changed names when nobody listens to the changes
+        tracked = self.owner is not None and bool(
+            self.owner.change_listeners or self.owner.cache_listeners
+        )
+        changed: List[str] = []
+
+        with self.write_locked():
+            self.before_change()
+            options = self.own_options()
+            owned_options = self.owned_options
+
+            if not options and not tracked and self.key_index is None:
+                # fast path for the new sections, nothing to look up
+                options.update(
+                    (
+                        option_name,
+                        (
+                            value.copy(option_name)
+                            if isinstance(value, IniConfigOption)
+                            else IniConfigOption(option_name, value)
+                        ),
+                    )
+                    for option_name, value in items
+                )
+                self.owned_options = None
+                return
+
+            for option_name, value in items:
+                option = options.get(option_name)
+
+                if option is None and self.key_index is not None:
+                    self.key_index.add(option_name)
+
+                if isinstance(value, IniConfigOption):
+                    options[option_name] = value.copy(option_name)
+                elif option is None:
+                    options[option_name] = IniConfigOption(option_name, value)
+                elif owned_options is not None:
+                    self.own_option(option_name).value = value
+                else:
+                    option.value = value
+
+                if owned_options is not None:
+                    owned_options.add(option_name)
+
+                if tracked:
+                    changed.append(option_name)
+
+        if changed:
+            assert self.owner is not None
+            with self.owner.batch():
+                for option_name in changed:
+                    self.notify_change(option_name)
 
     def __getitem__(
         self,
@@ -105,6 +675,8 @@ class IniConfigSection:
         self,
         option_name: str,
     ) -> bool:
+        if self.tracer is not None:
+            self.tracer.record(self.name or UNNAMED_SECTION_NAME, option_name)
         return option_name in self.options
 
     def __delitem__(
@@ -113,27 +685,422 @@ class IniConfigSection:
     ) -> None:
         if option_name not in self.options:
             raise KeyError(f'Option "{option_name}" not found in section "{self.name}"')
-        del self.options[option_name]
+        with self.write_locked():
+            self.before_change()
+            del self.own_options()[option_name]
+            if self.owned_options is not None:
+                self.owned_options.discard(option_name)
+            if self.key_index is not None:
+                self.key_index.remove(option_name)
+        self.notify_change(option_name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.options)
+
+    def __len__(self) -> int:
+        return len(self.options)
+
+    def keys(self) -> KeysView:
+        return self.options.keys()
+
+    def values(self) -> ValuesView:
+        return OptionValuesView(self)
+
+    def items(self) -> ItemsView:
+        return OptionItemsView(self)
 
     def __repr__(self) -> str:
         return f"IniConfigSection({self.name!r})"
 
     def as_dict(self) -> Dict:
+        # snapshot of the values, unlike the views
         return {option.name: option.value for option in self.options.values()}
 
 
+# section, its name, options, whether options are shared, owned options,
+# comment and inline comment
+SectionState = Tuple[
+    IniConfigSection,
+    Optional[str],
+    Dict[str, IniConfigOption],
+    bool,
+    Optional[Set[str]],
+    Optional[List[str]],
+    Optional[str],
+]
+
+
+class Transaction:
+    # Undo log of the config changes. Sections are recorded right before their
+    # first change and switched to copy-on-write mode, so that the recorded
+    # options are left intact by the changes, and the set of sections is
+    # recorded before it is changed for the first time. Rolling back replays
+    # the log in reverse restoring the recorded state without any copying.
+    # Change listeners are notified once the transaction is committed, so
+    # that e.g. autosave and journal never see uncommitted changes.
+    def __init__(self, config: "IniConfigBase"):
+        self.config = config
+        self.log: List[Union[SectionState, Tuple[IniConfigSection, Dict]]] = []
+        self.recorded_sections: Set[IniConfigSection] = set()
+        self.sections_recorded = False
+        # sections cloned during the transaction, their options are shared
+        # with the clones and have to stay in copy-on-write mode
+        self.cloned_sections: Set[IniConfigSection] = set()
+        # (section name, option name) changes held until the commit
+        self.changes: Dict[Tuple[str, Optional[str]], None] = {}
+        self.structure_changed = False
+        self.trailing_comment = (
+            None if config.trailing_comment is None else list(config.trailing_comment)
+        )
+
+    def record_section(self, section: IniConfigSection) -> None:
+        if section in self.recorded_sections:
+            return
+
+        self.recorded_sections.add(section)
+        self.log.append(
+            (
+                section,
+                section.name,
+                section.options,
+                section.options_shared,
+                None if section.owned_options is None else set(section.owned_options),
+                None if section.comment is None else list(section.comment),
+                section.inline_comment,
+            )
+        )
+
+        section.options_shared = True
+        section.owned_options = set()
+
+    def record_sections(self) -> None:
+        if self.sections_recorded:
+            return
+
+        self.sections_recorded = True
+        self.log.append((self.config.unnamed_section, self.config.sections.copy()))
+
+    def commit(self) -> None:
+        with self.config.write_locked():
+            self.restore_sharing()
+
+        changes = self.changes
+        structure_changed = self.structure_changed
+        self.reset()
+
+        config = self.config
+        with config.batch():
+            for section_name, option_name in changes:
+                config.notify_change(section_name, option_name)
+        if structure_changed:
+            config.notify_structure_change()
+
+    def restore_sharing(self) -> None:
+        # sections are kept in copy-on-write mode only as much as needed
+        for entry in self.log:
+            if len(entry) == 2:
+                continue
+
+            section, _, options, shared, owned_options = entry[:5]
+
+            if section in self.cloned_sections:
+                # whatever is shared with the clones stays shared
+                continue
+
+            if section.options is options:
+                # options were not changed at all
+                section.options_shared = shared
+                section.owned_options = owned_options
+            elif owned_options is None:
+                # options were only shared with the replaced dict
+                section.owned_options = None
+            else:
+                assert section.owned_options is not None
+                section.owned_options.update(owned_options)
+
+    def reset(self) -> None:
+        self.log = []
+        self.recorded_sections = set()
+        self.sections_recorded = False
+        self.cloned_sections = set()
+        self.changes = {}
+        self.structure_changed = False
+
+    def rollback(self) -> None:
+        changes = self.changes
+        with self.config.write_locked():
+            self.restore()
+
+        config = self.config
+        for section_name, option_name in changes:
+            for listener in config.cache_listeners:
+                listener(section_name, option_name)
+
+    def restore(self) -> None:
+        # change listeners have not seen any of the changes
+        config = self.config
+
+        for entry in reversed(self.log):
+            if len(entry) == 2:
+                unnamed_section, sections = entry
+
+                for section in [config.unnamed_section, *config.sections.values()]:
+                    section.owner = None
+
+                config.unnamed_section = unnamed_section
+                config.sections = sections
+
+                for section in [unnamed_section, *sections.values()]:
+                    section.owner = config
+
+                if config.key_index is not None:
+                    config.enable_key_index(config.key_index.normalizer)
+                continue
+
+            section, name, options, shared, owned_options, comment, inline_comment = (
+                entry
+            )
+
+            section.name = name
+            section.options = options
+
+            if section in self.cloned_sections:
+                # recorded options might be shared with the clones
+                section.options_shared = True
+                section.owned_options = set()
+            else:
+                section.options_shared = shared
+                section.owned_options = owned_options
+
+            section.comment = comment
+            section.inline_comment = inline_comment
+            section.fingerprint_cache = None
+
+            if section.key_index is not None:
+                section.enable_key_index(section.key_index.normalizer)
+
+        config.trailing_comment = (
+            None if self.trailing_comment is None else list(self.trailing_comment)
+        )
+
+        self.reset()
+
+
 class IniConfigBase:
     def __init__(self):
         super().__init__()
+        self.change_listeners: List[ChangeListener] = []
+        # caches built from the config, see add_cache_listener
+        self.cache_listeners: List[ChangeListener] = []
+        self.structure_listeners: List[StructureListener] = []
         self.unnamed_section = IniConfigSection(UNNAMED_SECTION_NAME)
-        self.sections: Dict[str, IniConfigSection] = {}
+        self.unnamed_section.owner = self
+        self.sections: OrderedNodes[IniConfigSection] = OrderedNodes()
         self.trailing_comment: Optional[List[str]] = None
+        # optional normalized section names index, see enable_key_index
+        self.key_index: Optional[KeyIndex] = None
+        # created on the first subscription
+        self.event_dispatcher: Optional[EventDispatcher] = None
+        self.active_transaction: Optional[Transaction] = None
+        # set when tracing is enabled, shared with the sections
+        self.tracer: Optional[AccessTracer] = None
+        # held by the changes when set, so that the other threads can take
+        # consistent clones, see enable_write_lock
+        self.write_lock: Optional[threading.RLock] = None
+
+    def enable_write_lock(self) -> None:
+        if self.write_lock is None:
+            self.write_lock = threading.RLock()
+
+    def write_locked(self) -> ContextManager:
+        if self.write_lock is None:
+            return UNLOCKED
+        return self.write_lock
+
+    def enable_key_index(
+        self,
+        normalizer: Callable[[str], str] = default_key_normalizer,
+    ) -> None:
+        # enables case-insensitive and unicode normalized lookups for both
+        # sections and options, all the collisions are reported at once
+        key_index = KeyIndex(normalizer, "sections")
+        collisions = key_index.build(self.sections)
+
+        for section in [self.unnamed_section, *self.sections.values()]:
+            try:
+                section.enable_key_index(normalizer)
+            except KeyCollisionError as err:
+                collisions.extend(err.collisions)
+
+        if collisions:
+            raise key_index.collision_error(collisions)
+
+        self.key_index = key_index
+
+    def find_section(self, section_name: str) -> Optional[IniConfigSection]:
+        # lookup by normalized section name
+        if self.key_index is None:
+            raise SimpliniError("Key index is not enabled")
+        if not section_name:
+            return self.unnamed_section
+        original_name = self.key_index.find(section_name)
+        if original_name is None:
+            return None
+        return self.sections.get(original_name)
+
+    def find_option(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+    ) -> Optional[IniConfigOption]:
+        section = self.find_section(section_name or UNNAMED_SECTION_NAME)
+        if section is None:
+            return None
+        return section.find_option(option_name)
+
+    def find(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+    ) -> Optional[str]:
+        option = self.find_option(option_name, section_name)
+        if option is None:
+            return None
+        return option.value
+
+    def enable_tracing(self, tracer: Optional[AccessTracer] = None) -> AccessTracer:
+        # counts the option lookups, the options existing at the moment are
+        # reported as unused until looked up; tracer can be shared by configs
+        if tracer is None:
+            tracer = AccessTracer()
+
+        self.tracer = tracer
+
+        for section in [self.unnamed_section, *self.sections.values()]:
+            tracer.add_keys(section.name or UNNAMED_SECTION_NAME, section.options)
+            section.tracer = tracer
+
+        return tracer
+
+    def disable_tracing(self) -> None:
+        self.tracer = None
+
+        for section in [self.unnamed_section, *self.sections.values()]:
+            section.tracer = None
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        self.change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: ChangeListener) -> None:
+        self.change_listeners.remove(listener)
+
+    def add_cache_listener(self, listener: ChangeListener) -> None:
+        # unlike the change listeners, notified right away during the
+        # transactions and once again for the changes rolled back, so that
+        # the caches are never stale
+        self.cache_listeners.append(listener)
+
+    def remove_cache_listener(self, listener: ChangeListener) -> None:
+        self.cache_listeners.remove(listener)
+
+    def notify_change(self, section_name: str, option_name: Optional[str]) -> None:
+        for listener in self.cache_listeners:
+            listener(section_name, option_name)
+        if self.active_transaction is not None:
+            self.active_transaction.changes[(section_name, option_name)] = None
+            return
+        for listener in self.change_listeners:
+            listener(section_name, option_name)
+
+    def add_structure_listener(self, listener: StructureListener) -> None:
+        self.structure_listeners.append(listener)
+
+    def remove_structure_listener(self, listener: StructureListener) -> None:
+        self.structure_listeners.remove(listener)
+
+    def notify_structure_change(self) -> None:
+        if self.active_transaction is not None:
+            self.active_transaction.structure_changed = True
+            return
+        for listener in self.structure_listeners:
+            listener()
+
+    def subscribe(
+        self,
+        callback: SubscriptionCallback,
+        section_name: Optional[str] = None,
+        option_name: Optional[str] = None,
+    ) -> Subscription:
+        # callback is called with the list of changed (section, option) keys
+        # matching the subscription, None matches any section or option;
+        # option name in the keys is None when the whole section changed
+        if self.event_dispatcher is None:
+            self.event_dispatcher = EventDispatcher()
+            self.add_change_listener(self.event_dispatcher.on_change)
+        return self.event_dispatcher.subscribe(callback, section_name, option_name)
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        # changes done within the block are delivered to the subscribers
+        # as a single notification
+        if self.event_dispatcher is None:
+            yield
+        else:
+            with self.event_dispatcher.batch():
+                yield
+
+    def add_section(self, section: IniConfigSection) -> None:
+        # adds (or replaces) the section as is, unnamed one included
+        previous = self.attach_section(section)
+
+        # options of the section are not notified one by one
+        if section.options or (previous is not None and previous.options):
+            self.notify_structure_change()
+
+    def attach_section(
+        self,
+        section: IniConfigSection,
+    ) -> Optional[IniConfigSection]:
+        # returns the replaced section, if any
+        with self.write_locked():
+            self.before_change()
+
+            if self.key_index is not None:
+                if section.key_index is None or (
+                    section.key_index.normalizer is not self.key_index.normalizer
+                ):
+                    section.enable_key_index(self.key_index.normalizer)
+                if section.name:
+                    self.key_index.add(section.name)
+
+            if self.tracer is not None:
+                self.tracer.add_keys(
+                    section.name or UNNAMED_SECTION_NAME, section.options
+                )
+            section.tracer = self.tracer
+
+            previous: Optional[IniConfigSection]
+            if not section.name:
+                previous = self.unnamed_section
+                self.unnamed_section = section
+            else:
+                previous = self.sections.get(section.name)
+                self.sections[section.name] = section
+            if previous is not None:
+                previous.owner = None
+            section.owner = self
+        self.notify_change(section.name or UNNAMED_SECTION_NAME, None)
+        return previous
 
     def get_section(
         self,
         section_name: str,
     ) -> Optional[IniConfigSection]:
-        return self.sections.get(section_name)
+        section = self.sections.get(section_name)
+        # section might be modified directly, e.g. its comments
+        if section is not None and self.active_transaction is not None:
+            self.active_transaction.record_section(section)
+        return section
 
     def ensure_section(
         self,
@@ -143,18 +1110,81 @@ class IniConfigBase:
         if not section_name:
             return self.unnamed_section
 
+        section = self.get_section(section_name)
+        if section is None:
+            section = IniConfigSection(section_name)
+            self.add_section(section)
+
+        return section
+
+    def move_section(
+        self,
+        section_name: str,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+    ) -> None:
+        # moves to the end when neither before nor after is given
         if section_name not in self.sections:
-            self.sections[section_name] = IniConfigSection(section_name)
+            raise KeyError(f'Section "{section_name}" is not found')
+        check_anchors(self.sections, before, after, "sections")
+
+        with self.write_locked():
+            self.before_change()
+            move_node(self.sections, section_name, before, after)
+        self.notify_change(section_name, None)
+        self.notify_structure_change()
+
+    def rename_section(
+        self,
+        section_name: str,
+        new_name: str,
+    ) -> IniConfigSection:
+        # section keeps its position, options and comments
+        section = self.sections.get(section_name)
+        if section is None:
+            raise KeyError(f'Section "{section_name}" is not found')
+        if new_name == section_name:
+            return section
+        if not new_name:
+            raise SimpliniError("Section can not be renamed to the unnamed one")
+        if new_name in self.sections:
+            raise SimpliniError(f'Section "{new_name}" already exists')
 
-        return self.sections[section_name]
+        with self.write_locked():
+            if self.key_index is not None:
+                self.key_index.remove(section_name)
+                try:
+                    self.key_index.add(new_name)
+                except KeyCollisionError:
+                    self.key_index.add(section_name)
+                    raise
+
+            self.before_change()
+            if self.active_transaction is not None:
+                self.active_transaction.record_section(section)
+
+            self.sections.rename(section_name, new_name)
+            section.name = new_name
+
+        with self.batch():
+            self.notify_change(section_name, None)
+            self.notify_change(new_name, None)
+        self.notify_structure_change()
+
+        return section
 
     def get_option(
         self,
         option_name: str,
         section_name: Optional[str] = None,
     ) -> Optional[IniConfigOption]:
-        section = self.get_section(section_name)
+        if not section_name:
+            section = self.unnamed_section
+        else:
+            section = self.get_section(section_name)
         if section is None:
+            if self.tracer is not None:
+                self.tracer.record(section_name, option_name)
             return None
         return section.get_option(option_name)
 
@@ -168,9 +1198,75 @@ class IniConfigBase:
         else:
             section = self.get_section(section_name)
         if section is None:
+            if self.tracer is not None:
+                self.tracer.record(section_name, option_name)
             return None
         return section.get(option_name)
 
+    def get_as(
+        self,
+        option_name: str,
+        converter: Union[str, Converter],
+        section_name: Optional[str] = None,
+        default: Any = None,
+    ) -> Any:
+        if not section_name:
+            section = self.unnamed_section
+        else:
+            section = self.get_section(section_name)
+        if section is None:
+            if self.tracer is not None:
+                self.tracer.record(section_name, option_name)
+            return default
+        return section.get_as(option_name, converter, default)
+
+    def get_int(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+        default: Optional[int] = None,
+    ) -> Optional[int]:
+        return self.get_as(option_name, int, section_name, default)
+
+    def get_float(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+        default: Optional[float] = None,
+    ) -> Optional[float]:
+        return self.get_as(option_name, float, section_name, default)
+
+    def get_bool(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+        default: Optional[bool] = None,
+    ) -> Optional[bool]:
+        return self.get_as(option_name, "bool", section_name, default)
+
+    def get_list(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+        default: Optional[List[str]] = None,
+        separator: str = ",",
+    ) -> Optional[List[str]]:
+        if not section_name:
+            section = self.unnamed_section
+        else:
+            section = self.get_section(section_name)
+        if section is None:
+            return default
+        return section.get_list(option_name, default, separator)
+
+    def get_duration(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+        default: Optional[datetime.timedelta] = None,
+    ) -> Optional[datetime.timedelta]:
+        return self.get_as(option_name, "duration", section_name, default)
+
     def set(
         self,
         key: str,
@@ -181,17 +1277,176 @@ class IniConfigBase:
         option = section.set(key, value)
         return option
 
+    def update(
+        self,
+        mapping: Mapping[str, Union[Mapping[str, Any], IniConfigSection]],
+        merge: bool = True,
+    ) -> None:
+        # mapping is of the same shape as "as_dict" output, when merging the
+        # options are added to the existing sections, otherwise mentioned
+        # sections are replaced altogether; sections can also be given as
+        # IniConfigSection to carry the comments
+        with self.batch(), self.write_locked():
+            for section_name, options in mapping.items():
+                if merge:
+                    section = self.ensure_section(section_name)
+                else:
+                    section = IniConfigSection(section_name)
+                    self.add_section(section)
+
+                if isinstance(options, IniConfigSection):
+                    section.comment = (
+                        None if options.comment is None else list(options.comment)
+                    )
+                    section.inline_comment = options.inline_comment
+                    section.set_many(
+                        (option.name, option) for option in options.options.values()
+                    )
+                else:
+                    section.set_many(options)
+
+    def replace_contents(self, other: "IniConfigBase") -> None:
+        # takes over the sections of the other config preserving its order,
+        # sections missing there are removed; the other config is left empty
+        with self.batch(), self.write_locked():
+            self.before_change()
+
+            for section_name in list(self.sections):
+                if section_name not in other.sections:
+                    del self[section_name]
+
+            self.attach_section(other.unnamed_section)
+
+            for section in list(other.sections.values()):
+                self.attach_section(section)
+
+            # subscribers are notified once everything is in place
+            self.sections = OrderedNodes(
+                (name, self.sections[name]) for name in other.sections
+            )
+            self.trailing_comment = other.trailing_comment
+
+            other.unnamed_section = IniConfigSection(UNNAMED_SECTION_NAME)
+            other.unnamed_section.owner = other
+            other.sections = OrderedNodes()
+
+        self.notify_structure_change()
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[Transaction]:
+        # changes done within the block are rolled back when it raises,
+        # listeners are notified about the changes only once committed
+        if self.active_transaction is not None:
+            raise SimpliniError("Transaction is already in progress")
+
+        transaction = Transaction(self)
+        self.active_transaction = transaction
+
+        try:
+            yield transaction
+        except BaseException:
+            self.active_transaction = None
+            transaction.rollback()
+            raise
+        finally:
+            self.active_transaction = None
+
+        transaction.commit()
+
+    def empty_copy(self: ConfigT) -> ConfigT:
+        # empty config of the same type with the same settings
+        return type(self)()
+
+    def clone(self: ConfigT) -> ConfigT:
+        # copy sharing the options with this config, the shared nodes are
+        # copied by either config on the first write, so the cost is
+        # proportional to the number of sections and then to the changes;
+        # change listeners are not copied
+        config = self.empty_copy()
+
+        with self.write_locked():
+            config.unnamed_section = self.unnamed_section.clone()
+            config.unnamed_section.owner = config
+
+            for section_name, section in self.sections.items():
+                cloned = section.clone()
+                cloned.owner = config
+                config.sections[section_name] = cloned
+
+            config.trailing_comment = (
+                None if self.trailing_comment is None else list(self.trailing_comment)
+            )
+
+            if self.key_index is not None:
+                config.key_index = self.key_index.copy()
+
+        return config
+
+    @classmethod
+    def from_dict(
+        cls: Type[ConfigT],
+        mapping: Mapping[str, Union[Mapping[str, Any], IniConfigSection]],
+    ) -> ConfigT:
+        config = cls()
+        config.update(mapping)
+        return config
+
     def __getitem__(self, section_name: str) -> IniConfigSection:
-        if section_name not in self.sections:
+        section = self.get_section(section_name)
+        if section is None:
             raise KeyError(f'Section "{section_name}" is not found')
-        return self.sections[section_name]
+        return section
 
     def __delitem__(self, section_name: str) -> None:
-        del self.sections[section_name]
+        with self.write_locked():
+            self.before_change()
+            section = self.sections.pop(section_name)
+            section.owner = None
+            if self.key_index is not None:
+                self.key_index.remove(section_name)
+        self.notify_change(section_name, None)
 
     def __contains__(self, section_name: str) -> bool:
         return section_name in self.sections
 
+    def before_change(self) -> None:
+        # lets the transaction in progress record the sections
+        if self.active_transaction is not None:
+            self.active_transaction.record_sections()
+
+    def fingerprint(self) -> bytes:
+        # content digest of the whole config, sections are taken in order;
+        # only the section digests are combined, those are cached
+        trailing_comment = comment_state(self.trailing_comment)
+        digest = hashlib.blake2b(digest_size=16)
+
+        for section in [self.unnamed_section, *self.sections.values()]:
+            digest.update(repr(section.name or UNNAMED_SECTION_NAME).encode("utf-8"))
+            digest.update(section.fingerprint())
+
+        digest.update(repr(trailing_comment).encode("utf-8"))
+
+        return digest.digest()
+
+    def content_equals(self, other: "IniConfigBase") -> bool:
+        # same content, comments and order included; configs themselves are
+        # compared and hashed by identity
+        return self is other or self.fingerprint() == other.fingerprint()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.sections)
+
+    # live views of the named sections, same as for the mapping
+
+    def keys(self) -> KeysView:
+        return self.sections.keys()
+
+    def values(self) -> ValuesView:
+        return self.sections.values()
+
+    def items(self) -> ItemsView:
+        return self.sections.items()
+
     def as_dict(self) -> Dict:
         result = {}
 
@@ -0,0 +1,374 @@
+import enum
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from simplini.config import IniConfig
+from simplini.core import (
+    UNNAMED_SECTION_NAME,
+    IniConfigBase,
+    IniConfigOption,
+    IniConfigSection,
+)
+
+OPTION_FIELDS = ("value", "style", "comment", "inline_comment")
+SECTION_FIELDS = ("comment", "inline_comment")
+
+
+class ChangeKind(enum.Enum):
+    ADDED = 0
+    REMOVED = 1
+    CHANGED = 2
+
+
+class Change:
+    def __init__(
+        self,
+        kind: ChangeKind,
+        section_name: str,
+        option_name: Optional[str],
+        old: Any,
+        new: Any,
+        fields: Tuple[str, ...] = (),
+    ):
+        self.kind = kind
+        self.section_name = section_name
+        # None for the section level changes
+        self.option_name = option_name
+        # options or sections
+        self.old = old
+        self.new = new
+        # names of the changed attributes for CHANGED kind
+        self.fields = fields
+
+    def __repr__(self) -> str:
+        return (
+            f"Change({self.kind.name}, {self.section_name!r}, "
+            f"{self.option_name!r}, fields={self.fields!r})"
+        )
+
+
+class ConfigDiff:
+    def __init__(self):
+        self.changes: List[Change] = []
+        self.trailing_comment_changed = False
+
+    def __bool__(self) -> bool:
+        return bool(self.changes) or self.trailing_comment_changed
+
+    def filter(self, kind: ChangeKind, sections: bool) -> List[Change]:
+        return [
+            change
+            for change in self.changes
+            if change.kind == kind and (change.option_name is None) == sections
+        ]
+
+    @property
+    def added_sections(self) -> List[Change]:
+        return self.filter(ChangeKind.ADDED, sections=True)
+
+    @property
+    def removed_sections(self) -> List[Change]:
+        return self.filter(ChangeKind.REMOVED, sections=True)
+
+    @property
+    def changed_sections(self) -> List[Change]:
+        return self.filter(ChangeKind.CHANGED, sections=True)
+
+    @property
+    def added_options(self) -> List[Change]:
+        return self.filter(ChangeKind.ADDED, sections=False)
+
+    @property
+    def removed_options(self) -> List[Change]:
+        return self.filter(ChangeKind.REMOVED, sections=False)
+
+    @property
+    def changed_options(self) -> List[Change]:
+        return self.filter(ChangeKind.CHANGED, sections=False)
+
+
+def normalized(value: Any) -> Any:
+    # parsed nodes have empty comment lists while created ones have None
+    if isinstance(value, list):
+        return tuple(value) or None
+    return value
+
+
+def option_state(option: Optional[IniConfigOption]) -> Optional[Tuple]:
+    if option is None:
+        return None
+    return tuple(normalized(getattr(option, field)) for field in OPTION_FIELDS)
+
+
+def section_digest(section: Optional[IniConfigSection]) -> Optional[bytes]:
+    # fingerprints are cached, so unchanged sections are not hashed again
+    if section is None:
+        return None
+    return section.fingerprint()
+
+
+def all_sections(config: IniConfigBase) -> Dict[str, IniConfigSection]:
+    sections = {UNNAMED_SECTION_NAME: config.unnamed_section}
+    sections.update(config.sections)
+    return sections
+
+
+def changed_fields(old: Any, new: Any, fields: Sequence[str]) -> Tuple[str, ...]:
+    return tuple(
+        field
+        for field in fields
+        if normalized(getattr(old, field)) != normalized(getattr(new, field))
+    )
+
+
+def diff_sections(
+    result: ConfigDiff,
+    section_name: str,
+    a: IniConfigSection,
+    b: IniConfigSection,
+) -> None:
+    fields = changed_fields(a, b, SECTION_FIELDS)
+
+    if list(a.options) != list(b.options):
+        fields += ("order",)
+
+    if fields:
+        result.changes.append(
+            Change(ChangeKind.CHANGED, section_name, None, a, b, fields)
+        )
+
+    for option_name, option_a in a.options.items():
+        option_b = b.options.get(option_name)
+
+        if option_b is None:
+            result.changes.append(
+                Change(ChangeKind.REMOVED, section_name, option_name, option_a, None)
+            )
+            continue
+
+        fields = changed_fields(option_a, option_b, OPTION_FIELDS)
+        if fields:
+            result.changes.append(
+                Change(
+                    ChangeKind.CHANGED,
+                    section_name,
+                    option_name,
+                    option_a,
+                    option_b,
+                    fields,
+                )
+            )
+
+    for option_name, option_b in b.options.items():
+        if option_name not in a.options:
+            result.changes.append(
+                Change(ChangeKind.ADDED, section_name, option_name, None, option_b)
+            )
+
+
+def diff(a: IniConfigBase, b: IniConfigBase) -> ConfigDiff:
+    # structural difference between configs, i.e. changes that turn "a" into "b"
+    result = ConfigDiff()
+
+    sections_a = all_sections(a)
+    sections_b = all_sections(b)
+
+    for section_name, section_a in sections_a.items():
+        section_b = sections_b.get(section_name)
+
+        if section_b is None:
+            result.changes.append(
+                Change(ChangeKind.REMOVED, section_name, None, section_a, None)
+            )
+            continue
+
+        # identical sections are skipped without comparing every option
+        if section_digest(section_a) == section_digest(section_b):
+            continue
+
+        diff_sections(result, section_name, section_a, section_b)
+
+    for section_name, section_b in sections_b.items():
+        if section_name not in sections_a:
+            result.changes.append(
+                Change(ChangeKind.ADDED, section_name, None, None, section_b)
+            )
+
+    result.trailing_comment_changed = (a.trailing_comment or None) != (
+        b.trailing_comment or None
+    )
+
+    return result
+
+
+class MergeConflict:
+    def __init__(
+        self,
+        section_name: str,
+        option_name: Optional[str],
+        base: Any,
+        ours: Any,
+        theirs: Any,
+    ):
+        self.section_name = section_name
+        # None for the section level conflicts
+        self.option_name = option_name
+        # options or sections (None when missing)
+        self.base = base
+        self.ours = ours
+        self.theirs = theirs
+
+    def __repr__(self) -> str:
+        return f"MergeConflict({self.section_name!r}, {self.option_name!r})"
+
+
+class MergeResult:
+    def __init__(self, config: IniConfig, conflicts: List[MergeConflict]):
+        self.config = config
+        self.conflicts = conflicts
+
+
+def pick(base: Any, ours: Any, theirs: Any) -> Tuple[bool, Any]:
+    # classic three-way rule for the comparable states,
+    # returns whether there is a conflict and the merged state
+    if ours == theirs or base == theirs:
+        return False, ours
+    if base == ours:
+        return False, theirs
+    return True, ours
+
+
+def merge_options(
+    section_name: str,
+    base: Optional[IniConfigSection],
+    ours: IniConfigSection,
+    theirs: IniConfigSection,
+    conflicts: List[MergeConflict],
+) -> IniConfigSection:
+    merged = IniConfigSection(section_name)
+
+    for field in SECTION_FIELDS:
+        conflict, value = pick(
+            None if base is None else normalized(getattr(base, field)),
+            normalized(getattr(ours, field)),
+            normalized(getattr(theirs, field)),
+        )
+        if conflict:
+            conflicts.append(MergeConflict(section_name, None, base, ours, theirs))
+        setattr(merged, field, list(value) if isinstance(value, tuple) else value)
+
+    base_options = {} if base is None else base.options
+
+    # ours order goes first, options added by them are appended
+    names = list(ours.options)
+    names.extend(name for name in theirs.options if name not in ours.options)
+    names.extend(
+        name
+        for name in base_options
+        if name not in ours.options and name not in theirs.options
+    )
+
+    for option_name in names:
+        base_option = base_options.get(option_name)
+        our_option = ours.options.get(option_name)
+        their_option = theirs.options.get(option_name)
+
+        conflict, state = pick(
+            option_state(base_option),
+            option_state(our_option),
+            option_state(their_option),
+        )
+
+        if conflict:
+            conflicts.append(
+                MergeConflict(
+                    section_name, option_name, base_option, our_option, their_option
+                )
+            )
+
+        if state is None:
+            continue
+
+        if state == option_state(our_option):
+            source = our_option
+        else:
+            source = their_option
+
+        assert source is not None
+        merged.options[option_name] = source.copy()
+
+    return merged
+
+
+def merge3(
+    base: IniConfigBase,
+    ours: IniConfigBase,
+    theirs: IniConfigBase,
+) -> MergeResult:
+    # three-way merge at the option level, conflicting changes are resolved
+    # in favor of "ours" and reported in the result
+    conflicts: List[MergeConflict] = []
+    config = IniConfig()
+
+    if isinstance(ours, IniConfig):
+        config.flavour = ours.flavour
+        config.renderer = ours.renderer
+        config.encoding = ours.encoding
+
+    base_sections = all_sections(base)
+    our_sections = all_sections(ours)
+    their_sections = all_sections(theirs)
+
+    names = list(our_sections)
+    names.extend(name for name in their_sections if name not in our_sections)
+
+    for section_name in names:
+        base_section = base_sections.get(section_name)
+        our_section = our_sections.get(section_name)
+        their_section = their_sections.get(section_name)
+
+        base_digest = section_digest(base_section)
+        our_digest = section_digest(our_section)
+        their_digest = section_digest(their_section)
+
+        # whole sections are taken as is when only one side changed them
+        if our_digest == their_digest or base_digest == their_digest:
+            section = our_section
+        elif base_digest == our_digest:
+            section = their_section
+        elif our_section is None or their_section is None:
+            # removed on one side, but modified on the other
+            conflicts.append(
+                MergeConflict(
+                    section_name, None, base_section, our_section, their_section
+                )
+            )
+            section = our_section
+        else:
+            section = merge_options(
+                section_name, base_section, our_section, their_section, conflicts
+            )
+            config.add_section(section)
+            continue
+
+        if section is None:
+            continue
+
+        copied = IniConfigSection(section_name)
+        copied.comment = None if section.comment is None else list(section.comment)
+        copied.inline_comment = section.inline_comment
+        copied.options.update(
+            (name, option.copy()) for name, option in section.options.items()
+        )
+        config.add_section(copied)
+
+    # trailing comment conflicts are resolved in favor of ours silently
+    _, trailing_comment = pick(
+        base.trailing_comment or None,
+        ours.trailing_comment or None,
+        theirs.trailing_comment or None,
+    )
+    config.trailing_comment = (
+        None if trailing_comment is None else list(trailing_comment)
+    )
+
+    return MergeResult(config, conflicts)
@@ -0,0 +1,116 @@
+import contextlib
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# (section name, option name), the latter is None for section-level changes
+ChangeKey = Tuple[str, Optional[str]]
+
+SubscriptionCallback = Callable[[List[ChangeKey]], None]
+
+
+class Subscription:
+    def __init__(
+        self,
+        dispatcher: "EventDispatcher",
+        callback: SubscriptionCallback,
+        section_name: Optional[str],
+        option_name: Optional[str],
+    ):
+        self.dispatcher = dispatcher
+        self.callback = callback
+        # None matches any section or option
+        self.section_name = section_name
+        self.option_name = option_name
+        self.active = True
+
+    def cancel(self) -> None:
+        if self.active:
+            self.dispatcher.unsubscribe(self)
+
+
+class EventDispatcher:
+    # Delivers the changes to the subscriptions matching them. Subscriptions
+    # are indexed by section and option names, so that only the matching ones
+    # are looked at. Changes done within a batch are coalesced into a single
+    # notification per subscription listing all the changed keys.
+    def __init__(self):
+        # section name -> option name -> subscriptions
+        self.subscriptions: Dict[
+            Optional[str], Dict[Optional[str], List[Subscription]]
+        ] = {}
+        self.batch_depth = 0
+        # subscription -> changed keys (dict as an ordered set)
+        self.pending: Dict[Subscription, Dict[ChangeKey, None]] = {}
+
+    def subscribe(
+        self,
+        callback: SubscriptionCallback,
+        section_name: Optional[str] = None,
+        option_name: Optional[str] = None,
+    ) -> Subscription:
+        subscription = Subscription(self, callback, section_name, option_name)
+        by_option = self.subscriptions.setdefault(section_name, {})
+        by_option.setdefault(option_name, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.active = False
+
+        by_option = self.subscriptions[subscription.section_name]
+        subscriptions = by_option[subscription.option_name]
+        subscriptions.remove(subscription)
+
+        if not subscriptions:
+            del by_option[subscription.option_name]
+            if not by_option:
+                del self.subscriptions[subscription.section_name]
+
+        self.pending.pop(subscription, None)
+
+    def matching(
+        self,
+        section_name: str,
+        option_name: Optional[str],
+    ) -> Iterator[Subscription]:
+        for by_option in (
+            self.subscriptions.get(section_name),
+            self.subscriptions.get(None),
+        ):
+            if by_option is None:
+                continue
+
+            if option_name is None:
+                # anything in the section might have changed
+                for subscriptions in by_option.values():
+                    yield from subscriptions
+            else:
+                yield from by_option.get(option_name, ())
+                yield from by_option.get(None, ())
+
+    def on_change(self, section_name: str, option_name: Optional[str]) -> None:
+        if not self.subscriptions:
+            return
+
+        key = (section_name, option_name)
+
+        if self.batch_depth:
+            for subscription in self.matching(section_name, option_name):
+                self.pending.setdefault(subscription, {})[key] = None
+        else:
+            for subscription in list(self.matching(section_name, option_name)):
+                subscription.callback([key])
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        self.batch_depth += 1
+        try:
+            yield
+        finally:
+            self.batch_depth -= 1
+            if not self.batch_depth:
+                self.flush()
+
+    def flush(self) -> None:
+        pending, self.pending = self.pending, {}
+        for subscription, keys in pending.items():
+            if subscription.active:
+                subscription.callback(list(keys))
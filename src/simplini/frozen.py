@@ -0,0 +1,208 @@
+import types
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from simplini.converters import Converter, resolve_converter
+from simplini.core import (
+    UNNAMED_SECTION_NAME,
+    ConversionError,
+    IniConfigBase,
+    IniConfigOption,
+    IniConfigSection,
+    SimpliniError,
+    ValuePresentationStyle,
+)
+
+Comment = Optional[Tuple[str, ...]]
+
+# name, value, comment, inline comment, style
+FrozenOption = Tuple[str, str, Comment, Optional[str], Optional[ValuePresentationStyle]]
+
+# name, comment, inline comment, options
+FrozenSection = Tuple[str, Comment, Optional[str], Tuple[FrozenOption, ...]]
+
+
+def freeze_comment(comment: Optional[List[str]]) -> Comment:
+    # parsed nodes have empty comment lists while created ones have None
+    if not comment:
+        return None
+    return tuple(comment)
+
+
+def thaw_comment(comment: Comment) -> Optional[List[str]]:
+    return None if comment is None else list(comment)
+
+
+def freeze_section(section: IniConfigSection) -> FrozenSection:
+    return (
+        section.name or UNNAMED_SECTION_NAME,
+        freeze_comment(section.comment),
+        section.inline_comment,
+        tuple(
+            (
+                option.name,
+                option.value,
+                freeze_comment(option.comment),
+                option.inline_comment,
+                option.style,
+            )
+            for option in section.options.values()
+        ),
+    )
+
+
+class FrozenIniConfig:
+    # Immutable snapshot of the config which is safe to share between threads
+    # and to be used as a cache key. All the lookup tables are built upfront,
+    # values are looked up in a single flat (section, option) dict.
+    __slots__ = (
+        "sections",
+        "trailing_comment",
+        "values",
+        "section_values",
+        "hash_value",
+        "template",
+    )
+
+    def __init__(self, config: IniConfigBase):
+        sections = [freeze_section(config.unnamed_section)]
+        sections.extend(freeze_section(section) for section in config.sections.values())
+
+        values: Dict[Tuple[str, str], str] = {}
+        section_values: Dict[str, Mapping[str, str]] = {}
+
+        for section_name, _, _, options in sections:
+            section_values[section_name] = types.MappingProxyType(
+                {option[0]: option[1] for option in options}
+            )
+            for option in options:
+                values[(section_name, option[0])] = option[1]
+
+        trailing_comment = freeze_comment(config.trailing_comment)
+
+        setattr_ = object.__setattr__
+        setattr_(self, "sections", tuple(sections))
+        setattr_(self, "trailing_comment", trailing_comment)
+        setattr_(self, "values", types.MappingProxyType(values))
+        setattr_(self, "hash_value", hash((self.sections, trailing_comment)))
+        # settings like flavour are taken from it on thawing
+        setattr_(self, "template", config.empty_copy())
+        # read-only mapping views per section
+        setattr_(self, "section_values", section_values)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise SimpliniError("FrozenIniConfig is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise SimpliniError("FrozenIniConfig is immutable")
+
+    def __hash__(self) -> int:
+        return self.hash_value
+
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, FrozenIniConfig):
+            return NotImplemented
+        if self.hash_value != other.hash_value:
+            return False
+        return (
+            self.sections == other.sections
+            and self.trailing_comment == other.trailing_comment
+        )
+
+    def __repr__(self) -> str:
+        return f"FrozenIniConfig({len(self.sections) - 1} sections)"
+
+    def get(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+    ) -> Optional[str]:
+        return self.values.get((section_name or UNNAMED_SECTION_NAME, option_name))
+
+    def get_as(
+        self,
+        option_name: str,
+        converter: Union[str, Converter],
+        section_name: Optional[str] = None,
+        default: Any = None,
+    ) -> Any:
+        value = self.get(option_name, section_name)
+        if value is None:
+            return default
+        try:
+            return resolve_converter(converter)(value)
+        except ValueError as err:
+            raise ConversionError(
+                f'Unable to convert option "{option_name}" '
+                f'in section "{section_name or UNNAMED_SECTION_NAME}": {err}'
+            ) from err
+
+    def get_int(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+        default: Optional[int] = None,
+    ) -> Optional[int]:
+        return self.get_as(option_name, int, section_name, default)
+
+    def get_float(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+        default: Optional[float] = None,
+    ) -> Optional[float]:
+        return self.get_as(option_name, float, section_name, default)
+
+    def get_bool(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+        default: Optional[bool] = None,
+    ) -> Optional[bool]:
+        return self.get_as(option_name, "bool", section_name, default)
+
+    def __getitem__(self, section_name: str) -> Mapping[str, str]:
+        if section_name not in self.section_values:
+            raise KeyError(f'Section "{section_name}" is not found')
+        return self.section_values[section_name]
+
+    def __contains__(self, section_name: str) -> bool:
+        return section_name in self.section_values
+
+    def __iter__(self) -> Iterator[str]:
+        # named sections only, same as for the mutable config
+        for section in self.sections[1:]:
+            yield section[0]
+
+    def as_dict(self) -> Dict:
+        result = {}
+
+        for section_name, _, _, options in self.sections:
+            if section_name == UNNAMED_SECTION_NAME and not options:
+                continue
+            result[section_name] = {option[0]: option[1] for option in options}
+
+        return result
+
+    def thaw(self) -> IniConfigBase:
+        # mutable copy of the snapshot
+        config = self.template.empty_copy()
+
+        for section_name, comment, inline_comment, options in self.sections:
+            section = IniConfigSection(section_name)
+            section.comment = thaw_comment(comment)
+            section.inline_comment = inline_comment
+
+            for name, value, option_comment, option_inline_comment, style in options:
+                option = IniConfigOption(name, value)
+                option.comment = thaw_comment(option_comment)
+                option.inline_comment = option_inline_comment
+                option.style = style
+                section.options[name] = option
+
+            config.add_section(section)
+
+        config.trailing_comment = thaw_comment(self.trailing_comment)
+
+        return config
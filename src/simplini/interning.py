@@ -0,0 +1,75 @@
+import hashlib
+from typing import Dict, List, Optional
+
+from simplini.core import IniConfigOption, IniConfigSection
+
+
+class InterningPool:
+    # Shares identical sections between the parsed configs, e.g. when a lot of
+    # similar files are loaded at once. Sections are looked up by the content
+    # hash and the configs get copy-on-write clones of the first parsed one,
+    # so that the options are stored once per unique section. Names, values
+    # and comments of the unique sections are interned as well.
+    def __init__(self):
+        self.strings: Dict[str, str] = {}
+        # content digest -> section nobody modifies, used for cloning
+        self.sections: Dict[bytes, IniConfigSection] = {}
+
+    def intern_string(self, value: str) -> str:
+        return self.strings.setdefault(value, value)
+
+    def intern_comment(self, comment: Optional[List[str]]) -> Optional[List[str]]:
+        if comment is None:
+            return None
+        return [self.intern_string(line) for line in comment]
+
+    def intern_option(self, option: IniConfigOption) -> None:
+        option.name = self.intern_string(option.name)
+        option.value = self.intern_string(option.value)
+        option.comment = self.intern_comment(option.comment)
+        if option.inline_comment is not None:
+            option.inline_comment = self.intern_string(option.inline_comment)
+
+    @staticmethod
+    def section_digest(section: IniConfigSection) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+
+        state = (section.name or "", section.comment or None, section.inline_comment)
+        digest.update(repr(state).encode("utf-8"))
+
+        for option in section.options.values():
+            state = (
+                option.name,
+                option.value,
+                option.comment or None,
+                option.inline_comment,
+                option.style,
+            )
+            digest.update(repr(state).encode("utf-8"))
+
+        return digest.digest()
+
+    def intern_section(self, section: IniConfigSection) -> IniConfigSection:
+        # returns the section to be used instead of the given one
+        digest = self.section_digest(section)
+
+        canonical = self.sections.get(digest)
+
+        if canonical is not None:
+            return canonical.clone()
+
+        section.name = (
+            None if section.name is None else self.intern_string(section.name)
+        )
+        section.comment = self.intern_comment(section.comment)
+
+        for option in section.options.values():
+            self.intern_option(option)
+
+        self.sections[digest] = section.clone()
+
+        return section
+
+    def clear(self) -> None:
+        self.strings = {}
+        self.sections = {}
@@ -0,0 +1,194 @@
+import os
+import re
+from typing import Dict, List, Mapping, Match, Optional, Set, Tuple
+
+from simplini.core import UNNAMED_SECTION_NAME, IniConfigBase, SimpliniError
+
+# (section name, option name)
+OptionKey = Tuple[str, str]
+
+# "$$" is an escaped dollar sign, "${section:option}" references the option
+# (empty section name for the unnamed section) and "${NAME}" references
+# the environment variable
+REFERENCE_RE = re.compile(r"\$(?:(\$)|\{([^{}]*)\})")
+
+
+class InterpolationError(SimpliniError):
+    pass
+
+
+class InterpolationCycleError(InterpolationError):
+    def __init__(self, cycle: List[OptionKey]):
+        super().__init__(
+            "Interpolation cycle: " + " -> ".join(describe_key(key) for key in cycle)
+        )
+        # options forming the cycle, the first one is repeated at the end
+        self.cycle = cycle
+
+
+def describe_key(key: OptionKey) -> str:
+    return "${%s:%s}" % key
+
+
+class Interpolator:
+    # Resolves "${section:option}" and "${ENV}" references on top of the
+    # config, which itself is left untouched and keeps the raw values for
+    # saving. Resolved values are memoized along with the dependency graph,
+    # so that a change invalidates the option and its dependents only.
+    def __init__(
+        self,
+        config: IniConfigBase,
+        environ: Optional[Mapping[str, str]] = None,
+    ):
+        self.config = config
+        self.environ = os.environ if environ is None else environ
+        self.resolved: Dict[OptionKey, str] = {}
+        # referenced options and environment variables per option
+        self.dependencies: Dict[OptionKey, Set[OptionKey]] = {}
+        self.env_dependencies: Dict[OptionKey, Set[str]] = {}
+        # reverse edges, also kept for the missing references
+        self.dependents: Dict[OptionKey, Set[OptionKey]] = {}
+        self.env_dependents: Dict[str, Set[OptionKey]] = {}
+        # options being resolved, for the cycles detection
+        self.resolving: List[OptionKey] = []
+
+        config.add_cache_listener(self.on_change)
+
+    def close(self) -> None:
+        self.config.remove_cache_listener(self.on_change)
+
+    def on_change(self, section_name: str, option_name: Optional[str]) -> None:
+        if option_name is not None:
+            self.invalidate((section_name, option_name))
+            return
+
+        # anything in the section might have changed
+        keys = {key for key in self.resolved if key[0] == section_name}
+        keys.update(key for key in self.dependents if key[0] == section_name)
+
+        for key in keys:
+            self.invalidate(key)
+
+    def invalidate(self, key: OptionKey) -> None:
+        stack = [key]
+
+        while stack:
+            key = stack.pop()
+
+            self.resolved.pop(key, None)
+
+            for dependency in self.dependencies.pop(key, ()):
+                self.dependents[dependency].discard(key)
+
+            for name in self.env_dependencies.pop(key, ()):
+                self.env_dependents[name].discard(key)
+
+            stack.extend(self.dependents.get(key, ()))
+
+    def invalidate_environment(self, names: Optional[List[str]] = None) -> None:
+        # values referencing the environment are not refreshed automatically
+        if names is None:
+            names = list(self.env_dependents)
+
+        for name in names:
+            for key in list(self.env_dependents.get(name, ())):
+                self.invalidate(key)
+
+    def get(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+    ) -> Optional[str]:
+        return self.resolve((section_name or UNNAMED_SECTION_NAME, option_name))
+
+    def resolve(self, key: OptionKey) -> Optional[str]:
+        value = self.resolved.get(key)
+
+        if value is not None:
+            return value
+
+        if key[0] == UNNAMED_SECTION_NAME:
+            section = self.config.unnamed_section
+        else:
+            section = self.config.get_section(key[0])
+
+        raw_value = None if section is None else section.get(key[1])
+
+        if raw_value is None:
+            return None
+
+        if key in self.resolving:
+            cycle = self.resolving[self.resolving.index(key) :]
+            cycle.append(key)
+            raise InterpolationCycleError(cycle)
+
+        self.resolving.append(key)
+        try:
+            value = self.expand(key, raw_value)
+        finally:
+            self.resolving.pop()
+
+        self.resolved[key] = value
+
+        return value
+
+    def expand(self, key: OptionKey, raw_value: str) -> str:
+        if "$" not in raw_value:
+            return raw_value
+
+        def replace(match: Match) -> str:
+            if match.group(1):
+                return "$"
+
+            reference = match.group(2)
+
+            if ":" in reference:
+                section_name, option_name = reference.split(":", 1)
+                referenced_key = (section_name, option_name)
+
+                self.dependencies.setdefault(key, set()).add(referenced_key)
+                self.dependents.setdefault(referenced_key, set()).add(key)
+
+                value = self.resolve(referenced_key)
+
+                if value is None:
+                    raise InterpolationError(
+                        f"Option {describe_key(referenced_key)} referenced "
+                        f"from {describe_key(key)} is not found"
+                    )
+
+                return value
+
+            self.env_dependencies.setdefault(key, set()).add(reference)
+            self.env_dependents.setdefault(reference, set()).add(key)
+
+            value = self.environ.get(reference)
+
+            if value is None:
+                raise InterpolationError(
+                    f'Environment variable "{reference}" referenced '
+                    f"from {describe_key(key)} is not set"
+                )
+
+            return value
+
+        return REFERENCE_RE.sub(replace, raw_value)
+
+    def as_dict(self) -> Dict:
+        # resolves the whole config reporting the first problem found
+        result = {}
+
+        sections = [self.config.unnamed_section, *self.config.sections.values()]
+
+        for section in sections:
+            section_name = section.name or UNNAMED_SECTION_NAME
+
+            if not section.options and section_name == UNNAMED_SECTION_NAME:
+                continue
+
+            result[section_name] = {
+                option_name: self.resolve((section_name, option_name))
+                for option_name in section.options
+            }
+
+        return result
@@ -0,0 +1,165 @@
+import json
+import logging
+import os
+from typing import Callable, List, Optional
+
+from simplini.core import UNNAMED_SECTION_NAME, IniConfigBase, SimpliniError
+
+LOGGER = logging.getLogger(__name__)
+
+JOURNAL_SUFFIX = ".journal"
+
+
+class JournalError(SimpliniError):
+    pass
+
+
+class IniJournal:
+    # Append-only log of the changes made to the config, stored next to the
+    # config file. Every record is a JSON array on its own line:
+    #
+    #   ["set", section, option, value]
+    #   ["del", section, option]
+    #   ["section", section]
+    #   ["del_section", section]
+    #
+    # Records are idempotent, so replaying the journal on top of the config
+    # compacted with the same changes yields the same result; this makes the
+    # compaction crash safe as the journal is truncated only after the config
+    # file was atomically replaced. Records do not describe the order, so the
+    # journal is compacted right away when the sections or options are
+    # reordered or renamed, see IniConfigBase.notify_structure_change.
+    def __init__(
+        self,
+        config: IniConfigBase,
+        path: str,
+        compact_fn: Callable[[], None],
+        compact_threshold: int = 1024 * 1024,
+        fsync: bool = True,
+    ):
+        self.config = config
+        self.path = path
+        self.compact_fn = compact_fn
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
+        self.file = None
+        self.size = 0
+
+    def open(self) -> None:
+        self.replay()
+        self.file = open(self.path, "ab")
+        self.size = self.file.tell()
+        self.config.add_change_listener(self.on_change)
+        self.config.add_structure_listener(self.compact)
+
+        if self.size > self.compact_threshold:
+            self.compact()
+
+    def close(self) -> None:
+        if self.file is None:
+            return
+        self.config.remove_change_listener(self.on_change)
+        self.config.remove_structure_listener(self.compact)
+        self.file.close()
+        self.file = None
+
+    def apply(self, record: List) -> None:
+        kind = record[0]
+        if kind == "set":
+            _, section_name, option_name, value = record
+            self.config.set(option_name, value, section_name=section_name)
+        elif kind == "del":
+            _, section_name, option_name = record
+            section = self.config.ensure_section(section_name)
+            if option_name in section:
+                del section[option_name]
+        elif kind == "section":
+            _, section_name = record
+            self.config.ensure_section(section_name)
+        elif kind == "del_section":
+            _, section_name = record
+            if section_name in self.config:
+                del self.config[section_name]
+        else:
+            raise JournalError(f"Unknown journal record: {record!r}")
+
+    def replay(self) -> None:
+        if not os.path.exists(self.path):
+            return
+
+        good_size = 0
+
+        with open(self.path, "rb") as file:
+            for line_idx, line in enumerate(file):
+                # last record was not completely written, discard it
+                if not line.endswith(b"\n"):
+                    break
+
+                try:
+                    record = json.loads(line.decode("utf-8"))
+                except ValueError as err:
+                    raise JournalError(
+                        f"Corrupted journal record at line {line_idx + 1} "
+                        f"of {self.path}"
+                    ) from err
+
+                self.apply(record)
+                good_size += len(line)
+
+            total_size = file.seek(0, os.SEEK_END)
+
+        if good_size < total_size:
+            LOGGER.warning("discarding incomplete journal record in %s", self.path)
+            os.truncate(self.path, good_size)
+
+    def record_for(self, section_name: str, option_name: Optional[str]) -> List:
+        if option_name is None:
+            if section_name and section_name not in self.config:
+                return ["del_section", section_name]
+            return ["section", section_name]
+
+        if section_name == UNNAMED_SECTION_NAME:
+            section = self.config.unnamed_section
+        else:
+            section = self.config.get_section(section_name)
+
+        # read directly, so that the records are not traced as lookups
+        option = None if section is None else section.options.get(option_name)
+
+        if option is None:
+            return ["del", section_name, option_name]
+
+        return ["set", section_name, option_name, option.value]
+
+    def on_change(self, section_name: str, option_name: Optional[str]) -> None:
+        self.append(self.record_for(section_name, option_name))
+
+    def append(self, record: List) -> None:
+        assert self.file is not None
+
+        data = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+
+        # single write per record, so that the crash can only tear the last one
+        self.file.write(data)
+        self.file.flush()
+
+        if self.fsync:
+            os.fsync(self.file.fileno())
+
+        self.size += len(data)
+
+        if self.size > self.compact_threshold:
+            self.compact()
+
+    def compact(self) -> None:
+        assert self.file is not None
+
+        self.compact_fn()
+
+        self.file.truncate(0)
+        self.file.flush()
+
+        if self.fsync:
+            os.fsync(self.file.fileno())
+
+        self.size = 0
@@ -0,0 +1,69 @@
+import sys
+from typing import List, Optional, Union
+
+from simplini.config import IniConfig
+from simplini.core import IniConfigOption, IniConfigSection
+from simplini.diffing import merge3
+from simplini.renderer import IniConfigRenderer, ValuesRenderingStyle
+
+
+def describe_state(option: Optional[IniConfigOption]) -> str:
+    return "<missing>" if option is None else repr(option.value)
+
+
+def merge_driver(base_path: str, ours_path: str, theirs_path: str) -> int:
+    # git merge driver, configure it with:
+    #
+    #   git config merge.simplini.driver "python -m simplini.merge_driver %O %A %B"
+    #
+    # and "*.ini merge=simplini" in .gitattributes; merged config is written
+    # into "ours" file, conflicting options get explanatory comments and the
+    # non-zero exit code is returned, so that git reports the conflict
+    result = merge3(
+        IniConfig.load(base_path),
+        IniConfig.load(ours_path),
+        IniConfig.load(theirs_path),
+    )
+
+    for conflict in result.conflicts:
+        if conflict.option_name is None:
+            section = result.config.get_section(conflict.section_name)
+            target: Union[IniConfigSection, IniConfigOption, None] = section
+            message = "merge conflict: section changed on both sides"
+        else:
+            target = result.config.get_option(
+                conflict.option_name, conflict.section_name
+            )
+            message = (
+                f"merge conflict: base={describe_state(conflict.base)}, "
+                f"ours={describe_state(conflict.ours)}, "
+                f"theirs={describe_state(conflict.theirs)}"
+            )
+
+        if target is not None:
+            target.comment = (target.comment or []) + [message]
+        else:
+            comment = result.config.trailing_comment or []
+            result.config.trailing_comment = comment + [
+                f"{message} ({conflict.section_name}/{conflict.option_name})"
+            ]
+
+    # values are written the way they were, so that the merge does not
+    # requote the untouched lines
+    renderer = IniConfigRenderer()
+    renderer.values_rendering_style = ValuesRenderingStyle.PREFER_SOURCE
+    result.config.renderer = renderer
+    result.config.save(ours_path)
+
+    return 1 if result.conflicts else 0
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) != 3:
+        sys.stderr.write("usage: python -m simplini.merge_driver BASE OURS THEIRS\n")
+        return 2
+    return merge_driver(*argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
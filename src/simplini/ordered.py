@@ -0,0 +1,194 @@
+from collections.abc import ItemsView, KeysView, ValuesView
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+# key of the root link, the list of links is circular
+ROOT: Any = object()
+
+
+class OrderedNodesValuesView(ValuesView):
+    def __iter__(self) -> Iterator:
+        nodes = self._mapping
+        if nodes.links is None:
+            return iter(dict.values(nodes))
+        return (dict.__getitem__(nodes, key) for key in nodes.iter_linked())
+
+
+class OrderedNodesItemsView(ItemsView):
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        nodes = self._mapping
+        if nodes.links is None:
+            return iter(dict.items(nodes))
+        return ((key, dict.__getitem__(nodes, key)) for key in nodes.iter_linked())
+
+
+class OrderedNodes(Dict[str, V]):
+    # Dict where the nodes can be moved and renamed in place. Lookups are the
+    # ones of the dict itself; the order is kept by the dict as well until
+    # the first move or rename, since then it is kept by the doubly linked
+    # list of the keys, so that nodes are moved around without rebuilding
+    # the whole dict.
+    __slots__ = ("links",)
+
+    def __init__(self, items: Iterable = ()):
+        super().__init__()
+        # key -> [previous key, next key], built lazily
+        self.links: Optional[Dict[Any, List[Any]]] = None
+        dict.update(self, items)
+
+    def link(self) -> Dict[Any, List[Any]]:
+        links = self.links
+
+        if links is None:
+            links = {ROOT: [ROOT, ROOT]}
+            last = ROOT
+            for key in dict.__iter__(self):
+                links[key] = [last, ROOT]
+                links[last][1] = key
+                last = key
+            links[ROOT][0] = last
+            self.links = links
+
+        return links
+
+    def link_before(self, key: str, next_key: Any) -> None:
+        links = self.links
+        assert links is not None
+        previous_key = links[next_key][0]
+        links[key] = [previous_key, next_key]
+        links[previous_key][1] = key
+        links[next_key][0] = key
+
+    def unlink(self, key: str) -> None:
+        links = self.links
+        assert links is not None
+        previous_key, next_key = links.pop(key)
+        links[previous_key][1] = next_key
+        links[next_key][0] = previous_key
+
+    def iter_linked(self, reverse: bool = False) -> Iterator[str]:
+        links = self.links
+        assert links is not None
+        index = 0 if reverse else 1
+        key = links[ROOT][index]
+        while key is not ROOT:
+            yield key
+            key = links[key][index]
+
+    def __setitem__(self, key: str, value: V) -> None:
+        if self.links is not None and key not in self:
+            self.link_before(key, ROOT)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        dict.__delitem__(self, key)
+        if self.links is not None:
+            self.unlink(key)
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if self.links is not None and key in self:
+            self.unlink(key)
+        return dict.pop(self, key, *default)
+
+    def popitem(self) -> Tuple[str, V]:
+        if self.links is None:
+            return dict.popitem(self)
+        key = self.links[ROOT][0]
+        if key is ROOT:
+            raise KeyError("popitem(): dictionary is empty")
+        return key, self.pop(key)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        if self.links is None:
+            dict.update(self, *args, **kwargs)
+            return
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self) -> None:
+        dict.clear(self)
+        self.links = None
+
+    def copy(self) -> "OrderedNodes[V]":
+        # copy is compact, its dict order is the order of the nodes
+        return OrderedNodes(self.items())
+
+    def __iter__(self) -> Iterator[str]:
+        if self.links is None:
+            return dict.__iter__(self)
+        return self.iter_linked()
+
+    def __reversed__(self) -> Iterator[str]:
+        if self.links is None:
+            return reversed(list(dict.__iter__(self)))
+        return self.iter_linked(reverse=True)
+
+    def keys(self) -> KeysView:  # type: ignore[override]
+        return KeysView(self)
+
+    def values(self) -> ValuesView:  # type: ignore[override]
+        return OrderedNodesValuesView(self)
+
+    def items(self) -> ItemsView:  # type: ignore[override]
+        return OrderedNodesItemsView(self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def __reduce__(self) -> Tuple:
+        return self.__class__, (list(self.items()),)
+
+    def move_to_end(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        if self.links is None:
+            # re-inserted key goes to the end of the dict
+            dict.__setitem__(self, key, dict.pop(self, key))
+            return
+        self.unlink(key)
+        self.link_before(key, ROOT)
+
+    def move_before(self, key: str, anchor: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        if anchor not in self:
+            raise KeyError(anchor)
+        if key == anchor:
+            return
+        self.link()
+        self.unlink(key)
+        self.link_before(key, anchor)
+
+    def move_after(self, key: str, anchor: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        if anchor not in self:
+            raise KeyError(anchor)
+        if key == anchor:
+            return
+        links = self.link()
+        self.unlink(key)
+        self.link_before(key, links[anchor][1])
+
+    def rename(self, key: str, new_key: str) -> None:
+        # new key takes the place of the old one
+        if key not in self:
+            raise KeyError(key)
+        if key == new_key:
+            return
+        if new_key in self:
+            raise KeyError(f"{new_key} already exists")
+
+        links = self.link()
+        dict.__setitem__(self, new_key, dict.pop(self, key))
+
+        link = links.pop(key)
+        links[new_key] = link
+        links[link[0]][1] = new_key
+        links[link[1]][0] = new_key
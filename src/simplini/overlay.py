@@ -0,0 +1,148 @@
+import os
+import re
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Union
+
+from simplini.converters import Converter, resolve_converter
+from simplini.core import (
+    UNNAMED_SECTION_NAME,
+    ConversionError,
+    IniConfigBase,
+    IniConfigOption,
+)
+
+# (section name, option name) -> environment variable name
+NamingScheme = Callable[[str, str], str]
+
+NOT_SET = object()
+
+
+class EnvironmentOption(IniConfigOption):
+    # option with the value coming from the environment variable
+    def __init__(self, name: str, value: str, variable_name: str):
+        super().__init__(name, value)
+        self.variable_name = variable_name
+
+    def __repr__(self) -> str:
+        return (
+            f"EnvironmentOption({self.name!r}, {self.value!r}, {self.variable_name!r})"
+        )
+
+
+def default_naming_scheme(prefix: str = "", separator: str = "__") -> NamingScheme:
+    # e.g. "APP__DATABASE__PORT" for "port" option in "database" section and
+    # "APP__DEBUG" for "debug" option in the unnamed section
+    def variable_name(section_name: str, option_name: str) -> str:
+        parts = [prefix, section_name, option_name]
+        return separator.join(
+            re.sub(r"\W", "_", part).upper() for part in parts if part
+        )
+
+    return variable_name
+
+
+class EnvironmentOverlay:
+    # Read-only view of the config where options can be overridden with the
+    # environment variables, which are looked up lazily and cached; the
+    # config is not modified, so that overrides never get saved.
+    def __init__(
+        self,
+        config: IniConfigBase,
+        prefix: str = "",
+        separator: str = "__",
+        naming_scheme: Optional[NamingScheme] = None,
+        environ: Optional[Mapping[str, str]] = None,
+    ):
+        self.config = config
+        self.naming_scheme = naming_scheme or default_naming_scheme(prefix, separator)
+        self.environ = os.environ if environ is None else environ
+        # (section name, option name) -> option or NOT_SET
+        self.cache: Dict[Tuple[str, str], Any] = {}
+
+    def refresh(self) -> None:
+        # environment is re-read on the next lookups
+        self.cache = {}
+
+    def get_environment_option(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+    ) -> Optional[EnvironmentOption]:
+        key = (section_name or UNNAMED_SECTION_NAME, option_name)
+
+        option = self.cache.get(key)
+
+        if option is None:
+            variable_name = self.naming_scheme(*key)
+            value = self.environ.get(variable_name)
+
+            if value is None:
+                option = NOT_SET
+            else:
+                option = EnvironmentOption(option_name, value, variable_name)
+
+                # keeping the comments for the rendering
+                if key[0] == UNNAMED_SECTION_NAME:
+                    section = self.config.unnamed_section
+                else:
+                    section = self.config.get_section(key[0])
+                # read directly, so that it is not traced as a lookup
+                original = None if section is None else section.options.get(option_name)
+                if original is not None:
+                    option.comment = original.comment
+                    option.inline_comment = original.inline_comment
+
+            self.cache[key] = option
+
+        if option is NOT_SET:
+            return None
+
+        return option
+
+    def get_option(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+    ) -> Optional[IniConfigOption]:
+        # EnvironmentOption when overridden by the environment variable
+        option = self.get_environment_option(option_name, section_name)
+
+        if option is None:
+            return self.config.get_option(option_name, section_name)
+
+        return option
+
+    def get(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+    ) -> Optional[str]:
+        option = self.get_option(option_name, section_name)
+        if option is None:
+            return None
+        return option.value
+
+    def get_as(
+        self,
+        option_name: str,
+        converter: Union[str, Converter],
+        section_name: Optional[str] = None,
+        default: Any = None,
+    ) -> Any:
+        option = self.get_environment_option(option_name, section_name)
+        if option is None:
+            return self.config.get_as(option_name, converter, section_name, default)
+        converter = resolve_converter(converter)
+        try:
+            return option.convert(converter)
+        except ValueError as err:
+            raise ConversionError(
+                f'Unable to convert environment variable "{option.variable_name}": '
+                f"{err}"
+            ) from err
+
+    def is_overridden(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+    ) -> bool:
+        return self.get_environment_option(option_name, section_name) is not None
@@ -11,6 +11,7 @@ from simplini.core import (
     SimpliniError,
     ValuePresentationStyle,
 )
+from simplini.interning import InterningPool
 
 T = TypeVar("T")
 ParseFn = Callable[[], T]
@@ -229,9 +230,16 @@ class IniParserImpl(RecursiveDescentParserBase):
         self,
         text_io: TextIOBase,
         flavour: IniFlavour,
+        interning_pool: Optional[InterningPool] = None,
     ):
         super().__init__(text_io)
         self.flavour = flavour
+        self.interning_pool = interning_pool
+
+    def add_section(self, config: IniConfigBase, section: IniConfigSection) -> None:
+        if self.interning_pool is not None:
+            section = self.interning_pool.intern_section(section)
+        config.add_section(section)
 
     def resolve_escape_sequence(self, sequence: str) -> str:
         if sequence not in self.flavour.escape_sequences:
@@ -505,9 +513,9 @@ class IniParserImpl(RecursiveDescentParserBase):
 
     def parse_normal(self, config: IniConfigBase):
         # parse unnamed section
-        config.unnamed_section = IniConfigSection(None)
-
-        self.parse_section_body(config.unnamed_section)
+        unnamed_section = IniConfigSection(None)
+        self.parse_section_body(unnamed_section)
+        self.add_section(config, unnamed_section)
 
         if not self.flavour.allow_unnamed_section:
             if config.unnamed_section.options:
@@ -524,7 +532,7 @@ class IniParserImpl(RecursiveDescentParserBase):
                     f'Section "{section.name}" was present multiple times'
                 )
 
-            config.sections[section.name] = section
+            self.add_section(config, section)
 
         config.trailing_comment = self.parse_comments()
 
@@ -543,6 +551,10 @@ class IniParserImpl(RecursiveDescentParserBase):
 
 
 class IniParser:
+    def __init__(self, interning_pool: Optional[InterningPool] = None):
+        # shares identical sections between the parsed configs when specified
+        self.interning_pool = interning_pool
+
     @staticmethod
     def position_context(
         text_io: TextIOBase,
@@ -608,6 +620,7 @@ class IniParser:
         parser = IniParserImpl(
             text_io,
             flavour=flavour,
+            interning_pool=self.interning_pool,
         )
 
         try:
@@ -0,0 +1,465 @@
+import bisect
+import fnmatch
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Pattern, Set, Tuple, Union
+
+from simplini.core import (
+    UNNAMED_SECTION_NAME,
+    IniConfigBase,
+    IniConfigOption,
+    IniConfigSection,
+)
+
+# (section name, option name)
+OptionKey = Tuple[str, str]
+
+QueryResult = List[Tuple[str, IniConfigOption]]
+
+GLOB_CHARS = "*?[]"
+
+NGRAM_SIZE = 3
+
+# characters which can not be a part of the literal run in the regular
+# expression, quantifiers are handled separately
+REGEX_SPECIAL_CHARS = ".^$()[]{}|"
+REGEX_QUANTIFIERS = "*+?{"
+
+# "{m,n}" quantifier, braces not forming one are literal, but treating them
+# as a quantifier never makes the literals wrong
+REGEX_REPEAT = re.compile(r"\{\d*,?\d*\}")
+
+# number of the hex digits following the escapes of the code points
+REGEX_HEX_ESCAPES = {"x": 2, "u": 4, "U": 8}
+
+
+def literal_prefix(glob: str) -> str:
+    for idx, char in enumerate(glob):
+        if char in GLOB_CHARS:
+            return glob[:idx]
+    return glob
+
+
+def ngrams(text: str) -> Set[str]:
+    # case folded for the case insensitive patterns to be narrowed down too
+    text = text.casefold()
+    return {text[idx : idx + NGRAM_SIZE] for idx in range(len(text) - NGRAM_SIZE + 1)}
+
+
+def required_literals(pattern: Pattern) -> Optional[List[str]]:
+    # literal runs every match of the pattern has to contain, only the top
+    # level of simple patterns is inspected, None means there is no way
+    # to narrow down the candidates
+    if pattern.flags & re.VERBOSE or "|" in pattern.pattern:
+        return None
+
+    source = pattern.pattern
+    literals: List[str] = []
+    run: List[str] = []
+    depth = 0
+    idx = 0
+
+    def close_run() -> None:
+        if len(run) >= NGRAM_SIZE:
+            literals.append("".join(run))
+        run.clear()
+
+    while idx < len(source):
+        char = source[idx]
+
+        if char == "\\" and idx + 1 < len(source):
+            escaped = source[idx + 1]
+            idx += 2
+            if escaped.isalnum():
+                # character classes like \d, code points or back references,
+                # arguments of the escape are skipped, so that they are not
+                # taken for the literal
+                close_run()
+                if escaped in REGEX_HEX_ESCAPES:
+                    idx += REGEX_HEX_ESCAPES[escaped]
+                elif escaped == "N" and source.startswith("{", idx):
+                    idx = source.find("}", idx) + 1 or len(source)
+                elif escaped.isdigit():
+                    while idx < len(source) and source[idx].isdigit():
+                        idx += 1
+            elif depth == 0:
+                run.append(escaped)
+            continue
+
+        if char in REGEX_QUANTIFIERS and run:
+            # previous character is optional or repeated
+            run.pop()
+
+        repeat = REGEX_REPEAT.match(source, idx) if char == "{" else None
+
+        if repeat is not None:
+            close_run()
+            idx = repeat.end()
+            continue
+
+        if char == "[":
+            close_run()
+            # skipping the character set, including "]" right after "[" or "[^"
+            idx += 1
+            if idx < len(source) and source[idx] == "^":
+                idx += 1
+            if idx < len(source) and source[idx] == "]":
+                idx += 1
+            while idx < len(source) and source[idx] != "]":
+                if source[idx] == "\\":
+                    idx += 1
+                idx += 1
+        elif char == "(":
+            close_run()
+            depth += 1
+        elif char == ")":
+            close_run()
+            depth -= 1
+        elif char in REGEX_SPECIAL_CHARS or char in REGEX_QUANTIFIERS:
+            close_run()
+        elif depth == 0:
+            run.append(char)
+
+        idx += 1
+
+    close_run()
+
+    return literals
+
+
+def option_text(option: IniConfigOption) -> str:
+    return option.value or ""
+
+
+def comment_text(option: IniConfigOption) -> str:
+    lines = list(option.comment or ())
+    if option.inline_comment:
+        lines.append(option.inline_comment)
+    return "\n".join(lines)
+
+
+class SortedNames:
+    # names sorted as is and reversed for the prefix and suffix globs; added
+    # names are collected and merged on the next lookup, so that building the
+    # index takes a single sort instead of an insertion per name
+    def __init__(self):
+        self.names: List[str] = []
+        self.reversed_names: List[str] = []
+        self.added: List[str] = []
+
+    def add(self, name: str) -> None:
+        self.added.append(name)
+
+    def merge(self) -> None:
+        added, self.added = self.added, []
+
+        if len(added) == 1:
+            bisect.insort(self.names, added[0])
+            bisect.insort(self.reversed_names, added[0][::-1])
+        elif added:
+            self.names.extend(added)
+            self.names.sort()
+            self.reversed_names.extend(name[::-1] for name in added)
+            self.reversed_names.sort()
+
+    def remove(self, name: str) -> None:
+        if self.added:
+            self.merge()
+        del self.names[bisect.bisect_left(self.names, name)]
+        del self.reversed_names[bisect.bisect_left(self.reversed_names, name[::-1])]
+
+    @staticmethod
+    def with_prefix(names: List[str], prefix: str) -> Iterable[str]:
+        idx = bisect.bisect_left(names, prefix)
+        while idx < len(names) and names[idx].startswith(prefix):
+            yield names[idx]
+            idx += 1
+
+    def match(self, glob: str) -> List[str]:
+        if self.added:
+            self.merge()
+
+        prefix = literal_prefix(glob)
+
+        if prefix == glob:
+            # no wildcards at all
+            idx = bisect.bisect_left(self.names, glob)
+            if idx < len(self.names) and self.names[idx] == glob:
+                return [glob]
+            return []
+
+        suffix = literal_prefix(glob[::-1])
+
+        if len(suffix) > len(prefix):
+            candidates: Iterable[str] = (
+                name[::-1] for name in self.with_prefix(self.reversed_names, suffix)
+            )
+        else:
+            candidates = self.with_prefix(self.names, prefix)
+
+        matcher = re.compile(fnmatch.translate(glob)).match
+
+        return [name for name in candidates if matcher(name)]
+
+
+class NgramIndex:
+    # built only once the search over the text is requested as it is
+    # noticeably more expensive than the name indexes
+    def __init__(self, text_fn: Callable[[IniConfigOption], str]):
+        self.text_fn = text_fn
+        self.built = False
+        self.postings: Dict[str, Set[OptionKey]] = {}
+        # ngrams every option is indexed by, for the removal
+        self.indexed: Dict[OptionKey, Set[str]] = {}
+
+    def build(self, options: Iterable[Tuple[OptionKey, IniConfigOption]]) -> None:
+        self.built = True
+        for key, option in options:
+            self.add(key, option)
+
+    def add(self, key: OptionKey, option: IniConfigOption) -> None:
+        if not self.built:
+            return
+        grams = ngrams(self.text_fn(option))
+        self.indexed[key] = grams
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key: OptionKey) -> None:
+        for gram in self.indexed.pop(key, ()):
+            keys = self.postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self.postings[gram]
+
+    def candidates(self, pattern: Pattern) -> Optional[Set[OptionKey]]:
+        # superset of the options matching the pattern, None when the index
+        # can not help and every option has to be checked
+        literals = required_literals(pattern)
+
+        if not literals:
+            return None
+
+        postings = []
+
+        for gram in set().union(*(ngrams(literal) for literal in literals)):
+            keys = self.postings.get(gram)
+            if not keys:
+                return set()
+            postings.append(keys)
+
+        # intersecting starting from the most selective ngrams
+        postings.sort(key=len)
+
+        result = set(postings[0])
+        for keys in postings[1:]:
+            if not result:
+                break
+            result &= keys
+
+        return result
+
+
+class QueryIndex:
+    # Indexes of the config built on the first query and then updated
+    # incrementally, the changes reported by the change listeners are
+    # collected and applied right before the next query.
+    def __init__(self, config: IniConfigBase):
+        self.config = config
+        self.section_names = SortedNames()
+        self.option_names = SortedNames()
+        # option name -> sections having the option with such a name
+        self.option_sections: Dict[str, Set[str]] = {}
+        # section name -> option names indexed for it
+        self.section_options: Dict[str, Set[str]] = {}
+        self.values = NgramIndex(option_text)
+        self.comments = NgramIndex(comment_text)
+        # changes not yet reflected in the indexes
+        self.pending: Set[Tuple[str, Optional[str]]] = set()
+
+        for section in self.all_sections():
+            self.add_section(section.name or UNNAMED_SECTION_NAME)
+
+        config.add_cache_listener(self.on_change)
+
+    def close(self) -> None:
+        self.config.remove_cache_listener(self.on_change)
+
+    def all_sections(self) -> List[IniConfigSection]:
+        return [self.config.unnamed_section, *self.config.sections.values()]
+
+    def on_change(self, section_name: str, option_name: Optional[str]) -> None:
+        self.pending.add((section_name, option_name))
+
+    def find_section(self, section_name: str) -> Optional[IniConfigSection]:
+        if not section_name:
+            return self.config.unnamed_section
+        return self.config.sections.get(section_name)
+
+    def add_section(self, section_name: str) -> None:
+        self.section_names.add(section_name)
+        self.section_options[section_name] = set()
+
+        section = self.find_section(section_name)
+        assert section is not None
+
+        for option_name in section.options:
+            self.add_option(section_name, option_name, section)
+
+    def remove_section(self, section_name: str) -> None:
+        for option_name in list(self.section_options.pop(section_name)):
+            self.remove_option(section_name, option_name)
+
+        self.section_names.remove(section_name)
+
+    def add_option(
+        self,
+        section_name: str,
+        option_name: str,
+        section: IniConfigSection,
+    ) -> None:
+        key = (section_name, option_name)
+        option = section.options[option_name]
+
+        self.section_options[section_name].add(option_name)
+
+        sections = self.option_sections.get(option_name)
+        if sections is None:
+            sections = self.option_sections[option_name] = set()
+            self.option_names.add(option_name)
+        sections.add(section_name)
+
+        self.values.add(key, option)
+        self.comments.add(key, option)
+
+    def remove_option(self, section_name: str, option_name: str) -> None:
+        key = (section_name, option_name)
+
+        self.section_options.get(section_name, set()).discard(option_name)
+
+        sections = self.option_sections[option_name]
+        sections.discard(section_name)
+        if not sections:
+            del self.option_sections[option_name]
+            self.option_names.remove(option_name)
+
+        self.values.remove(key)
+        self.comments.remove(key)
+
+    def refresh_option(self, section_name: str, option_name: str) -> None:
+        indexed = self.section_options.get(section_name)
+
+        if indexed is None:
+            # whole section is refreshed separately
+            return
+
+        if option_name in indexed:
+            self.remove_option(section_name, option_name)
+
+        section = self.find_section(section_name)
+        if section is not None and option_name in section.options:
+            self.add_option(section_name, option_name, section)
+
+    def refresh(self) -> None:
+        pending, self.pending = self.pending, set()
+
+        # section level changes first, then the options of other sections
+        for section_name, option_name in pending:
+            if option_name is not None:
+                continue
+
+            if section_name in self.section_options:
+                self.remove_section(section_name)
+
+            if self.find_section(section_name) is not None:
+                self.add_section(section_name)
+
+        for section_name, option_name in pending:
+            if option_name is None or (section_name, None) in pending:
+                continue
+            self.refresh_option(section_name, option_name)
+
+    def query(
+        self,
+        section_glob: str = "*",
+        option_glob: str = "*",
+        value_regex: Union[str, Pattern, None] = None,
+        comment_regex: Union[str, Pattern, None] = None,
+    ) -> QueryResult:
+        if self.pending:
+            self.refresh()
+
+        section_names = set(self.section_names.match(section_glob))
+        option_names = self.option_names.match(option_glob)
+
+        if not section_names or not option_names:
+            return []
+
+        filters: List[Tuple[Pattern, Callable[[IniConfigOption], str]]] = []
+        candidates: Optional[Set[OptionKey]] = None
+
+        for regex, ngram_index in (
+            (value_regex, self.values),
+            (comment_regex, self.comments),
+        ):
+            if regex is None:
+                continue
+
+            pattern = re.compile(regex) if isinstance(regex, str) else regex
+            filters.append((pattern, ngram_index.text_fn))
+
+            if not ngram_index.built:
+                ngram_index.build(self.all_options())
+
+            narrowed = ngram_index.candidates(pattern)
+            if narrowed is not None:
+                candidates = narrowed if candidates is None else candidates & narrowed
+
+        if candidates is None and sum(
+            len(self.section_options[section_name]) for section_name in section_names
+        ) < sum(len(self.option_sections[option_name]) for option_name in option_names):
+            # few sections are matched, the options are checked by name
+            option_names_set = set(option_names)
+            keys = [
+                (section_name, option_name)
+                for section_name in section_names
+                for option_name in self.section_options[section_name]
+                if option_name in option_names_set
+            ]
+        elif candidates is None:
+            keys = [
+                (section_name, option_name)
+                for option_name in option_names
+                for section_name in self.option_sections[option_name]
+                if section_name in section_names
+            ]
+        else:
+            option_names_set = set(option_names)
+            keys = [
+                key
+                for key in candidates
+                if key[0] in section_names and key[1] in option_names_set
+            ]
+
+        keys.sort()
+
+        result = [(key[0], self.option_of(key)) for key in keys]
+
+        for pattern, text_fn in filters:
+            result = [
+                (section_name, option)
+                for section_name, option in result
+                if pattern.search(text_fn(option))
+            ]
+
+        return result
+
+    def all_options(self) -> Iterable[Tuple[OptionKey, IniConfigOption]]:
+        for section in self.all_sections():
+            section_name = section.name or UNNAMED_SECTION_NAME
+            for option_name, option in section.options.items():
+                yield (section_name, option_name), option
+
+    def option_of(self, key: OptionKey) -> IniConfigOption:
+        section = self.find_section(key[0])
+        assert section is not None
+        return section.options[key[1]]
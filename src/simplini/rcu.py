@@ -0,0 +1,86 @@
+import contextlib
+import threading
+from typing import Iterator, Optional, Tuple
+
+from simplini.config import IniConfig
+from simplini.frozen import FrozenIniConfig
+
+
+class ConcurrentIniConfig:
+    # Read-copy-update wrapper for the config shared between the threads.
+    # Readers get immutable snapshots without any locking as the current
+    # version and snapshot are published together with a single assignment,
+    # which is atomic on both regular and free-threaded CPython builds.
+    # Writers are serialized, edit a copy-on-write clone of the latest
+    # version and publish it as a new snapshot once done.
+    def __init__(self, config: Optional[IniConfig] = None):
+        self.write_lock = threading.RLock()
+        self.changed = threading.Condition(threading.Lock())
+        # latest mutable version, only accessed with write lock held; cloned
+        # like in replace, so that later changes of the given config are not
+        # picked up
+        self.config = config.clone() if config is not None else IniConfig()
+        self.current: Tuple[int, FrozenIniConfig] = (0, self.config.freeze())
+
+    @property
+    def version(self) -> int:
+        return self.current[0]
+
+    def snapshot(self) -> FrozenIniConfig:
+        return self.current[1]
+
+    def get(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+    ) -> Optional[str]:
+        return self.current[1].get(option_name, section_name)
+
+    def publish(self, config: IniConfig) -> int:
+        # has to be called with write lock held
+        frozen = config.freeze()
+
+        with self.changed:
+            self.config = config
+            version = self.current[0] + 1
+            self.current = (version, frozen)
+            self.changed.notify_all()
+
+        return version
+
+    @contextlib.contextmanager
+    def edit(self) -> Iterator[IniConfig]:
+        # changes are published as a single new version on exit and
+        # discarded when the block raises
+        with self.write_lock:
+            config = self.config.clone()
+            yield config
+            self.publish(config)
+
+    def set(
+        self,
+        option_name: str,
+        value: str,
+        section_name: Optional[str] = None,
+    ) -> int:
+        with self.write_lock:
+            with self.edit() as config:
+                config.set(option_name, value, section_name)
+            return self.current[0]
+
+    def replace(self, config: IniConfig) -> int:
+        # publishes whole new config, e.g. the reloaded one; it is cloned, so
+        # that later changes of the given config are not picked up
+        with self.write_lock:
+            return self.publish(config.clone())
+
+    def wait_for_change(
+        self,
+        since_version: int,
+        timeout: Optional[float] = None,
+    ) -> int:
+        # waits for the version newer than given one, returns the latest
+        # version which is the same as given one on timeout
+        with self.changed:
+            self.changed.wait_for(lambda: self.current[0] > since_version, timeout)
+            return self.current[0]
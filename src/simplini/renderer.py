@@ -1,9 +1,11 @@
 import enum
+import io
 import logging
 from io import TextIOBase
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 
 from simplini.core import (
+    UNNAMED_SECTION_NAME,
     IniConfigBase,
     IniConfigOption,
     IniConfigSection,
@@ -28,13 +30,17 @@ class RenderingError(SimpliniError):
 class RenderingContext:
     def __init__(
         self,
-        config: IniConfigBase,
+        config: Optional[IniConfigBase],
         flavour: IniFlavour,
         text_io: TextIOBase,
     ):
         self.config = config
         self.flavour = flavour
         self.text_io = text_io
+        # reverse the mapping once as it is used for every rendered character
+        self.reversed_escape_sequences: Dict[str, str] = {
+            v: k for k, v in flavour.escape_sequences.items()
+        }
 
     # convenience shortcuts
     @property
@@ -64,8 +70,7 @@ class RenderingContext:
     # TODO: make sure NOT to replace ALL
     @property
     def escape_sequences(self) -> Dict[str, str]:
-        # reverse the mapping
-        return {v: k for k, v in self.flavour.escape_sequences.items()}
+        return self.reversed_escape_sequences
 
 
 class IniConfigRenderer:
@@ -99,6 +104,16 @@ class IniConfigRenderer:
         self,
         ctx: RenderingContext,
         section: IniConfigSection,
+    ) -> None:
+        self.write_section_header(ctx, section)
+
+        for option in section.options.values():
+            self.write_option(ctx, option)
+
+    def write_section_header(
+        self,
+        ctx: RenderingContext,
+        section: IniConfigSection,
     ) -> None:
         text_io = ctx.text_io
 
@@ -121,13 +136,19 @@ class IniConfigRenderer:
                 text_io.write(f"{ctx.comment_marker} {section.inline_comment}")
                 text_io.write(ctx.new_line)
 
-        for option in section.options.values():
-            self.write_option(ctx, option)
-
     def write_option(
         self,
         ctx: RenderingContext,
         option: IniConfigOption,
+    ) -> None:
+        self.write_option_head(ctx, option)
+        self.write_option_value(ctx, option)
+        self.write_option_tail(ctx, option)
+
+    def write_option_head(
+        self,
+        ctx: RenderingContext,
+        option: IniConfigOption,
     ) -> None:
         text_io = ctx.text_io
 
@@ -137,7 +158,12 @@ class IniConfigRenderer:
         text_io.write(option.name)
         text_io.write(f" {ctx.key_value_separator} ")
 
-        self.write_option_value(ctx, option)
+    def write_option_tail(
+        self,
+        ctx: RenderingContext,
+        option: IniConfigOption,
+    ) -> None:
+        text_io = ctx.text_io
 
         if option.inline_comment:
             text_io.write(f"  {ctx.comment_marker} {option.inline_comment}")
@@ -241,6 +267,31 @@ class IniConfigRenderer:
             idx += 1
         text_io.write(ctx.quote_character * 3)
 
+    def sections_to_render(
+        self,
+        config: IniConfigBase,
+        flavour: IniFlavour,
+    ) -> List[IniConfigSection]:
+        sections = []
+
+        if config.unnamed_section.options or config.unnamed_section.comment:
+            if not flavour.allow_unnamed_section:
+                raise RenderingError("Unnamed section is not allowed")
+            sections.append(config.unnamed_section)
+
+        sections.extend(config.sections.values())
+
+        return sections
+
+    def write_trailing_comment(
+        self,
+        ctx: RenderingContext,
+        comment: Optional[List[str]],
+    ) -> None:
+        if comment:
+            self.write_spacer(ctx)
+            self.write_comments(ctx, comment)
+
     def render(
         self, text_io: TextIOBase, config: IniConfigBase, flavour: IniFlavour
     ) -> None:
@@ -250,14 +301,144 @@ class IniConfigRenderer:
             text_io=text_io,
         )
 
-        if config.unnamed_section.options or config.unnamed_section.comment:
-            if not flavour.allow_unnamed_section:
-                raise RenderingError("Unnamed section is not allowed")
-            self.write_section(ctx, config.unnamed_section)
-
-        for section in config.sections.values():
+        for section in self.sections_to_render(config, flavour):
             self.write_section(ctx, section)
 
-        if config.trailing_comment:
-            self.write_spacer(ctx)
-            self.write_comments(ctx, config.trailing_comment)
+        self.write_trailing_comment(ctx, config.trailing_comment)
+
+    def compile(
+        self,
+        config: IniConfigBase,
+        flavour: IniFlavour,
+        holes: Optional[Iterable[Tuple[str, str]]] = None,
+    ) -> "RenderPlan":
+        # holes are (section name, option name) pairs which values can be
+        # overridden when plan is rendered, all the options by default
+        if holes is not None:
+            holes = set(holes)
+
+        builder = RenderPlanBuilder()
+        ctx = RenderingContext(
+            config=config,
+            flavour=flavour,
+            text_io=builder,
+        )
+
+        for section in self.sections_to_render(config, flavour):
+            self.write_section_header(ctx, section)
+
+            section_name = section.name or UNNAMED_SECTION_NAME
+
+            for option in section.options.values():
+                key = (section_name, option.name)
+
+                self.write_option_head(ctx, option)
+
+                if holes is None or key in holes:
+                    builder.begin_slot(key, option.style)
+                    self.write_option_value(ctx, option)
+                    builder.end_slot()
+                else:
+                    self.write_option_value(ctx, option)
+
+                self.write_option_tail(ctx, option)
+
+        self.write_trailing_comment(ctx, config.trailing_comment)
+
+        return builder.build(self, flavour)
+
+
+class RenderPlanBuilder:
+    # text IO which splits written text into static fragments and slots
+    def __init__(self):
+        self.fragments: List[str] = []
+        self.slots: Dict[
+            Tuple[str, str], Tuple[int, Optional[ValuePresentationStyle]]
+        ] = {}
+        self.chunks: List[str] = []
+        self.position = 0
+
+    def write(self, s: str) -> int:
+        self.chunks.append(s)
+        self.position += len(s)
+        return len(s)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush_chunks(self) -> None:
+        self.fragments.append("".join(self.chunks))
+        self.chunks = []
+
+    def begin_slot(
+        self,
+        key: Tuple[str, str],
+        style: Optional[ValuePresentationStyle],
+    ) -> None:
+        self.flush_chunks()
+        self.slots[key] = (len(self.fragments), style)
+
+    def end_slot(self) -> None:
+        self.flush_chunks()
+
+    def build(self, renderer: IniConfigRenderer, flavour: IniFlavour) -> "RenderPlan":
+        self.flush_chunks()
+        return RenderPlan(renderer, flavour, self.fragments, self.slots)
+
+
+class RenderPlan:
+    # Pre-rendered config where all the static text is already laid out and
+    # only the overridden values have to be rendered, so that rendering many
+    # variations of the same config is mostly a matter of joining strings.
+    def __init__(
+        self,
+        renderer: IniConfigRenderer,
+        flavour: IniFlavour,
+        fragments: List[str],
+        slots: Dict[Tuple[str, str], Tuple[int, Optional[ValuePresentationStyle]]],
+    ):
+        self.renderer = renderer
+        self.flavour = flavour
+        self.fragments = fragments
+        self.slots = slots
+
+    def render_value(
+        self,
+        option_name: str,
+        value: str,
+        style: Optional[ValuePresentationStyle],
+    ) -> str:
+        text_io = io.StringIO()
+        ctx = RenderingContext(
+            config=None,
+            flavour=self.flavour,
+            text_io=text_io,
+        )
+        option = IniConfigOption(option_name, value)
+        option.style = style
+        self.renderer.write_option_value(ctx, option)
+        return text_io.getvalue()
+
+    def render(
+        self,
+        overrides: Optional[Mapping[Tuple[str, str], str]] = None,
+    ) -> str:
+        if not overrides:
+            return "".join(self.fragments)
+
+        fragments = list(self.fragments)
+
+        for key, value in overrides.items():
+            slot = self.slots.get(key)
+
+            if slot is None:
+                section_name, option_name = key
+                raise RenderingError(
+                    f'Option "{option_name}" in section "{section_name}" '
+                    "is not overridable in the render plan"
+                )
+
+            idx, style = slot
+            fragments[idx] = self.render_value(key[1], value, style)
+
+        return "".join(fragments)
@@ -0,0 +1,241 @@
+import keyword
+import re
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+from simplini.converters import Converter, resolve_converter
+from simplini.core import (
+    UNNAMED_SECTION_NAME,
+    ConversionError,
+    IniConfigBase,
+    SimpliniError,
+)
+
+REQUIRED = object()
+
+# default of the lookups telling the missing options apart
+MISSING = object()
+
+
+class SchemaValidationError(SimpliniError):
+    def __init__(self, errors: List[str]):
+        super().__init__(
+            "Config does not match the schema:\n"
+            + "\n".join(f"  - {error}" for error in errors)
+        )
+        self.errors = errors
+
+
+def to_attribute_name(name: str) -> str:
+    attribute = re.sub(r"\W", "_", name)
+    if not attribute or attribute[0].isdigit() or keyword.iskeyword(attribute):
+        attribute = "_" + attribute
+    return attribute
+
+
+class Option:
+    def __init__(
+        self,
+        converter: Union[str, Converter] = str,
+        default: Any = REQUIRED,
+        attribute: Optional[str] = None,
+    ):
+        self.converter = converter
+        self.default = default
+        self.attribute = attribute
+
+    @property
+    def required(self) -> bool:
+        return self.default is REQUIRED
+
+
+class Section:
+    def __init__(
+        self,
+        options: Dict[str, Option],
+        attribute: Optional[str] = None,
+        allow_unknown: Optional[bool] = None,
+    ):
+        self.options = options
+        self.attribute = attribute
+        # defaults to the schema setting when not specified
+        self.allow_unknown = allow_unknown
+
+
+class SettingsBase:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other: Any) -> bool:
+        if type(self) is not type(other):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+
+class CompiledSection:
+    def __init__(
+        self,
+        name: str,
+        section: Section,
+        allow_unknown: bool,
+    ):
+        self.name = name
+        self.allow_unknown = allow_unknown
+        # (option name, attribute, converter, default)
+        self.fields: List[Tuple[str, str, Converter, Any]] = []
+
+        attributes = set()
+
+        for option_name, option in section.options.items():
+            attribute = option.attribute or to_attribute_name(option_name)
+
+            if attribute in attributes:
+                raise SimpliniError(
+                    f'Attribute "{attribute}" is used multiple times '
+                    f'in section "{name}" of the schema'
+                )
+
+            attributes.add(attribute)
+
+            self.fields.append(
+                (
+                    option_name,
+                    attribute,
+                    resolve_converter(option.converter),
+                    option.default,
+                )
+            )
+
+        self.settings_type: Type[SettingsBase] = type(
+            f"{to_attribute_name(name or 'unnamed').title()}Settings",
+            (SettingsBase,),
+            {"__slots__": tuple(field[1] for field in self.fields)},
+        )
+
+    def bind(
+        self,
+        config: IniConfigBase,
+        errors: List[str],
+    ) -> SettingsBase:
+        settings = self.settings_type()
+
+        if self.name == UNNAMED_SECTION_NAME:
+            section = config.unnamed_section
+        else:
+            section = config.get_section(self.name)
+
+        for option_name, attribute, converter, default in self.fields:
+            # single lookup per option, so that it is traced once
+            try:
+                value = (
+                    MISSING
+                    if section is None
+                    else section.get_as(option_name, converter, MISSING)
+                )
+            except ConversionError as err:
+                errors.append(str(err))
+                value = None
+
+            if value is MISSING:
+                if default is REQUIRED:
+                    errors.append(
+                        f'Option "{option_name}" is missing in section "{self.name}"'
+                    )
+                    value = None
+                else:
+                    value = default
+
+            setattr(settings, attribute, value)
+
+        if section is not None and not self.allow_unknown:
+            known = {field[0] for field in self.fields}
+            for option_name in section.options:
+                if option_name not in known:
+                    errors.append(
+                        f'Unknown option "{option_name}" in section "{self.name}"'
+                    )
+
+        return settings
+
+
+class Schema:
+    # Describes expected sections and options once and binds configs to the
+    # generated settings objects, e.g. "settings.database.port", where all the
+    # values are already converted and are read as plain slot attributes.
+    # Options of the unnamed section are available at the top level.
+    def __init__(
+        self,
+        sections: Dict[str, Union[Section, Dict[str, Option]]],
+        allow_unknown: bool = True,
+    ):
+        self.allow_unknown = allow_unknown
+        self.sections: List[Tuple[Optional[str], CompiledSection]] = []
+
+        top_level_attributes: List[str] = []
+
+        for section_name, section in sections.items():
+            if not isinstance(section, Section):
+                section = Section(section)
+
+            compiled = CompiledSection(
+                section_name,
+                section,
+                allow_unknown
+                if section.allow_unknown is None
+                else section.allow_unknown,
+            )
+
+            if section_name == UNNAMED_SECTION_NAME:
+                attribute = None
+                top_level_attributes.extend(field[1] for field in compiled.fields)
+            else:
+                attribute = section.attribute or to_attribute_name(section_name)
+                top_level_attributes.append(attribute)
+
+            self.sections.append((attribute, compiled))
+
+        if len(set(top_level_attributes)) != len(top_level_attributes):
+            raise SimpliniError("Schema has conflicting top level attribute names")
+
+        self.settings_type: Type[SettingsBase] = type(
+            "Settings",
+            (SettingsBase,),
+            {"__slots__": tuple(top_level_attributes)},
+        )
+
+    def bind(self, config: IniConfigBase) -> SettingsBase:
+        # validates the whole config at once, reporting all the problems
+        errors: List[str] = []
+        settings = self.settings_type()
+
+        known_sections = set()
+
+        for attribute, compiled in self.sections:
+            known_sections.add(compiled.name)
+
+            section_settings = compiled.bind(config, errors)
+
+            if attribute is None:
+                # unnamed section options are on the top level
+                for field in compiled.fields:
+                    setattr(settings, field[1], getattr(section_settings, field[1]))
+            else:
+                setattr(settings, attribute, section_settings)
+
+        if not self.allow_unknown:
+            if UNNAMED_SECTION_NAME not in known_sections:
+                for option_name in config.unnamed_section.options:
+                    errors.append(f'Unknown option "{option_name}" in unnamed section')
+
+            for section_name in config.sections:
+                if section_name not in known_sections:
+                    errors.append(f'Unknown section "{section_name}"')
+
+        if errors:
+            raise SchemaValidationError(errors)
+
+        return settings
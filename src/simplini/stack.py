@@ -0,0 +1,194 @@
+from io import TextIOBase
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from simplini.config import IniConfig
+from simplini.core import (
+    UNNAMED_SECTION_NAME,
+    IniConfigOption,
+    IniConfigSection,
+)
+
+# cached lookup result: option and index of the layer it comes from
+LookupResult = Tuple[Optional[IniConfigOption], int]
+
+NOT_FOUND: LookupResult = (None, -1)
+
+
+class IniConfigStack:
+    # Resolves options from multiple configs (layers) where the later layers
+    # override the earlier ones, e.g. defaults, site, host, environment.
+    # Lookups are cached in a flat (section, option) table which is
+    # invalidated precisely for the keys changed in any of the layers.
+    def __init__(self, layers: Sequence[IniConfig]):
+        self.layers: List[IniConfig] = []
+        self.cache: Dict[Tuple[str, str], LookupResult] = {}
+        # cached option names per section, for section-level invalidation
+        self.cached_options: Dict[str, Set[str]] = {}
+        self.merged_sections: Dict[str, Optional[IniConfigSection]] = {}
+
+        for layer in layers:
+            self.add_layer(layer)
+
+    def add_layer(self, layer: IniConfig) -> None:
+        # new layer has the highest priority
+        self.layers.append(layer)
+        layer.add_cache_listener(self.on_change)
+        self.invalidate()
+
+    def close(self) -> None:
+        # stops tracking the layers changes
+        for layer in self.layers:
+            layer.remove_cache_listener(self.on_change)
+
+    def invalidate(self) -> None:
+        self.cache = {}
+        self.cached_options = {}
+        self.merged_sections = {}
+
+    def on_change(self, section_name: str, option_name: Optional[str]) -> None:
+        if option_name is None:
+            # anything in the section might have changed
+            for name in self.cached_options.pop(section_name, ()):
+                del self.cache[(section_name, name)]
+        else:
+            if self.cache.pop((section_name, option_name), None) is not None:
+                self.cached_options[section_name].discard(option_name)
+
+        self.merged_sections.pop(section_name, None)
+
+    def lookup(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+    ) -> LookupResult:
+        section_name = section_name or UNNAMED_SECTION_NAME
+        key = (section_name, option_name)
+
+        result = self.cache.get(key)
+
+        if result is None:
+            result = NOT_FOUND
+
+            for idx in range(len(self.layers) - 1, -1, -1):
+                layer = self.layers[idx]
+                if section_name == UNNAMED_SECTION_NAME:
+                    section = layer.unnamed_section
+                else:
+                    section = layer.get_section(section_name)
+                if section is None:
+                    continue
+                # read directly, so that cloned layers do not copy the options
+                option = section.options.get(option_name)
+                if option is not None:
+                    result = (option, idx)
+                    break
+
+            self.cache[key] = result
+            self.cached_options.setdefault(section_name, set()).add(option_name)
+
+        return result
+
+    def get_option(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+    ) -> Optional[IniConfigOption]:
+        return self.lookup(option_name, section_name)[0]
+
+    def get(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+    ) -> Optional[str]:
+        option = self.lookup(option_name, section_name)[0]
+        if option is None:
+            return None
+        return option.value
+
+    def get_source(
+        self,
+        option_name: str,
+        section_name: Optional[str] = None,
+    ) -> Optional[IniConfig]:
+        # layer the effective value comes from
+        option, idx = self.lookup(option_name, section_name)
+        if option is None:
+            return None
+        return self.layers[idx]
+
+    def merge_section(self, section_name: str) -> Optional[IniConfigSection]:
+        merged: Optional[IniConfigSection] = None
+
+        for layer in self.layers:
+            if section_name == UNNAMED_SECTION_NAME:
+                section = layer.unnamed_section
+            else:
+                section = layer.get_section(section_name)
+
+            if section is None:
+                continue
+
+            if merged is None:
+                merged = IniConfigSection(section_name)
+
+            if section.comment is not None:
+                merged.comment = list(section.comment)
+
+            if section.inline_comment is not None:
+                merged.inline_comment = section.inline_comment
+
+            for option in section.options.values():
+                merged.options[option.name] = option.copy()
+
+        return merged
+
+    def get_section(self, section_name: str) -> Optional[IniConfigSection]:
+        # effective section, it is detached from the layers and has to be
+        # treated as read-only as it is cached
+        section_name = section_name or UNNAMED_SECTION_NAME
+
+        if section_name not in self.merged_sections:
+            self.merged_sections[section_name] = self.merge_section(section_name)
+
+        return self.merged_sections[section_name]
+
+    def __contains__(self, section_name: str) -> bool:
+        return any(section_name in layer for layer in self.layers)
+
+    def section_names(self) -> List[str]:
+        names: Dict[str, None] = {}
+        for layer in self.layers:
+            names.update(dict.fromkeys(layer.sections))
+        return list(names)
+
+    def merged(self) -> IniConfig:
+        # effective config with the comments coming from the layers which
+        # define the values, formatted as the top layer
+        config = IniConfig()
+
+        if self.layers:
+            top = self.layers[-1]
+            config.flavour = top.flavour
+            config.renderer = top.renderer
+            config.encoding = top.encoding
+
+        unnamed_section = self.merge_section(UNNAMED_SECTION_NAME)
+        if unnamed_section is not None:
+            config.add_section(unnamed_section)
+
+        for section_name in self.section_names():
+            section = self.merge_section(section_name)
+            assert section is not None
+            config.add_section(section)
+
+        for layer in reversed(self.layers):
+            if layer.trailing_comment:
+                config.trailing_comment = list(layer.trailing_comment)
+                break
+
+        return config
+
+    def render(self, text_io: TextIOBase, layer: Optional[int] = None) -> None:
+        # renders the effective config or the single layer at given index
+        config = self.merged() if layer is None else self.layers[layer]
+        config.renderer.render(text_io, config, config.flavour)
@@ -0,0 +1,115 @@
+from io import TextIOBase
+from typing import List, Optional, Set
+
+from simplini.core import (
+    UNNAMED_SECTION_NAME,
+    IniConfigOption,
+    IniConfigSection,
+    IniFlavour,
+    ValuePresentationStyle,
+)
+from simplini.renderer import IniConfigRenderer, RenderingContext, RenderingError
+
+
+class PositionTrackingTextIO:
+    # renderer relies on "tell" to figure out if anything was written yet,
+    # track it here so that non-seekable outputs (pipes, sockets) work too
+    def __init__(self, text_io: TextIOBase):
+        self.text_io = text_io
+        self.position = 0
+
+    def write(self, s: str) -> int:
+        self.position += len(s)
+        return self.text_io.write(s)
+
+    def tell(self) -> int:
+        return self.position
+
+
+class IniStreamWriter:
+    # Writes INI content straight into the output without building the config
+    # tree, so that memory usage does not depend on the amount of options.
+    # Formatting and escaping are delegated to the IniConfigRenderer.
+    def __init__(
+        self,
+        text_io: TextIOBase,
+        flavour: Optional[IniFlavour] = None,
+        renderer: Optional[IniConfigRenderer] = None,
+    ):
+        self.flavour = flavour or IniFlavour()
+        self.renderer = renderer or IniConfigRenderer()
+        self.ctx = RenderingContext(
+            config=None,
+            flavour=self.flavour,
+            text_io=PositionTrackingTextIO(text_io),
+        )
+        self.current_section_name: Optional[str] = None
+        self.section_names: Set[str] = set()
+        self.option_names: Set[str] = set()
+        self.finished = False
+
+    def ensure_not_finished(self) -> None:
+        if self.finished:
+            raise RenderingError("Nothing can be written after the trailing comment")
+
+    def begin_section(
+        self,
+        name: str,
+        comment: Optional[List[str]] = None,
+        inline_comment: Optional[str] = None,
+    ) -> None:
+        self.ensure_not_finished()
+
+        if name == UNNAMED_SECTION_NAME:
+            if self.current_section_name is not None or self.option_names:
+                raise RenderingError("Unnamed section has to be the first one")
+            if not self.flavour.allow_unnamed_section:
+                raise RenderingError("Unnamed section is not allowed")
+        elif name in self.section_names:
+            raise RenderingError(f'Section "{name}" was written multiple times')
+
+        section = IniConfigSection(name)
+        section.comment = comment
+        section.inline_comment = inline_comment
+        self.renderer.write_section_header(self.ctx, section)
+
+        self.current_section_name = name
+        self.section_names.add(name)
+        self.option_names = set()
+
+    def write_option(
+        self,
+        name: str,
+        value: str,
+        comment: Optional[List[str]] = None,
+        inline_comment: Optional[str] = None,
+        style: Optional[ValuePresentationStyle] = None,
+    ) -> None:
+        self.ensure_not_finished()
+
+        if self.current_section_name is None:
+            if not self.flavour.allow_unnamed_section:
+                raise RenderingError("Unnamed section is not allowed")
+            self.current_section_name = UNNAMED_SECTION_NAME
+
+        if name in self.option_names:
+            raise RenderingError(
+                f'Option "{name}" was written multiple times '
+                f'in section "{self.current_section_name}"'
+            )
+
+        # style is used the same way renderer uses the option style, i.e. it is
+        # respected with ValuesRenderingStyle.PREFER_SOURCE
+        option = IniConfigOption(name, value)
+        option.comment = comment
+        option.inline_comment = inline_comment
+        option.style = style
+        self.renderer.write_option(self.ctx, option)
+
+        self.option_names.add(name)
+
+    def write_trailing_comment(self, comment: List[str]) -> None:
+        self.ensure_not_finished()
+        self.renderer.write_spacer(self.ctx)
+        self.renderer.write_comments(self.ctx, comment)
+        self.finished = True
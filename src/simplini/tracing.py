@@ -0,0 +1,110 @@
+import array
+import atexit
+import heapq
+import json
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from simplini._fileio import write_atomic
+
+# (section name, option name)
+OptionKey = Tuple[str, str]
+
+
+class AccessTracer:
+    # Counts the option lookups per key to find the options nobody reads and
+    # the hottest ones. Every key gets a slot, existing options get theirs
+    # upfront and the others on the first lookup, and the counters are kept
+    # in a compact array indexed by the slot, so a traced lookup costs two
+    # dict lookups and an increment. Lookups of the missing options are
+    # counted too. Counters are not synchronized, so concurrent lookups
+    # might be undercounted.
+    def __init__(self):
+        # slot -> key
+        self.keys: List[OptionKey] = []
+        # section name -> option name -> slot
+        self.slots: Dict[str, Dict[str, int]] = {}
+        self.counts = array.array("Q")
+        self.dump_path: Optional[str] = None
+
+    def add_key(self, section_name: str, option_name: str) -> int:
+        slots = self.slots.get(section_name)
+        if slots is None:
+            slots = self.slots[section_name] = {}
+
+        slot = slots.get(option_name)
+        if slot is None:
+            slot = slots[option_name] = len(self.keys)
+            self.keys.append((section_name, option_name))
+            self.counts.append(0)
+
+        return slot
+
+    def add_keys(self, section_name: str, option_names: Iterable[str]) -> None:
+        # known options, reported as unused until looked up
+        for option_name in option_names:
+            self.add_key(section_name, option_name)
+
+    def record(self, section_name: str, option_name: str) -> None:
+        slots = self.slots.get(section_name)
+        slot = None if slots is None else slots.get(option_name)
+        if slot is None:
+            slot = self.add_key(section_name, option_name)
+        self.counts[slot] += 1
+
+    def count(self, option_name: str, section_name: Optional[str] = None) -> int:
+        # empty section name is the unnamed section
+        slot = self.slots.get(section_name or "", {}).get(option_name)
+        if slot is None:
+            return 0
+        return self.counts[slot]
+
+    def reset(self) -> None:
+        # keys are kept, so that the unused ones are still reported
+        self.counts = array.array("Q", bytes(len(self.counts) * 8))
+
+    def hottest(self, limit: int = 10) -> List[Tuple[OptionKey, int]]:
+        slots = heapq.nlargest(limit, range(len(self.counts)), self.counts.__getitem__)
+        return [
+            (self.keys[slot], self.counts[slot]) for slot in slots if self.counts[slot]
+        ]
+
+    def unused(self) -> List[OptionKey]:
+        counts = self.counts
+        return [key for slot, key in enumerate(self.keys) if not counts[slot]]
+
+    def as_dict(self) -> Dict[str, Dict[str, int]]:
+        result: Dict[str, Dict[str, int]] = {}
+        for slot, (section_name, option_name) in enumerate(self.keys):
+            result.setdefault(section_name, {})[option_name] = self.counts[slot]
+        return result
+
+    def export(self) -> List[Dict]:
+        # records ordered by the number of lookups, the hottest first
+        slots = sorted(range(len(self.keys)), key=self.counts.__getitem__, reverse=True)
+        return [
+            {
+                "section": self.keys[slot][0],
+                "option": self.keys[slot][1],
+                "count": self.counts[slot],
+            }
+            for slot in slots
+        ]
+
+    def dump(self, path: str) -> None:
+        data = json.dumps(self.export(), ensure_ascii=False, indent=2)
+        write_atomic(path, data.encode("utf-8"))
+
+    def dump_at_exit(self, path: str) -> None:
+        # the latest path wins when called again
+        if self.dump_path is None:
+            atexit.register(self.dump_on_exit)
+        self.dump_path = path
+
+    def cancel_dump_at_exit(self) -> None:
+        if self.dump_path is not None:
+            atexit.unregister(self.dump_on_exit)
+            self.dump_path = None
+
+    def dump_on_exit(self) -> None:
+        if self.dump_path is not None:
+            self.dump(self.dump_path)
@@ -0,0 +1,68 @@
+import asyncio
+import concurrent.futures
+import functools
+from typing import AsyncIterator, Callable, Optional
+
+from simplini._fileio import file_signature
+from simplini.config import IniConfig
+from simplini.core import IniFlavour
+from simplini.parser import IniParser
+
+
+async def awatch(
+    path: str,
+    interval: float = 1.0,
+    debounce: float = 0.1,
+    initial: bool = False,
+    encoding: str = "utf-8",
+    parser: Optional[IniParser] = None,
+    flavour: Optional[IniFlavour] = None,
+    key_normalizer: Optional[Callable[[str], str]] = None,
+    executor: Optional[concurrent.futures.Executor] = None,
+) -> AsyncIterator[IniConfig]:
+    # Yields freshly loaded config whenever the file changes, the current one
+    # first when initial is set. File is polled every interval seconds and
+    # once it changes it is loaded only after it stays the same for debounce
+    # seconds, so that a series of writes results in a single load. Missing
+    # file is waited for, loading errors are raised. Watchers of the same
+    # file share the loads through aload.
+    load = functools.partial(
+        IniConfig.aload,
+        path,
+        encoding=encoding,
+        parser=parser,
+        flavour=flavour,
+        key_normalizer=key_normalizer,
+        executor=executor,
+    )
+
+    # stat calls block as well, so they run in the executor too
+    loop = asyncio.get_running_loop()
+    get_signature = functools.partial(
+        loop.run_in_executor, executor, file_signature, path
+    )
+
+    signature = await get_signature()
+
+    if initial and signature is not None:
+        yield await load()
+
+    while True:
+        await asyncio.sleep(interval)
+
+        current = await get_signature()
+
+        if current == signature:
+            continue
+
+        while True:
+            await asyncio.sleep(debounce)
+            settled = await get_signature()
+            if settled == current:
+                break
+            current = settled
+
+        signature = current
+
+        if signature is not None:
+            yield await load()
@@ -4,8 +4,17 @@ import tempfile
 import unittest
 from typing import Optional
 
+from simplini import IniConfig
+
 LOGGER = logging.getLogger(__name__)
 
+# config shared by the tests of the config-wide features
+SAMPLE_CONFIG = {
+    "": {"name": "app"},
+    "server": {"host": "localhost", "port": "80"},
+    "client": {"timeout": "5"},
+}
+
 
 class CaseBase(unittest.TestCase):
     def get_temp_path(self) -> str:
@@ -26,6 +35,9 @@ class CaseBase(unittest.TestCase):
             f.write(content)
         return path
 
+    def load_config(self, content: str) -> IniConfig:
+        return IniConfig.load(self.gen_temp_config(content))
+
     def get_text(self, path: str, encoding="utf-8") -> str:
         with open(path, "r", encoding=encoding) as f:
             return f.read()
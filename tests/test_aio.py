@@ -0,0 +1,90 @@
+import asyncio
+
+import simplini
+from simplini import IniConfig, IniParser
+from tests.common import CaseBase
+
+
+class CountingParser(IniParser):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def parse(self, *args, **kwargs):
+        self.calls += 1
+        return super().parse(*args, **kwargs)
+
+
+class AsyncCases(CaseBase):
+    def test_aload_and_asave(self):
+        path = self.gen_temp_config("[server]\nport = 80\n")
+
+        async def run():
+            config = await IniConfig.aload(path)
+            self.assertEqual(path, config.path)
+            self.assertEqual("80", config.get("port", "server"))
+
+            config.set("port", "8080", "server")
+            saving = asyncio.ensure_future(config.asave(path))
+            await asyncio.sleep(0)
+            # changes after the save started are not written
+            config.set("port", "1", "server")
+            self.assertTrue(await saving)
+
+        asyncio.run(run())
+
+        self.assertEqual("8080", IniConfig.load(path).get("port", "server"))
+
+    def test_shared_load(self):
+        path = self.gen_temp_config("[server]\nport = 80\n")
+        parser = CountingParser()
+
+        async def run():
+            return await asyncio.gather(
+                *(IniConfig.aload(path, parser=parser) for _ in range(5))
+            )
+
+        configs = asyncio.run(run())
+
+        self.assertEqual(1, parser.calls)
+        self.assertEqual(5, len({id(config) for config in configs}))
+
+        configs[0].set("port", "8080", "server")
+        self.assertEqual("80", configs[1].get("port", "server"))
+
+    def test_load_errors(self):
+        path = self.get_temp_path() + ".missing"
+
+        async def run():
+            await IniConfig.aload(path)
+
+        with self.assertRaises(FileNotFoundError):
+            asyncio.run(run())
+
+    def test_awatch(self):
+        path = self.gen_temp_config("[server]\nport = 80\n")
+
+        def write(content):
+            with open(path, "w") as file:
+                file.write(content)
+
+        async def run():
+            ports = []
+            watch = simplini.awatch(path, interval=0.01, debounce=0.02, initial=True)
+
+            async for config in watch:
+                ports.append(config.get("port", "server"))
+
+                if len(ports) == 1:
+                    # series of writes results in a single load
+                    write("[server]\nport = 1\n")
+                    write("[server]\nport = 8080\n")
+                else:
+                    break
+
+            await watch.aclose()
+            return ports
+
+        ports = asyncio.run(asyncio.wait_for(run(), timeout=10))
+
+        self.assertEqual(["80", "8080"], ports)
@@ -0,0 +1,155 @@
+import logging
+import time
+from unittest import mock
+
+from simplini import IniConfig
+from simplini.autosave import LOGGER
+from simplini.core import IniConfigSection
+from tests.common import CaseBase
+
+
+class AutosaveCases(CaseBase):
+    def autosaved_config(self, path: str, **kwargs) -> IniConfig:
+        config = IniConfig()
+        config.enable_autosave(path, **kwargs)
+        self.addCleanup(config.disable_autosave, False)
+        return config
+
+    def test_changes_are_saved_after_debounce(self):
+        path = self.get_temp_path()
+        config = self.autosaved_config(path, debounce=0.05, max_delay=1.0)
+
+        config.set("foo", "bar")
+        config.ensure_section("section")["spam"] = "eggs"
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if "spam" in self.get_text(path):
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(
+            {"": {"foo": "bar"}, "section": {"spam": "eggs"}},
+            IniConfig.load(path).as_dict(),
+        )
+
+        # nothing is pending anymore
+        self.assertFalse(config.flush())
+
+    def test_writes_are_coalesced(self):
+        path = self.get_temp_path()
+        config = self.autosaved_config(path, debounce=0.05, max_delay=0.2)
+
+        saves = []
+        assert config.autosaver is not None
+        original_save = config.autosaver.save_fn
+
+        def counting_save():
+            saves.append(time.monotonic())
+            original_save()
+
+        config.autosaver.save_fn = counting_save
+
+        started_at = time.monotonic()
+        idx = 0
+        while time.monotonic() - started_at < 0.5:
+            config.set("counter", str(idx))
+            idx += 1
+            time.sleep(0.001)
+
+        config.flush()
+
+        # max delay bounds the amount of writes despite constant changes
+        self.assertGreaterEqual(len(saves), 1)
+        self.assertLessEqual(len(saves), 5)
+        self.assertEqual(str(idx - 1), IniConfig.load(path).get("counter"))
+
+    def test_structural_edits_while_saving(self):
+        path = self.get_temp_path()
+        config = self.autosaved_config(path, debounce=0, max_delay=0.001)
+
+        failures = []
+        handler = logging.Handler(logging.ERROR)
+        handler.emit = failures.append
+        LOGGER.addHandler(handler)
+        self.addCleanup(LOGGER.removeHandler, handler)
+
+        for section_idx in range(20):
+            section = config.ensure_section(f"section{section_idx}")
+            for option_idx in range(20):
+                section.set(f"option{option_idx}", str(option_idx))
+
+        started_at = time.monotonic()
+        idx = 0
+        while time.monotonic() - started_at < 0.3:
+            section = config[f"section{idx % 20}"]
+            section.rename_option("option0", "renamed")
+            section.move_option("renamed", after="option10")
+            section.rename_option("renamed", "option0")
+            config.move_section(section.name, before="section0")
+            idx += 1
+
+        config.flush()
+
+        self.assertEqual([], failures)
+        saved = IniConfig.load(path)
+        self.assertEqual(list(config), list(saved))
+        self.assertEqual(list(config["section0"]), list(saved["section0"]))
+
+        # direct changes are picked up once marked
+        config.get_option("option1", "section1").value = "direct"
+        config.mark_dirty()
+        config.flush()
+        self.assertEqual("direct", IniConfig.load(path).get("option1", "section1"))
+
+    def test_changed_sections_are_cloned_once_per_save(self):
+        path = self.get_temp_path()
+        config = self.autosaved_config(path, debounce=60, max_delay=60)
+        section = config.ensure_section("a")
+        config.ensure_section("b").set("x", "1")
+        config.flush()
+
+        clones = []
+        original_clone = IniConfigSection.clone
+
+        def counting_clone(self):
+            clones.append(self.name)
+            return original_clone(self)
+
+        with mock.patch.object(IniConfigSection, "clone", counting_clone):
+            for idx in range(100):
+                section.set("x", str(idx))
+            self.assertEqual([], clones)
+
+            config.flush()
+
+        # the changed section once, then the whole snapshot to be rendered
+        self.assertEqual(["a", "", "a", "b"], clones)
+        self.assertEqual("99", IniConfig.load(path).get("x", "a"))
+
+    def test_explicit_flush(self):
+        path = self.get_temp_path()
+        config = self.autosaved_config(path, debounce=60, max_delay=60)
+
+        config.set("foo", "bar")
+        del config.unnamed_section["foo"]
+        config.set("spam", "eggs")
+
+        self.assertTrue(config.flush())
+        self.assertFalse(config.flush())
+        self.assertEqual({"": {"spam": "eggs"}}, IniConfig.load(path).as_dict())
+
+    def test_disable_flushes_pending_changes(self):
+        path = self.get_temp_path()
+        config = IniConfig()
+        config.enable_autosave(path, debounce=60, max_delay=60)
+
+        config.set("foo", "bar")
+        config.disable_autosave()
+
+        self.assertEqual({"": {"foo": "bar"}}, IniConfig.load(path).as_dict())
+
+        # no longer tracked
+        config.set("foo", "baz")
+        self.assertFalse(config.flush())
+        self.assertEqual("bar", IniConfig.load(path).get("foo"))
@@ -1,7 +1,7 @@
 import logging
 import os
 
-from simplini import IniConfig
+from simplini import IniConfig, IniConfigOption, IniConfigSection
 from tests.common import CaseBase
 
 LOGGER = logging.getLogger(__name__)
@@ -241,3 +241,101 @@ class BasicCases(CaseBase):
             },
             config.as_dict(),
         )
+
+    def test_change_listeners(self):
+        config = IniConfig()
+        changes = []
+        config.add_change_listener(lambda s, o: changes.append((s, o)))
+
+        config.set("foo", "bar")
+        section = config.ensure_section("section")
+        section["spam"] = "eggs"
+        del section["spam"]
+        del config["section"]
+
+        # detached section is no longer tracked
+        section["spam"] = "eggs"
+
+        self.assertEqual(
+            [
+                ("", "foo"),
+                ("section", None),
+                ("section", "spam"),
+                ("section", "spam"),
+                ("section", None),
+            ],
+            changes,
+        )
+
+    def test_bulk_construction_and_update(self):
+        data = {
+            "": {"foo": "bar"},
+            "core": {"a": "1", "b": "2"},
+        }
+
+        config = IniConfig.from_dict(data)
+        self.assertIsInstance(config, IniConfig)
+        self.assertEqual(data, config.as_dict())
+
+        config.update({"core": {"b": "3", "c": "4"}, "new": {"x": "y"}})
+        self.assertEqual(
+            {
+                "": {"foo": "bar"},
+                "core": {"a": "1", "b": "3", "c": "4"},
+                "new": {"x": "y"},
+            },
+            config.as_dict(),
+        )
+
+        config.update({"core": {"only": "this"}}, merge=False)
+        self.assertEqual({"only": "this"}, config["core"].as_dict())
+
+        config.get_section("new").set_many([("x", "z"), ("w", "v")])
+        self.assertEqual({"x": "z", "w": "v"}, config["new"].as_dict())
+
+    def test_bulk_update_carries_comments(self):
+        option = IniConfigOption("port", "5432")
+        option.comment = ["database port"]
+        option.inline_comment = "inline"
+
+        section = IniConfigSection("db")
+        section.comment = ["database settings"]
+        section.set("host", "localhost")
+
+        config = IniConfig.from_dict({"db": section})
+        config["db"].set_many({"port": option})
+
+        self.assertEqual(["database settings"], config["db"].comment)
+        self.assertEqual(["database port"], config["db"].get_option("port").comment)
+        self.assertEqual("inline", config["db"].get_option("port").inline_comment)
+
+        # options are copied, not shared
+        self.assertIsNot(option, config["db"].get_option("port"))
+        self.assertIsNot(section.get_option("host"), config["db"].get_option("host"))
+
+    def test_bulk_update_notifies_listeners(self):
+        config = IniConfig()
+        changes = []
+        config.add_change_listener(lambda s, o: changes.append((s, o)))
+
+        config.update({"core": {"a": "1", "b": "2"}})
+
+        self.assertEqual([("core", None), ("core", "a"), ("core", "b")], changes)
+
+    def test_reload(self):
+        path = self.gen_temp_config('foo = "bar"\n[a]\nx = "1"\n[b]\ny = "2"\n')
+        config = IniConfig.load(path)
+
+        changes = []
+        config.add_change_listener(lambda s, o: changes.append((s, o)))
+
+        with open(path, "w") as file:
+            file.write('[c]\nz = "3"\n[a]\nx = "4"\n')
+
+        config.reload()
+
+        self.assertEqual({"c": {"z": "3"}, "a": {"x": "4"}}, config.as_dict())
+        self.assertEqual(["c", "a"], list(config.sections))
+        self.assertEqual(
+            {("b", None), ("", None), ("c", None), ("a", None)}, set(changes)
+        )
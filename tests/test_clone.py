@@ -0,0 +1,111 @@
+import io
+
+from simplini import IniConfig
+from tests.common import CaseBase
+
+CONTENT = (
+    "name = base\n"
+    "[server]\n"
+    "# listening port\n"
+    "port = 80\n"
+    "host = localhost\n"
+    "[client]\n"
+    "timeout = 5\n"
+)
+
+
+class CloneCases(CaseBase):
+    def render(self, config: IniConfig) -> str:
+        text_io = io.StringIO()
+        config.renderer.render(text_io, config, config.flavour)
+        return text_io.getvalue()
+
+    def test_clone_shares_until_written(self):
+        config = self.load_config(CONTENT)
+        clone = config.clone()
+
+        self.assertEqual(config.as_dict(), clone.as_dict())
+        self.assertEqual(self.render(config), self.render(clone))
+        self.assertIsNot(config.sections["server"], clone.sections["server"])
+        self.assertIs(
+            config.sections["server"].options, clone.sections["server"].options
+        )
+
+        clone.set("port", "8080", "server")
+
+        self.assertEqual("80", config.get("port", "server"))
+        self.assertEqual("8080", clone.get("port", "server"))
+        self.assertEqual(["listening port"], clone.get_option("port", "server").comment)
+
+        # untouched options and sections are still shared
+        self.assertIs(
+            config.sections["server"].options["host"],
+            clone.sections["server"].options["host"],
+        )
+        self.assertIs(
+            config.sections["client"].options, clone.sections["client"].options
+        )
+
+    def test_isolation_both_ways(self):
+        config = self.load_config(CONTENT)
+        clone = config.clone()
+
+        config.set("timeout", "10", "client")
+        config["server"]["user"] = "root"
+        del config["server"]["host"]
+        config.set("name", "changed")
+
+        self.assertEqual("5", clone.get("timeout", "client"))
+        self.assertEqual(
+            {"port": "80", "host": "localhost"}, clone.get_section("server").as_dict()
+        )
+        self.assertEqual("base", clone.get("name"))
+
+        clone["server"].set_many({"port": "1", "extra": "2"})
+        self.assertEqual("80", config.get("port", "server"))
+        self.assertNotIn("extra", config["server"])
+
+    def test_comment_edits(self):
+        config = self.load_config(CONTENT)
+        clone = config.clone()
+
+        clone.get_option("port", "server").comment.append("changed")
+        clone.get_section("server").comment = ["server section"]
+        clone.get_option("host", "server").inline_comment = "inline"
+
+        self.assertEqual(
+            ["listening port"], config.get_option("port", "server").comment
+        )
+        self.assertEqual(
+            ["listening port", "changed"], clone.get_option("port", "server").comment
+        )
+        self.assertFalse(config.get_section("server").comment)
+        self.assertIsNone(config.get_option("host", "server").inline_comment)
+
+    def test_sections_changes(self):
+        config = self.load_config(CONTENT)
+        clone = config.clone()
+
+        del clone["client"]
+        clone.ensure_section("extra").set("a", "1")
+
+        self.assertEqual(["server", "client"], list(config.sections))
+        self.assertEqual(["server", "extra"], list(clone.sections))
+
+        changes = []
+        clone.add_change_listener(lambda *args: changes.append(args))
+        clone.set("port", "1", "server")
+        config.set("port", "2", "server")
+        self.assertEqual([("server", "port")], changes)
+
+    def test_clone_of_clone(self):
+        config = self.load_config(CONTENT)
+        first = config.clone()
+        second = first.clone()
+
+        first.set("port", "1", "server")
+        second.set("port", "2", "server")
+
+        self.assertEqual("80", config.get("port", "server"))
+        self.assertEqual("1", first.get("port", "server"))
+        self.assertEqual("2", second.get("port", "server"))
@@ -0,0 +1,100 @@
+import os
+import subprocess
+import sys
+
+import simplini
+from simplini import IniConfig
+from simplini.merge_driver import merge_driver
+from tests.common import CaseBase
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+
+
+class DiffCases(CaseBase):
+    def test_identical(self):
+        content = 'a = "1"\n[s]\n# comment\nb = c\n'
+        self.assertFalse(
+            simplini.diff(self.load_config(content), self.load_config(content))
+        )
+
+    def test_changes(self):
+        a = self.load_config('a = "1"\n[same]\nx = "1"\n[s]\nb = "1"\nc = "1"\n[old]\n')
+        b = self.load_config(
+            'a = "1"\n[same]\nx = "1"\n[s]\n# comment\nb = 1\nd = "1"\n[new]\n# end\n'
+        )
+
+        result = simplini.diff(a, b)
+
+        self.assertEqual(["old"], [c.section_name for c in result.removed_sections])
+        self.assertEqual(["new"], [c.section_name for c in result.added_sections])
+        self.assertEqual(["s"], [c.section_name for c in result.changed_sections])
+        self.assertEqual(("order",), result.changed_sections[0].fields)
+        self.assertEqual(["c"], [c.option_name for c in result.removed_options])
+        self.assertEqual(["d"], [c.option_name for c in result.added_options])
+
+        [changed] = result.changed_options
+        self.assertEqual(("s", "b"), (changed.section_name, changed.option_name))
+        self.assertEqual(("style", "comment"), changed.fields)
+        self.assertTrue(result.trailing_comment_changed)
+
+    def test_merge3(self):
+        base = self.load_config('[a]\nx = "1"\ny = "1"\n[b]\nz = "1"\n[c]\nw = "1"\n')
+        ours = self.load_config('[a]\nx = "2"\ny = "1"\n[b]\nz = "1"\n[c]\nw = "1"\n')
+        theirs = self.load_config(
+            '[a]\nx = "1"\ny = "3"\nnew = "1"\n[b]\nz = "1"\n[d]\nq = "1"\n'
+        )
+
+        result = simplini.merge3(base, ours, theirs)
+
+        self.assertEqual([], result.conflicts)
+        self.assertEqual(
+            {
+                "a": {"x": "2", "y": "3", "new": "1"},
+                "b": {"z": "1"},
+                "d": {"q": "1"},
+            },
+            result.config.as_dict(),
+        )
+
+    def test_merge3_conflicts(self):
+        base = self.load_config('[a]\nx = "1"\n[b]\nz = "1"\n')
+        ours = self.load_config('[a]\nx = "2"\n[b]\nz = "2"\n')
+        theirs = self.load_config('[a]\nx = "3"\n')
+
+        result = simplini.merge3(base, ours, theirs)
+
+        self.assertEqual(
+            [("a", "x"), ("b", None)],
+            [(c.section_name, c.option_name) for c in result.conflicts],
+        )
+        # conflicts are resolved in favor of ours
+        self.assertEqual({"a": {"x": "2"}, "b": {"z": "2"}}, result.config.as_dict())
+
+    def test_merge_driver(self):
+        base = self.gen_temp_config('[a]\nx = "1"\ny = "1"\n')
+        ours = self.gen_temp_config('[a]\nx = "2"\ny = "1"\n')
+        theirs = self.gen_temp_config('[a]\nx = "1"\ny = "2"\n')
+
+        env = dict(os.environ, PYTHONPATH=SRC_DIR)
+        process = subprocess.run(
+            [sys.executable, "-m", "simplini.merge_driver", base, ours, theirs], env=env
+        )
+
+        self.assertEqual(0, process.returncode)
+        self.assertEqual({"a": {"x": "2", "y": "2"}}, IniConfig.load(ours).as_dict())
+
+        theirs = self.gen_temp_config('[a]\nx = "3"\ny = "1"\n')
+        process = subprocess.run(
+            [sys.executable, "-m", "simplini.merge_driver", base, ours, theirs], env=env
+        )
+
+        self.assertEqual(1, process.returncode)
+        self.assertIn("merge conflict", self.get_text(ours))
+
+    def test_merge_driver_keeps_value_styles(self):
+        base = self.gen_temp_config("[a]\nx = 1\ny = '1'\nz = \"1\"\n")
+        ours = self.gen_temp_config("[a]\nx = 2\ny = '1'\nz = \"1\"\n")
+        theirs = self.gen_temp_config("[a]\nx = 1\ny = '1'\nz = \"2\"\n")
+
+        self.assertEqual(0, merge_driver(base, ours, theirs))
+        self.assertEqual("[a]\n\nx = 2\n\ny = '1'\n\nz = \"2\"\n", self.get_text(ours))
@@ -0,0 +1,108 @@
+from simplini import IniConfig
+from simplini.core import SimpliniError
+from tests.common import SAMPLE_CONFIG, CaseBase
+
+
+class SubscriptionCases(CaseBase):
+    def test_filtering(self):
+        config = IniConfig.from_dict(SAMPLE_CONFIG)
+        port, server, everything, any_timeout = [], [], [], []
+
+        config.subscribe(port.append, "server", "port")
+        config["server"].subscribe(server.append)
+        config.subscribe(everything.append)
+        config.subscribe(any_timeout.append, option_name="timeout")
+
+        config.set("port", "8080", "server")
+        config.set("host", "remote", "server")
+        config.set("timeout", "10", "client")
+        config.set("name", "other")
+
+        self.assertEqual([[("server", "port")]], port)
+        self.assertEqual([[("server", "port")], [("server", "host")]], server)
+        self.assertEqual(4, len(everything))
+        self.assertEqual([[("client", "timeout")]], any_timeout)
+
+    def test_sections_changes(self):
+        config = IniConfig.from_dict(SAMPLE_CONFIG)
+        port, client = [], []
+
+        config.subscribe(port.append, "server", "port")
+        config.subscribe(client.append, "client")
+
+        del config["server"]
+        config.ensure_section("client").set("retries", "3")
+        del config["client"]["retries"]
+
+        # section-level changes reach the option subscribers too
+        self.assertEqual([[("server", None)]], port)
+        self.assertEqual([[("client", "retries")], [("client", "retries")]], client)
+
+        config.ensure_section("server")
+        self.assertEqual([[("server", None)], [("server", None)]], port)
+
+    def test_batches(self):
+        config = IniConfig.from_dict(SAMPLE_CONFIG)
+        events, port = [], []
+        config.subscribe(events.append)
+        config.subscribe(port.append, "server", "port")
+
+        with config.batch():
+            config.set("port", "1", "server")
+            config.set("port", "2", "server")
+            with config.batch():
+                config.set("host", "remote", "server")
+            self.assertEqual([], events)
+            config.set("timeout", "1", "client")
+
+        self.assertEqual(
+            [[("server", "port"), ("server", "host"), ("client", "timeout")]], events
+        )
+        self.assertEqual([[("server", "port")]], port)
+
+        events.clear()
+        config.update({"server": {"a": "1", "b": "2"}, "extra": {"c": "3"}})
+        self.assertEqual(1, len(events))
+        self.assertEqual(
+            {("server", "a"), ("server", "b"), ("extra", None), ("extra", "c")},
+            set(events[0]),
+        )
+
+    def test_reload_is_coalesced(self):
+        path = self.gen_temp_config("[a]\nx = 1\n[b]\ny = 2\n")
+        config = IniConfig.load(path)
+        events = []
+        config.subscribe(events.append)
+
+        with open(path, "w") as file:
+            file.write("[a]\nx = 2\n[c]\nz = 3\n")
+
+        config.reload()
+
+        self.assertEqual(1, len(events))
+        self.assertEqual(
+            {("", None), ("a", None), ("b", None), ("c", None)}, set(events[0])
+        )
+
+    def test_cancel(self):
+        config = IniConfig.from_dict(SAMPLE_CONFIG)
+        events = []
+        subscription = config.subscribe(events.append, "server")
+
+        with config.batch():
+            config.set("port", "1", "server")
+            subscription.cancel()
+
+        config.set("port", "2", "server")
+        subscription.cancel()
+
+        self.assertEqual([], events)
+        self.assertEqual({}, config.event_dispatcher.subscriptions)
+
+    def test_detached_section(self):
+        config = IniConfig.from_dict(SAMPLE_CONFIG)
+        section = config["server"]
+        del config["server"]
+
+        with self.assertRaises(SimpliniError):
+            section.subscribe(print)
@@ -0,0 +1,128 @@
+from unittest import mock
+
+import simplini
+from simplini.core import IniConfigOption
+from tests.common import CaseBase
+
+CONTENT = (
+    "name = app\n"
+    "[server]\n"
+    "# listening port\n"
+    "port = 80\n"
+    "host = localhost\n"
+    "[client]\n"
+    "timeout = 5\n"
+)
+
+
+class FingerprintCases(CaseBase):
+    def test_same_content(self):
+        a, b = self.load_config(CONTENT), self.load_config(CONTENT)
+
+        self.assertEqual(a.fingerprint(), b.fingerprint())
+        self.assertTrue(a.content_equals(b))
+        self.assertTrue(a.content_equals(a.clone()))
+        # the configs themselves are still compared by identity
+        self.assertNotEqual(a, b)
+
+    def test_differences(self):
+        config = self.load_config(CONTENT)
+        variants = [
+            CONTENT.replace("80", "81"),
+            CONTENT.replace("listening port", "port"),
+            CONTENT.replace("80", '"80"'),
+            CONTENT.replace("timeout = 5", "timeout = 5  # seconds"),
+            CONTENT.replace("[client]", "[http_client]"),
+            CONTENT + "# trailing\n",
+        ]
+
+        for content in variants:
+            with self.subTest(content=content):
+                self.assertFalse(config.content_equals(self.load_config(content)))
+
+        reordered = self.load_config(CONTENT)
+        reordered.move_section("client", before="server")
+        self.assertFalse(config.content_equals(reordered))
+
+    def test_incremental(self):
+        config = self.load_config(CONTENT)
+        before = config.fingerprint()
+        client_cache = config["client"].fingerprint_cache
+        host_cache = config.get_option("host", "server").fingerprint_cache
+
+        config.set("port", "81", "server")
+
+        self.assertNotEqual(before, config.fingerprint())
+        # untouched section and option are not hashed again
+        self.assertIs(client_cache, config["client"].fingerprint_cache)
+        self.assertIs(host_cache, config["server"].options["host"].fingerprint_cache)
+
+        config.set("port", "80", "server")
+        self.assertEqual(before, config.fingerprint())
+
+    def test_changes_through_options_and_comments(self):
+        config = self.load_config(CONTENT)
+        before = config.fingerprint()
+
+        config.get_option("port", "server").comment = ["changed"]
+        changed = config.fingerprint()
+        self.assertNotEqual(before, changed)
+
+        config["client"].inline_comment = "client settings"
+        self.assertNotEqual(changed, config.fingerprint())
+
+    def test_direct_option_edits(self):
+        a, b = self.load_config(CONTENT), self.load_config(CONTENT)
+        self.assertTrue(a.content_equals(b))
+
+        # fetching the option resets the digest of its section
+        option = a.get_option("port", "server")
+        option.value = "81"
+
+        self.assertFalse(a.content_equals(b))
+        self.assertEqual(
+            [("server", "port")],
+            [(c.section_name, c.option_name) for c in simplini.diff(a, b).changes],
+        )
+
+        # changes of the options kept around have to be reported
+        option.value = "80"
+        self.assertFalse(a.content_equals(b))
+        a["server"].reset_fingerprint()
+        self.assertTrue(a.content_equals(b))
+
+    def test_unchanged_sections_are_not_hashed_again(self):
+        config = self.load_config(CONTENT)
+        config.fingerprint()
+        option = config["client"].options["timeout"]
+
+        with mock.patch.object(
+            IniConfigOption, "fingerprint", side_effect=AssertionError
+        ):
+            config.fingerprint()
+
+        config.set("port", "81", "server")
+        with mock.patch.object(
+            IniConfigOption, "fingerprint", autospec=True, return_value=b""
+        ) as fingerprint:
+            config.fingerprint()
+        self.assertNotIn(mock.call(option), fingerprint.call_args_list)
+        self.assertEqual(2, fingerprint.call_count)
+
+    def test_transaction_rollback(self):
+        config = self.load_config(CONTENT)
+        before = config.fingerprint()
+
+        with self.assertRaises(ValueError):
+            with config.transaction():
+                config.set("port", "81", "server")
+                config.fingerprint()
+                raise ValueError()
+
+        self.assertEqual(before, config.fingerprint())
+
+    def test_hashable_by_identity(self):
+        a, b = self.load_config(CONTENT), self.load_config(CONTENT)
+
+        self.assertEqual(2, len({a, b}))
+        self.assertIn(a, {a: None})
@@ -0,0 +1,104 @@
+import io
+import threading
+
+from simplini import FrozenIniConfig, IniConfig
+from simplini.core import SimpliniError
+from tests.common import CaseBase
+
+CONTENT = (
+    "name = app\n"
+    "[server]\n"
+    "# listening port\n"
+    "port = 8080\n"
+    "debug = yes\n"
+    "[client] ; inline\n"
+    "timeout = 1.5\n"
+    "# trailing\n"
+)
+
+
+class FrozenConfigCases(CaseBase):
+    def test_lookups(self):
+        frozen = self.load_config(CONTENT).freeze()
+
+        self.assertIsInstance(frozen, FrozenIniConfig)
+        self.assertEqual("app", frozen.get("name"))
+        self.assertEqual("8080", frozen.get("port", "server"))
+        self.assertEqual(8080, frozen.get_int("port", "server"))
+        self.assertIs(True, frozen.get_bool("debug", "server"))
+        self.assertEqual(1.5, frozen.get_float("timeout", "client"))
+        self.assertIsNone(frozen.get("missing", "server"))
+        self.assertEqual(7, frozen.get_int("missing", "server", 7))
+        self.assertEqual({"port": "8080", "debug": "yes"}, dict(frozen["server"]))
+        self.assertIn("client", frozen)
+        self.assertEqual(["server", "client"], list(frozen))
+        self.assertEqual(self.load_config(CONTENT).as_dict(), frozen.as_dict())
+
+    def test_immutable(self):
+        frozen = self.load_config(CONTENT).freeze()
+
+        with self.assertRaises(SimpliniError):
+            frozen.values = {}
+
+        with self.assertRaises(TypeError):
+            frozen["server"]["port"] = "1"
+
+        with self.assertRaises(TypeError):
+            frozen.values[("server", "port")] = "1"
+
+    def test_snapshot_is_detached(self):
+        config = self.load_config(CONTENT)
+        frozen = config.freeze()
+
+        config.set("port", "1", "server")
+        self.assertEqual("8080", frozen.get("port", "server"))
+
+    def test_hash_and_equality(self):
+        a = self.load_config(CONTENT).freeze()
+        b = self.load_config(CONTENT).freeze()
+
+        self.assertEqual(a, b)
+        self.assertEqual(hash(a), hash(b))
+        self.assertEqual(1, len({a, b}))
+
+        config = self.load_config(CONTENT)
+        config.set("port", "1", "server")
+        c = config.freeze()
+        self.assertNotEqual(a, c)
+
+        cache = {a: "cached"}
+        self.assertEqual("cached", cache[b])
+
+    def test_thaw(self):
+        config = self.load_config(CONTENT)
+        thawed = config.freeze().thaw()
+
+        self.assertIsInstance(thawed, IniConfig)
+
+        def render(c):
+            text_io = io.StringIO()
+            c.renderer.render(text_io, c, c.flavour)
+            return text_io.getvalue()
+
+        self.assertEqual(render(config), render(thawed))
+
+        thawed.set("port", "1", "server")
+        self.assertEqual("8080", config.get("port", "server"))
+        self.assertEqual(config.freeze(), config.freeze().thaw().freeze())
+
+    def test_concurrent_reads(self):
+        frozen = self.load_config(CONTENT).freeze()
+        errors = []
+
+        def read():
+            for _ in range(1000):
+                if frozen.get_int("port", "server") != 8080:
+                    errors.append("unexpected value")
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
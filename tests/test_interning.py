@@ -0,0 +1,65 @@
+from simplini import IniConfig, IniParser, InterningPool
+from tests.common import CaseBase
+
+COMMON = "[common]\n# shared settings\nretries = 3\ntimeout = 30\n"
+
+
+class InterningCases(CaseBase):
+    def load_hosts(self, pool: InterningPool, count: int = 3):
+        parser = IniParser(interning_pool=pool)
+        configs = []
+        for idx in range(count):
+            path = self.gen_temp_config(f"host = h{idx}\n{COMMON}[local]\nid = {idx}\n")
+            configs.append(IniConfig.load(path, parser=parser))
+        return configs
+
+    def test_identical_sections_are_shared(self):
+        pool = InterningPool()
+        first, second, third = self.load_hosts(pool)
+
+        self.assertIs(first["common"].options, second["common"].options)
+        self.assertIs(first["common"].options, third["common"].options)
+        self.assertIsNot(first["local"].options, second["local"].options)
+
+        # the unnamed and local sections differ, common one is shared
+        self.assertEqual(7, len(pool.sections))
+
+        self.assertEqual(
+            ["shared settings"], second.get_option("retries", "common").comment
+        )
+        self.assertEqual("30", third.get("timeout", "common"))
+
+    def test_shared_sections_are_copied_on_write(self):
+        pool = InterningPool()
+        first, second, _ = self.load_hosts(pool)
+
+        second.set("timeout", "60", "common")
+        second.get_option("retries", "common").comment = ["changed"]
+
+        self.assertEqual("30", first.get("timeout", "common"))
+        self.assertEqual(
+            ["shared settings"], first.get_option("retries", "common").comment
+        )
+
+        # later loads still get the original content
+        (fourth,) = self.load_hosts(pool, count=1)
+        self.assertEqual("30", fourth.get("timeout", "common"))
+
+    def test_strings_are_interned(self):
+        pool = InterningPool()
+        parser = IniParser(interning_pool=pool)
+
+        path_a = self.gen_temp_config("[a]\nkey = some long value\n")
+        path_b = self.gen_temp_config("[b]\nkey = some long value\n")
+
+        a = IniConfig.load(path_a, parser=parser)
+        b = IniConfig.load(path_b, parser=parser)
+
+        self.assertIs(
+            a.get_section("a").options["key"].value,
+            b.get_section("b").options["key"].value,
+        )
+
+    def test_no_pool_by_default(self):
+        configs = [IniConfig.load(self.gen_temp_config(COMMON)) for _ in range(2)]
+        self.assertIsNot(configs[0]["common"].options, configs[1]["common"].options)
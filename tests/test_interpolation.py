@@ -0,0 +1,108 @@
+import io
+
+from simplini import (
+    IniConfig,
+    InterpolationCycleError,
+    InterpolationError,
+    Interpolator,
+)
+from tests.common import CaseBase
+
+CONTENT = (
+    "root = /srv\n"
+    "[paths]\n"
+    "data = ${:root}/data\n"
+    "logs = ${paths:data}/logs\n"
+    "home = ${HOME_DIR}/app\n"
+    "price = $$5\n"
+    "[db]\n"
+    "url = sqlite://${paths:data}/db.sqlite\n"
+)
+
+
+class InterpolationCases(CaseBase):
+    def test_resolution(self):
+        config = self.load_config(CONTENT)
+        interpolator = Interpolator(config, environ={"HOME_DIR": "/home/user"})
+
+        self.assertEqual("/srv/data/logs", interpolator.get("logs", "paths"))
+        self.assertEqual("sqlite:///srv/data/db.sqlite", interpolator.get("url", "db"))
+        self.assertEqual("/home/user/app", interpolator.get("home", "paths"))
+        self.assertEqual("$5", interpolator.get("price", "paths"))
+        self.assertEqual("/srv", interpolator.get("root"))
+        self.assertIsNone(interpolator.get("missing", "paths"))
+
+        # raw values are kept for saving
+        self.assertEqual("${paths:data}/logs", config.get("logs", "paths"))
+        text_io = io.StringIO()
+        config.renderer.render(text_io, config, config.flavour)
+        self.assertIn('logs = "${paths:data}/logs"', text_io.getvalue())
+
+    def test_invalidates_dependents_only(self):
+        config = self.load_config(CONTENT)
+        interpolator = Interpolator(config, environ={"HOME_DIR": "/home/user"})
+        interpolator.as_dict()
+
+        config.set("data", "/var/data", "paths")
+
+        self.assertNotIn(("paths", "logs"), interpolator.resolved)
+        self.assertNotIn(("db", "url"), interpolator.resolved)
+        self.assertIn(("paths", "home"), interpolator.resolved)
+        self.assertIn(("", "root"), interpolator.resolved)
+
+        self.assertEqual("/var/data/logs", interpolator.get("logs", "paths"))
+        self.assertEqual("sqlite:///var/data/db.sqlite", interpolator.get("url", "db"))
+
+        # the old reference is dropped from the graph
+        self.assertNotIn(("paths", "data"), interpolator.dependents[("", "root")])
+
+        del config["paths"]
+        self.assertNotIn(("db", "url"), interpolator.resolved)
+        with self.assertRaises(InterpolationError):
+            interpolator.get("url", "db")
+
+    def test_environment(self):
+        config = self.load_config(CONTENT)
+        environ = {"HOME_DIR": "/home/a"}
+        interpolator = Interpolator(config, environ=environ)
+
+        self.assertEqual("/home/a/app", interpolator.get("home", "paths"))
+
+        environ["HOME_DIR"] = "/home/b"
+        self.assertEqual("/home/a/app", interpolator.get("home", "paths"))
+        interpolator.invalidate_environment(["HOME_DIR"])
+        self.assertEqual("/home/b/app", interpolator.get("home", "paths"))
+
+        del environ["HOME_DIR"]
+        interpolator.invalidate_environment()
+        with self.assertRaises(InterpolationError) as ctx:
+            interpolator.get("home", "paths")
+        self.assertIn('"HOME_DIR"', str(ctx.exception))
+
+    def test_cycles(self):
+        config = IniConfig()
+        config.set("a", "${s:b}", "s")
+        config.set("b", "x${s:c}", "s")
+        config.set("c", "${s:a}", "s")
+        config.set("d", "${s:b}", "s")
+        interpolator = Interpolator(config, environ={})
+
+        with self.assertRaises(InterpolationCycleError) as ctx:
+            interpolator.get("d", "s")
+
+        self.assertEqual(
+            [("s", "b"), ("s", "c"), ("s", "a"), ("s", "b")], ctx.exception.cycle
+        )
+        self.assertIn("${s:b} -> ${s:c} -> ${s:a} -> ${s:b}", str(ctx.exception))
+
+        config.set("c", "end", "s")
+        self.assertEqual("xend", interpolator.get("d", "s"))
+
+    def test_close(self):
+        config = self.load_config(CONTENT)
+        interpolator = Interpolator(config, environ={})
+        self.assertEqual("/srv", interpolator.get("root"))
+
+        interpolator.close()
+        config.set("root", "/opt")
+        self.assertEqual("/srv", interpolator.get("root"))
@@ -0,0 +1,127 @@
+import os
+
+from simplini import IniConfig
+from simplini.journal import JOURNAL_SUFFIX, JournalError
+from tests.common import CaseBase
+
+
+class JournalCases(CaseBase):
+    def create_base(self) -> str:
+        path = self.gen_temp_config('foo = "bar"\n\n[section]\n\nspam = "eggs"\n')
+        self.addCleanup(
+            lambda: (
+                os.path.exists(path + JOURNAL_SUFFIX)
+                and os.unlink(path + JOURNAL_SUFFIX)
+            )
+        )
+        return path
+
+    def load(self, path: str, **kwargs) -> IniConfig:
+        config = IniConfig.load(path)
+        config.enable_journal(path, **kwargs)
+        self.addCleanup(config.disable_journal, False)
+        return config
+
+    def test_changes_go_to_journal_and_are_replayed(self):
+        path = self.create_base()
+        base_text = self.get_text(path)
+
+        config = self.load(path)
+        config.set("foo", "changed")
+        config.set("new", "multi\nline", section_name="section")
+        config.ensure_section("empty")
+        config.ensure_section("gone").set("a", "b")
+        del config["gone"]
+        del config["section"]["spam"]
+
+        # base file is not rewritten
+        self.assertEqual(base_text, self.get_text(path))
+
+        replayed = self.load(path)
+        self.assertEqual(config.as_dict(), replayed.as_dict())
+        self.assertIn("empty", replayed)
+        self.assertNotIn("gone", replayed)
+
+    def test_structural_edits_are_replayed_in_order(self):
+        path = self.create_base()
+
+        config = self.load(path)
+        section = config.ensure_section("section")
+        section.set("x", "1")
+        section.set("y", "2")
+        config.ensure_section("other").set("z", "3")
+
+        section.rename_option("x", "xx")
+        config.move_section("section")
+        section.insert_option("w", "4", before="y")
+        config.rename_section("other", "renamed")
+        config.set("v", "5", section_name="section")
+
+        # held until the commit
+        with config.transaction():
+            config.move_section("renamed", before="section")
+            section.move_option("spam")
+
+        replayed = self.load(path)
+        self.assertEqual(["renamed", "section"], list(replayed))
+        self.assertEqual(["xx", "w", "y", "v", "spam"], list(replayed["section"]))
+        self.assertEqual(config.as_dict(), replayed.as_dict())
+
+    def test_compaction(self):
+        path = self.create_base()
+
+        config = self.load(path, compact_threshold=200)
+
+        for idx in range(50):
+            config.set("counter", str(idx))
+
+        # journal was folded into the config file a few times
+        self.assertLess(os.path.getsize(path + JOURNAL_SUFFIX), 200)
+        self.assertIn("counter", self.get_text(path))
+
+        config.compact_journal()
+        self.assertEqual(0, os.path.getsize(path + JOURNAL_SUFFIX))
+        self.assertEqual(config.as_dict(), IniConfig.load(path).as_dict())
+
+    def test_replay_after_compaction_is_idempotent(self):
+        path = self.create_base()
+
+        config = self.load(path)
+        del config["section"]
+        config.ensure_section("section").set("other", "value")
+        config.set("foo", "1")
+        config.set("foo", "2")
+
+        # simulate crash right after config file was replaced,
+        # but before journal got truncated
+        config.save(path, atomic=True)
+
+        replayed = self.load(path)
+        self.assertEqual(config.as_dict(), replayed.as_dict())
+
+    def test_torn_record_is_discarded(self):
+        path = self.create_base()
+
+        config = self.load(path)
+        config.set("foo", "changed")
+        config.disable_journal(compact=False)
+
+        with open(path + JOURNAL_SUFFIX, "ab") as file:
+            file.write(b'["set", "", "foo", "tor')
+
+        replayed = self.load(path)
+        self.assertEqual("changed", replayed.get("foo"))
+
+        # appends continue from the last complete record
+        replayed.set("foo", "after")
+        self.assertEqual("after", self.load(path).get("foo"))
+
+    def test_corrupted_journal(self):
+        path = self.create_base()
+
+        with open(path + JOURNAL_SUFFIX, "wb") as file:
+            file.write(b"garbage\n")
+            file.write(b'["set", "", "foo", "bar"]\n')
+
+        with self.assertRaisesRegex(JournalError, "line 1"):
+            IniConfig.load(path).enable_journal(path)
@@ -0,0 +1,96 @@
+from simplini import IniConfig, IniConfigSection, KeyCollisionError
+from simplini.core import SimpliniError
+from tests.common import CaseBase
+
+
+class KeyIndexCases(CaseBase):
+    def test_case_insensitive_lookups(self):
+        path = self.gen_temp_config(
+            "Name = root\n[Database]\nHost = localhost\nPort = 5432\n"
+        )
+        config = IniConfig.load(path, key_normalizer=str.casefold)
+
+        self.assertEqual("root", config.find("NAME"))
+        self.assertEqual("localhost", config.find("host", "database"))
+        self.assertIs(config.sections["Database"], config.find_section("DATABASE"))
+        self.assertEqual("5432", config.find_section("database").find("port"))
+        self.assertIsNone(config.find("user", "database"))
+        self.assertIsNone(config.find_section("missing"))
+
+        # exact lookups are not affected
+        self.assertIsNone(config.get("host", "database"))
+
+    def test_unicode_normalization(self):
+        config = IniConfig()
+        # decomposed "e" with the combining acute accent
+        config.ensure_section("Cafe\u0301").set("Straße", "1")
+        config.enable_key_index()
+
+        self.assertEqual("1", config.find("STRASSE", "caf\u00e9"))
+
+    def test_index_maintained_on_mutation(self):
+        config = IniConfig()
+        config.enable_key_index()
+
+        section = config.ensure_section("Server")
+        section.set("Port", "80")
+        section.set_many({"Host": "localhost"})
+        self.assertEqual("80", config.find("port", "server"))
+        self.assertEqual("localhost", config.find("host", "SERVER"))
+
+        del section["Port"]
+        self.assertIsNone(config.find("port", "server"))
+        section.set("port", "81")
+        self.assertEqual("81", config.find("PORT", "server"))
+
+        del config["Server"]
+        self.assertIsNone(config.find_section("server"))
+        config.add_section(IniConfigSection("server"))
+        self.assertIsNotNone(config.find_section("SERVER"))
+
+    def test_collisions(self):
+        config = IniConfig()
+        config.enable_key_index()
+        config.ensure_section("Server").set("Port", "80")
+
+        with self.assertRaises(KeyCollisionError):
+            config.ensure_section("SERVER")
+
+        with self.assertRaises(KeyCollisionError):
+            config.set("port", "81", "Server")
+
+        with self.assertRaises(KeyCollisionError):
+            config.get_section("Server").set_many({"PORT": "82"})
+
+        # config is left intact
+        self.assertEqual(["Server"], list(config.sections))
+        self.assertEqual({"Port": "80"}, config.get_section("Server").as_dict())
+
+    def test_collisions_reported_at_load_time(self):
+        path = self.gen_temp_config(
+            "[a]\nkey = 1\nKEY = 2\n[A]\nkey = 3\n[b]\nx = 1\nX = 2\n"
+        )
+
+        # no index by default
+        IniConfig.load(path)
+
+        with self.assertRaises(KeyCollisionError) as ctx:
+            IniConfig.load(path, key_normalizer=str.casefold)
+
+        self.assertEqual([("key", "KEY")], ctx.exception.collisions)
+
+        config = IniConfig.load(path)
+        with self.assertRaises(KeyCollisionError) as ctx:
+            config.enable_key_index()
+
+        self.assertEqual(
+            [("a", "A"), ("key", "KEY"), ("x", "X")], ctx.exception.collisions
+        )
+        self.assertIsNone(config.key_index)
+
+    def test_find_requires_index(self):
+        config = IniConfig()
+        config.set("key", "value")
+
+        with self.assertRaises(SimpliniError):
+            config.find("key")
@@ -0,0 +1,68 @@
+from simplini import IniConfig
+from tests.common import CaseBase
+
+DATA = {
+    "": {"name": "root"},
+    "server": {"host": "localhost", "port": "80"},
+    "client": {},
+}
+
+
+class MappingCases(CaseBase):
+    def test_section_mapping(self):
+        config = IniConfig.from_dict(DATA)
+        section = config["server"]
+
+        self.assertEqual({"host": "localhost", "port": "80"}, dict(section))
+        self.assertEqual({"host": "localhost", "port": "80"}, {**section})
+        self.assertEqual(["host", "port"], list(section))
+        self.assertEqual(2, len(section))
+        self.assertEqual(["localhost", "80"], list(section.values()))
+        self.assertIn(("port", "80"), section.items())
+        self.assertNotIn(("port", "81"), section.items())
+        self.assertEqual("x", section.get("user", "x"))
+        self.assertEqual(0, len(config["client"]))
+
+        # views are live
+        keys, values, items = section.keys(), section.values(), section.items()
+        section["user"] = "admin"
+        self.assertIn("user", keys)
+        self.assertIn("admin", values)
+        self.assertIn(("user", "admin"), items)
+
+        self.assertEqual("admin", section.pop("user"))
+        self.assertNotIn("user", keys)
+        self.assertEqual("localhost", section.setdefault("host", "remote"))
+
+    def test_section_mutation_notifies(self):
+        config = IniConfig.from_dict(DATA)
+        section = config["server"]
+        changes = []
+        config.add_change_listener(lambda *args: changes.append(args))
+
+        section.update({"port": "8080"})
+        section.clear()
+
+        self.assertEqual(0, len(section))
+        self.assertEqual(
+            [("server", "port"), ("server", "host"), ("server", "port")], changes
+        )
+
+    def test_sections_are_compared_by_identity(self):
+        config = IniConfig.from_dict(DATA)
+        other = IniConfig.from_dict(DATA)
+
+        self.assertNotEqual(config["server"], other["server"])
+        self.assertEqual(dict(config["server"]), dict(other["server"]))
+        self.assertEqual(1, len({config["server"], config["server"]}))
+
+    def test_config_views(self):
+        config = IniConfig.from_dict(DATA)
+
+        self.assertEqual(["server", "client"], list(config))
+        self.assertEqual(["server", "client"], list(config.keys()))
+        self.assertEqual([config["server"], config["client"]], list(config.values()))
+
+        items = config.items()
+        config.ensure_section("extra")
+        self.assertEqual(["server", "client", "extra"], [name for name, _ in items])
@@ -0,0 +1,165 @@
+import io
+import pickle
+
+from simplini import IniConfig, KeyCollisionError
+from simplini.core import SimpliniError
+from simplini.ordered import OrderedNodes
+from tests.common import CaseBase
+
+CONTENT = (
+    "[server]\n"
+    "# listening port\n"
+    "port = 80\n"
+    "host = localhost\n"
+    "[client]\n"
+    "timeout = 5\n"
+    "[logging]\n"
+    "level = info\n"
+)
+
+
+class OrderedNodesCases(CaseBase):
+    def test_moves_and_renames(self):
+        nodes = OrderedNodes([("a", 1), ("b", 2), ("c", 3)])
+
+        nodes.move_before("c", "a")
+        nodes.rename("b", "B")
+        nodes["d"] = 4
+        nodes.move_after("c", "d")
+        del nodes["a"]
+
+        self.assertEqual(["B", "d", "c"], list(nodes))
+        self.assertEqual([("B", 2), ("d", 4), ("c", 3)], list(nodes.items()))
+        self.assertEqual([2, 4, 3], list(nodes.values()))
+        self.assertEqual(["c", "d", "B"], list(reversed(nodes)))
+        self.assertEqual(3, nodes["c"])
+
+        # copies are compact and keep the order
+        self.assertEqual(["B", "d", "c"], list(nodes.copy()))
+        self.assertEqual(["B", "d", "c"], list(dict(nodes)))
+        self.assertEqual(["B", "d", "c"], list(pickle.loads(pickle.dumps(nodes))))
+
+        self.assertEqual(("c", 3), nodes.popitem())
+        self.assertEqual(2, nodes.pop("B"))
+        self.assertEqual(["d"], list(nodes))
+
+    def test_errors(self):
+        nodes = OrderedNodes([("a", 1), ("b", 2)])
+
+        with self.assertRaises(KeyError):
+            nodes.move_before("a", "missing")
+        with self.assertRaises(KeyError):
+            nodes.rename("a", "b")
+
+        self.assertEqual(["a", "b"], list(nodes))
+
+
+class OrderingCases(CaseBase):
+    def render(self, config: IniConfig) -> str:
+        text_io = io.StringIO()
+        config.renderer.render(text_io, config, config.flavour)
+        return text_io.getvalue()
+
+    def test_insert_option(self):
+        config = self.load_config(CONTENT)
+        server = config["server"]
+
+        server.insert_option("scheme", "http", before="port")
+        server.insert_option("timeout", "10", after="port")
+        server.insert_option("host", "remote", before="scheme")
+
+        self.assertEqual(["host", "scheme", "port", "timeout"], list(server))
+        self.assertEqual("remote", server["host"])
+
+        with self.assertRaises(KeyError):
+            server.insert_option("other", "1", before="missing")
+        with self.assertRaises(SimpliniError):
+            server.insert_option("other", "1", before="port", after="port")
+
+        self.assertNotIn("other", server)
+
+    def test_rename_option(self):
+        config = self.load_config(CONTENT)
+        server = config["server"]
+        events = []
+        config.subscribe(events.append)
+
+        option = server.rename_option("port", "listen_port")
+
+        self.assertEqual(["listen_port", "host"], list(server))
+        self.assertEqual("listen_port", option.name)
+        self.assertEqual(["listening port"], option.comment)
+        self.assertEqual([[("server", "port"), ("server", "listen_port")]], events)
+
+        with self.assertRaises(SimpliniError):
+            server.rename_option("listen_port", "host")
+        with self.assertRaises(KeyError):
+            server.rename_option("port", "other")
+
+        rendered = self.render(config)
+        self.assertIn('# listening port\nlisten_port = "80"', rendered)
+        self.assertLess(rendered.index("listen_port"), rendered.index("host"))
+
+    def test_sections(self):
+        config = self.load_config(CONTENT)
+
+        config.move_section("logging", before="server")
+        config.move_section("server")
+        section = config.rename_section("client", "http_client")
+
+        self.assertEqual(["logging", "http_client", "server"], list(config))
+        self.assertEqual("http_client", section.name)
+        self.assertIs(section, config["http_client"])
+        self.assertNotIn("client", config)
+        rendered = self.render(config)
+        self.assertLess(rendered.index("[logging]"), rendered.index("[http_client]"))
+        self.assertLess(rendered.index("[http_client]"), rendered.index("[server]"))
+
+        with self.assertRaises(SimpliniError):
+            config.rename_section("server", "logging")
+        with self.assertRaises(SimpliniError):
+            config.rename_section("server", "")
+        with self.assertRaises(KeyError):
+            config.move_section("client")
+
+    def test_key_index(self):
+        config = self.load_config(CONTENT)
+        config.enable_key_index()
+
+        config.rename_section("server", "Server")
+        config["Server"].rename_option("port", "Port")
+
+        self.assertEqual("80", config.find("PORT", "SERVER"))
+
+        with self.assertRaises(KeyCollisionError):
+            config.rename_section("client", "LOGGING")
+
+        self.assertIsNotNone(config.find_section("client"))
+
+    def test_clone_is_independent(self):
+        config = self.load_config(CONTENT)
+        clone = config.clone()
+
+        clone["server"].rename_option("port", "listen_port")
+        clone["server"].move_option("host", before="listen_port")
+        clone.rename_section("client", "http_client")
+
+        self.assertEqual(["port", "host"], list(config["server"]))
+        self.assertEqual("port", config.get_option("port", "server").name)
+        self.assertEqual(["server", "client", "logging"], list(config))
+        self.assertEqual(["host", "listen_port"], list(clone["server"]))
+
+    def test_transaction_rollback(self):
+        config = self.load_config(CONTENT)
+        expected = self.render(config)
+
+        with self.assertRaises(ValueError):
+            with config.transaction():
+                config["server"].rename_option("port", "listen_port")
+                config["server"].insert_option("scheme", "http", before="host")
+                config.rename_section("client", "http_client")
+                config.move_section("logging", after="server")
+                raise ValueError()
+
+        self.assertEqual(expected, self.render(config))
+        self.assertEqual("client", config["client"].name)
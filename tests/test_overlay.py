@@ -0,0 +1,86 @@
+import io
+
+from simplini import (
+    ConversionError,
+    EnvironmentOption,
+    EnvironmentOverlay,
+)
+from tests.common import CaseBase
+
+CONTENT = "debug = no\n[database]\n# port to connect to\nport = 5432\nhost = db\n"
+
+
+class EnvironmentOverlayCases(CaseBase):
+    def test_overrides(self):
+        config = self.load_config(CONTENT)
+        environ = {"APP__DATABASE__PORT": "6432", "APP__DEBUG": "yes"}
+        overlay = EnvironmentOverlay(config, prefix="APP", environ=environ)
+
+        self.assertEqual("6432", overlay.get("port", "database"))
+        self.assertEqual(6432, overlay.get_as("port", int, "database"))
+        self.assertIs(True, overlay.get_as("debug", "bool"))
+        self.assertEqual("db", overlay.get("host", "database"))
+        self.assertIsNone(overlay.get("user", "database"))
+
+        port = overlay.get_option("port", "database")
+        self.assertIsInstance(port, EnvironmentOption)
+        self.assertEqual("APP__DATABASE__PORT", port.variable_name)
+        self.assertEqual(["port to connect to"], port.comment)
+        self.assertTrue(overlay.is_overridden("port", "database"))
+
+        host = overlay.get_option("host", "database")
+        self.assertNotIsInstance(host, EnvironmentOption)
+        self.assertFalse(overlay.is_overridden("host", "database"))
+
+        # config itself is untouched
+        self.assertEqual("5432", config.get("port", "database"))
+        text_io = io.StringIO()
+        config.renderer.render(text_io, config, config.flavour)
+        self.assertNotIn("6432", text_io.getvalue())
+
+    def test_options_missing_in_config(self):
+        config = self.load_config(CONTENT)
+        environ = {"DATABASE__USER": "admin"}
+        overlay = EnvironmentOverlay(config, environ=environ)
+
+        self.assertEqual("admin", overlay.get("user", "database"))
+        self.assertIsNone(config.get("user", "database"))
+
+    def test_cache_and_refresh(self):
+        config = self.load_config(CONTENT)
+        environ = {}
+        overlay = EnvironmentOverlay(config, prefix="APP", environ=environ)
+
+        self.assertEqual("db", overlay.get("host", "database"))
+
+        environ["APP__DATABASE__HOST"] = "replica"
+        self.assertEqual("db", overlay.get("host", "database"))
+
+        overlay.refresh()
+        self.assertEqual("replica", overlay.get("host", "database"))
+
+        # values coming from the config are not cached
+        config.set("port", "1", "database")
+        self.assertEqual("1", overlay.get("port", "database"))
+
+    def test_custom_naming_scheme(self):
+        config = self.load_config(CONTENT)
+
+        def naming_scheme(section_name: str, option_name: str) -> str:
+            return f"{section_name}.{option_name}"
+
+        overlay = EnvironmentOverlay(
+            config, naming_scheme=naming_scheme, environ={"database.host": "x"}
+        )
+        self.assertEqual("x", overlay.get("host", "database"))
+
+    def test_conversion_errors(self):
+        config = self.load_config(CONTENT)
+        overlay = EnvironmentOverlay(
+            config, prefix="APP", environ={"APP__DATABASE__PORT": "none"}
+        )
+
+        with self.assertRaises(ConversionError) as ctx:
+            overlay.get_as("port", int, "database")
+
+        self.assertIn("APP__DATABASE__PORT", str(ctx.exception))
@@ -0,0 +1,201 @@
+import fnmatch
+import random
+import re
+import sys
+from unittest import mock
+
+from simplini import IniConfig
+from simplini.query import SortedNames, required_literals
+from tests.common import CaseBase
+
+CONTENT = (
+    "timeout = 5\n"
+    "[service.api]\n"
+    "# upstream address\n"
+    "url = http://localhost:8080\n"
+    "http.timeout = 30\n"
+    "[service.worker]\n"
+    "queue.timeout = 10\n"
+    "broker = amqp://LocalHost\n"
+    "[database]\n"
+    "host = db.local ; primary\n"
+    "timeout = 15\n"
+)
+
+
+class QueryCases(CaseBase):
+    def names(self, result):
+        return [(section_name, option.name) for section_name, option in result]
+
+    def test_globs(self):
+        config = self.load_config(CONTENT)
+
+        self.assertEqual(
+            [("service.api", "http.timeout"), ("service.worker", "queue.timeout")],
+            self.names(config.query("service.*", "*.timeout")),
+        )
+        self.assertEqual(
+            [("", "timeout"), ("database", "timeout")],
+            self.names(config.query("*", "timeout")),
+        )
+        self.assertEqual(
+            [("database", "host"), ("database", "timeout")],
+            self.names(config.query("database")),
+        )
+        self.assertEqual([], config.query("missing"))
+        self.assertEqual([], config.query("*", "missing*"))
+
+    def test_value_and_comment_search(self):
+        config = self.load_config(CONTENT)
+
+        self.assertEqual(
+            [("service.api", "url")],
+            self.names(config.query(value_regex="localhost")),
+        )
+        self.assertEqual(
+            [("service.api", "url"), ("service.worker", "broker")],
+            self.names(config.query(value_regex=re.compile("localhost", re.I))),
+        )
+        self.assertEqual(
+            [("service.api", "url")],
+            self.names(config.query(value_regex=r"localhost:\d+$")),
+        )
+        self.assertEqual(
+            [("database", "host")],
+            self.names(config.query("data*", comment_regex="primary")),
+        )
+        self.assertEqual(
+            [("service.api", "url")],
+            self.names(config.query(comment_regex="upstream", value_regex="http")),
+        )
+
+    def test_index_follows_changes(self):
+        config = self.load_config(CONTENT)
+        self.assertEqual(2, len(config.query("service.*", "*.timeout")))
+
+        config.set("grpc.timeout", "3", "service.api")
+        config.set("url", "http://remote", "service.api")
+        del config["service.worker"]
+        config.ensure_section("service.new").set("dial.timeout", "1")
+
+        self.assertEqual(
+            [
+                ("service.api", "grpc.timeout"),
+                ("service.api", "http.timeout"),
+                ("service.new", "dial.timeout"),
+            ],
+            self.names(config.query("service.*", "*.timeout")),
+        )
+        self.assertEqual([], config.query(value_regex="localhost"))
+
+        # direct modifications have to be reported
+        option = config.get_option("host", "database")
+        option.value = "localhost"
+        config.get_section("database").notify_change("host")
+        self.assertEqual(
+            [("database", "host")], self.names(config.query(value_regex="localhost"))
+        )
+
+    def test_sorted_names(self):
+        names = SortedNames()
+        for name in ["b", "a", "c"]:
+            names.add(name)
+
+        # names added in bulk are sorted once
+        with mock.patch("bisect.insort", side_effect=AssertionError):
+            self.assertEqual(["a", "b", "c"], names.match("*"))
+
+        names.add("ab")
+        names.remove("c")
+        self.assertEqual(["a", "ab", "b"], names.match("*"))
+        self.assertEqual(["b", "ab"], names.match("*b"))
+
+    def test_required_literals(self):
+        self.assertEqual(["localhost"], required_literals(re.compile("localhost")))
+        self.assertEqual(
+            ["abc", "xyz"], required_literals(re.compile(r"abcd?[0-9]+xyz"))
+        )
+        self.assertEqual(["a.b"], required_literals(re.compile(r"a\.b\d")))
+        self.assertEqual([], required_literals(re.compile(r"(abc)+de")))
+        self.assertIsNone(required_literals(re.compile("abc|def")))
+
+        # arguments of the quantifiers and escapes are not literals
+        self.assertEqual(["bcd"], required_literals(re.compile(r"a{10,20}bcd")))
+        self.assertEqual([], required_literals(re.compile(r"\x66oo")))
+        self.assertEqual(["abc"], required_literals(re.compile(r"\u00e9abc")))
+        if sys.version_info >= (3, 8):
+            # named escapes are supported since 3.8
+            pattern = re.compile(r"\N{DEGREE SIGN}abc")
+            self.assertEqual(["abc"], required_literals(pattern))
+
+    def test_escapes_match_brute_force(self):
+        config = IniConfig()
+        section = config.ensure_section("values")
+        values = ["foo", "aaaaaaaaaaaa", "\u00e9abc", "\u00b0 north", "xx yy", "S4"]
+        for idx, value in enumerate(values):
+            section.set(f"value_{idx}", value)
+
+        patterns = [
+            r"\x66oo",
+            r"a{10,20}",
+            r"a{3}",
+            r"\u00e9abc",
+            r"\U000000e9ab",
+            r"(x)\1 yy",
+            r"\123",
+            r"\x20yy",
+        ]
+        if sys.version_info >= (3, 8):
+            patterns.append(r"\N{DEGREE SIGN} north")
+
+        for pattern in patterns:
+            expected = [
+                ("values", option_name)
+                for option_name, option in section.options.items()
+                if re.search(pattern, option.value)
+            ]
+            self.assertTrue(expected, pattern)
+            self.assertEqual(
+                sorted(expected), self.names(config.query(value_regex=pattern)), pattern
+            )
+
+    def test_matches_brute_force(self):
+        rnd = random.Random(42)
+        config = IniConfig()
+        words = ["alpha", "beta", "gamma", "delta", "Alpha", "x"]
+
+        for section_idx in range(30):
+            section = config.ensure_section(
+                f"{rnd.choice(words)}.{section_idx}.{rnd.choice(words)}"
+            )
+            for option_idx in range(20):
+                section.set(
+                    f"{rnd.choice(words)}_{option_idx % 7}",
+                    " ".join(rnd.choice(words) for _ in range(3)),
+                )
+
+        queries = [
+            ("alpha.*", "*", None),
+            ("*.beta", "gamma_*", None),
+            ("*", "*_3", "alpha gamma"),
+            ("*", "*", "(?i)alpha"),
+            ("*.1?.*", "[ab]*", r"^beta\b"),
+            ("*", "*", "bet?a"),
+        ]
+
+        for section_glob, option_glob, value_regex in queries:
+            expected = []
+            for section_name, section in config.sections.items():
+                if not fnmatch.fnmatchcase(section_name, section_glob):
+                    continue
+                for option_name, option in section.options.items():
+                    if not fnmatch.fnmatchcase(option_name, option_glob):
+                        continue
+                    if value_regex and not re.search(value_regex, option.value):
+                        continue
+                    expected.append((section_name, option_name))
+
+            actual = self.names(
+                config.query(section_glob, option_glob, value_regex=value_regex)
+            )
+            self.assertEqual(sorted(expected), actual, (section_glob, option_glob))
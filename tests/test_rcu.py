@@ -0,0 +1,129 @@
+import threading
+
+from simplini import ConcurrentIniConfig, IniConfig
+from tests.common import CaseBase
+
+
+class ConcurrentConfigCases(CaseBase):
+    def create(self) -> ConcurrentIniConfig:
+        config = IniConfig()
+        config.set("a", "0", "counter")
+        config.set("b", "0", "counter")
+        return ConcurrentIniConfig(config)
+
+    def test_edit_publishes_new_version(self):
+        concurrent = self.create()
+        snapshot = concurrent.snapshot()
+
+        with concurrent.edit() as config:
+            config.set("a", "1", "counter")
+            config.set("b", "1", "counter")
+            # not visible until the edit is done
+            self.assertEqual("0", concurrent.get("a", "counter"))
+
+        self.assertEqual(1, concurrent.version)
+        self.assertEqual("1", concurrent.get("b", "counter"))
+        self.assertEqual("0", snapshot.get("a", "counter"))
+
+        self.assertEqual(2, concurrent.set("c", "2", "counter"))
+        self.assertEqual("2", concurrent.get("c", "counter"))
+
+    def test_failed_edit_is_discarded(self):
+        concurrent = self.create()
+
+        with self.assertRaises(RuntimeError):
+            with concurrent.edit() as config:
+                config.set("a", "1", "counter")
+                raise RuntimeError("failed")
+
+        self.assertEqual(0, concurrent.version)
+        self.assertEqual("0", concurrent.get("a", "counter"))
+
+        with concurrent.edit() as config:
+            self.assertEqual("0", config.get("a", "counter"))
+
+    def test_replace(self):
+        concurrent = self.create()
+        replacement = IniConfig()
+        replacement.set("x", "1")
+
+        self.assertEqual(1, concurrent.replace(replacement))
+        replacement.set("x", "2")
+
+        self.assertEqual("1", concurrent.get("x"))
+        self.assertIsNone(concurrent.get("a", "counter"))
+
+    def test_initial_config_is_not_shared(self):
+        config = IniConfig()
+        config.set("x", "1")
+        concurrent = ConcurrentIniConfig(config)
+
+        config.set("x", "2")
+        with concurrent.edit() as edited:
+            edited.set("y", "1")
+
+        self.assertEqual("1", concurrent.get("x"))
+        self.assertEqual("2", config.get("x"))
+        self.assertIsNone(config.get("y"))
+
+    def test_wait_for_change(self):
+        concurrent = self.create()
+
+        self.assertEqual(0, concurrent.wait_for_change(0, timeout=0.01))
+
+        timer = threading.Timer(0.05, concurrent.set, ("a", "1", "counter"))
+        timer.start()
+        self.assertEqual(1, concurrent.wait_for_change(0, timeout=10))
+        timer.join()
+
+        # returns right away when already changed
+        self.assertEqual(1, concurrent.wait_for_change(0))
+
+    def test_stress(self):
+        # readers must always see both counters equal as they are updated
+        # within a single edit, versions must never go backwards
+        concurrent = self.create()
+        writers_count, readers_count, edits_count = 4, 8, 200
+        errors = []
+        done = threading.Event()
+
+        def write():
+            for _ in range(edits_count):
+                with concurrent.edit() as config:
+                    value = str(int(config.get("a", "counter")) + 1)
+                    config.set("a", value, "counter")
+                    config.set("b", value, "counter")
+
+        def read():
+            last_version = 0
+            while not done.is_set():
+                version = concurrent.version
+                snapshot = concurrent.snapshot()
+                if snapshot.get("a", "counter") != snapshot.get("b", "counter"):
+                    errors.append("inconsistent snapshot")
+                if version < last_version:
+                    errors.append("version went backwards")
+                last_version = version
+
+        def wait():
+            version = 0
+            while version < writers_count * edits_count:
+                version = concurrent.wait_for_change(version, timeout=10)
+
+        readers = [threading.Thread(target=read) for _ in range(readers_count)]
+        writers = [threading.Thread(target=write) for _ in range(writers_count)]
+        waiter = threading.Thread(target=wait)
+
+        for thread in [*readers, *writers, waiter]:
+            thread.start()
+        for thread in [*writers, waiter]:
+            thread.join()
+        done.set()
+        for thread in readers:
+            thread.join()
+
+        self.assertEqual([], errors)
+        self.assertEqual(writers_count * edits_count, concurrent.version)
+        self.assertEqual(
+            str(writers_count * edits_count), concurrent.get("a", "counter")
+        )
@@ -108,3 +108,39 @@ class RenderCases(CaseBase):
         # read-back and ensure the same content
         config2 = IniConfig.load(path)
         self.assertEqual(config.as_dict(), config2.as_dict())
+
+    def test_render_plan(self):
+        config = IniConfig.load(os.path.join(FIXTURES_DIR, "sample.ini"))
+
+        plan = config.compile_render_plan()
+
+        path = self.get_temp_path()
+        config.save(path)
+        self.assertEqual(self.get_text(path), plan.render())
+
+        overrides = {
+            ("", "value_1"): "new value",
+            ("", "value_5"): 'multi\nline "value"',
+        }
+
+        for (section_name, option_name), value in overrides.items():
+            config.set(option_name, value, section_name=section_name)
+
+        config.save(path)
+        self.assertEqual(self.get_text(path), plan.render(overrides))
+
+    def test_render_plan_with_holes(self):
+        config = IniConfig()
+        config.set("host", "localhost", section_name="db")
+        config.set("port", "5432", section_name="db")
+        config.set("name", "app")
+
+        plan = config.compile_render_plan(holes=[("db", "host")])
+
+        self.assertEqual(
+            'name = "app"\n\n[db]\n\nhost = "db.local"\n\nport = "5432"\n',
+            plan.render({("db", "host"): "db.local"}),
+        )
+
+        with self.assertRaisesRegex(RenderingError, "not overridable"):
+            plan.render({("db", "port"): "1"})
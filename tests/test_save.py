@@ -0,0 +1,91 @@
+import os
+import stat
+
+from simplini import IniConfig
+from tests.common import CaseBase
+
+
+class SaveCases(CaseBase):
+    def create_config(self) -> IniConfig:
+        config = IniConfig()
+        config.set("foo", "bar")
+        config.set("spam", "eggs", section_name="section")
+        return config
+
+    def test_atomic_save(self):
+        path = self.get_temp_path()
+        config = self.create_config()
+
+        self.assertTrue(config.save(path, atomic=True))
+
+        loaded = IniConfig.load(path)
+        self.assertEqual(config.as_dict(), loaded.as_dict())
+
+        # no temp files are left behind
+        directory = os.path.dirname(path)
+        leftovers = [
+            name
+            for name in os.listdir(directory)
+            if name.startswith(f".{os.path.basename(path)}.")
+        ]
+        self.assertEqual([], leftovers)
+
+    def test_atomic_save_produces_same_content(self):
+        config = self.create_config()
+
+        path1 = self.get_temp_path()
+        path2 = self.get_temp_path()
+
+        config.save(path1)
+        config.save(path2, atomic=True)
+
+        self.assertEqual(self.get_text(path1), self.get_text(path2))
+
+    def test_atomic_save_preserves_file_mode(self):
+        path = self.get_temp_path()
+        os.chmod(path, 0o640)
+
+        self.create_config().save(path, atomic=True)
+
+        self.assertEqual(0o640, stat.S_IMODE(os.stat(path).st_mode))
+
+    def test_atomic_save_of_new_file_applies_umask(self):
+        path = self.get_temp_path()
+        os.unlink(path)
+
+        umask = os.umask(0o027)
+        try:
+            self.create_config().save(path, atomic=True)
+        finally:
+            os.umask(umask)
+
+        self.assertEqual(0o640, stat.S_IMODE(os.stat(path).st_mode))
+        # no temp files are left behind
+        directory, name = os.path.split(path)
+        self.assertEqual([name], [n for n in os.listdir(directory) if name in n])
+
+    def test_skip_unchanged(self):
+        path = self.get_temp_path()
+        config = self.create_config()
+
+        self.assertTrue(config.save(path, skip_unchanged=True))
+        mtime_ns = os.stat(path).st_mtime_ns
+        inode = os.stat(path).st_ino
+
+        # same content, nothing is written or replaced
+        os.utime(path, ns=(mtime_ns - 10**9, mtime_ns - 10**9))
+        self.assertFalse(config.save(path, atomic=True, skip_unchanged=True))
+        self.assertEqual(mtime_ns - 10**9, os.stat(path).st_mtime_ns)
+        self.assertEqual(inode, os.stat(path).st_ino)
+
+        config.set("foo", "changed")
+        self.assertTrue(config.save(path, atomic=True, skip_unchanged=True))
+        self.assertEqual("changed", IniConfig.load(path).get("foo"))
+
+    def test_skip_unchanged_when_target_is_missing(self):
+        path = self.get_temp_path()
+        os.unlink(path)
+
+        config = self.create_config()
+        self.assertTrue(config.save(path, atomic=True, skip_unchanged=True))
+        self.assertEqual(config.as_dict(), IniConfig.load(path).as_dict())
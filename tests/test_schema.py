@@ -0,0 +1,75 @@
+import datetime
+
+from simplini import IniConfig, Schema, SchemaValidationError
+from simplini.schema import Option, Section
+from tests.common import CaseBase
+
+
+class SchemaCases(CaseBase):
+    def create_schema(self, allow_unknown: bool = True) -> Schema:
+        return Schema(
+            {
+                "": {
+                    "name": Option(),
+                    "debug": Option("bool", default=False),
+                },
+                "database": {
+                    "host": Option(default="localhost"),
+                    "port": Option(int),
+                    "timeout": Option("duration", default=None),
+                },
+                "service.api": Section(
+                    {"max-workers": Option(int, default=4)},
+                    attribute="api",
+                ),
+            },
+            allow_unknown=allow_unknown,
+        )
+
+    def test_bind(self):
+        config = IniConfig()
+        config.set("name", "app")
+        config.set("port", "5432", section_name="database")
+        config.set("timeout", "30s", section_name="database")
+        config.set("max-workers", "16", section_name="service.api")
+
+        settings = self.create_schema().bind(config)
+
+        self.assertEqual("app", settings.name)
+        self.assertIs(False, settings.debug)
+        self.assertEqual("localhost", settings.database.host)
+        self.assertEqual(5432, settings.database.port)
+        self.assertEqual(datetime.timedelta(seconds=30), settings.database.timeout)
+        self.assertEqual(16, settings.api.max_workers)
+
+        # plain slots, no per instance dict
+        self.assertFalse(hasattr(settings.database, "__dict__"))
+
+    def test_all_errors_reported_together(self):
+        config = IniConfig()
+        config.set("debug", "maybe")
+        config.set("port", "not-a-number", section_name="database")
+        config.set("unknown", "value", section_name="database")
+        config.ensure_section("extra")
+
+        with self.assertRaises(SchemaValidationError) as ctx:
+            self.create_schema(allow_unknown=False).bind(config)
+
+        errors = ctx.exception.errors
+
+        self.assertEqual(5, len(errors), errors)
+        self.assertIn('Option "name" is missing in section ""', errors)
+        self.assertTrue(any('"debug"' in error for error in errors))
+        self.assertTrue(any('"port"' in error for error in errors))
+        self.assertIn('Unknown option "unknown" in section "database"', errors)
+        self.assertIn('Unknown section "extra"', errors)
+
+    def test_unknown_allowed_by_default(self):
+        config = IniConfig()
+        config.set("name", "app")
+        config.set("extra", "value")
+        config.set("port", "1", section_name="database")
+        config.set("foo", "bar", section_name="extra")
+
+        settings = self.create_schema().bind(config)
+        self.assertEqual(1, settings.database.port)
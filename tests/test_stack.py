@@ -0,0 +1,96 @@
+import io
+
+from simplini import IniConfig, IniConfigStack
+from tests.common import CaseBase
+
+
+class ConfigStackCases(CaseBase):
+    def create_stack(self):
+        defaults = IniConfig.from_dict(
+            {
+                "": {"name": "app", "debug": "no"},
+                "db": {"host": "localhost", "port": "5432"},
+            }
+        )
+        defaults.get_option("port", "db").comment = ["default port"]
+
+        host = IniConfig.from_dict({"db": {"host": "db.local"}, "host": {"id": "1"}})
+
+        stack = IniConfigStack([defaults, host])
+        self.addCleanup(stack.close)
+
+        return stack, defaults, host
+
+    def test_lookup(self):
+        stack, defaults, host = self.create_stack()
+
+        self.assertEqual("app", stack.get("name"))
+        self.assertEqual("db.local", stack.get("host", "db"))
+        self.assertEqual("5432", stack.get("port", "db"))
+        self.assertIsNone(stack.get("missing", "db"))
+        self.assertIsNone(stack.get("missing", "missing"))
+
+        self.assertIs(host, stack.get_source("host", "db"))
+        self.assertIs(defaults, stack.get_source("port", "db"))
+        self.assertIsNone(stack.get_source("missing", "db"))
+
+        self.assertEqual(
+            {"host": "db.local", "port": "5432"}, stack.get_section("db").as_dict()
+        )
+        self.assertIsNone(stack.get_section("missing"))
+        self.assertIn("host", stack)
+
+    def test_invalidation_on_changes(self):
+        stack, defaults, host = self.create_stack()
+
+        self.assertEqual("db.local", stack.get("host", "db"))
+        self.assertIsNone(stack.get("debug", "db"))
+
+        del host["db"]["host"]
+        self.assertEqual("localhost", stack.get("host", "db"))
+
+        host.set("debug", "yes", section_name="db")
+        self.assertEqual("yes", stack.get("debug", "db"))
+        self.assertEqual("yes", stack.get_section("db").get("debug"))
+
+        del defaults["db"]
+        self.assertIsNone(stack.get("port", "db"))
+        self.assertEqual({"debug": "yes"}, stack.get_section("db").as_dict())
+
+    def test_invalidation_on_reload(self):
+        path = self.gen_temp_config('[db]\nhost = "one"\n')
+        layer = IniConfig.load(path)
+
+        stack = IniConfigStack([IniConfig.from_dict({"db": {"host": "x"}}), layer])
+        self.addCleanup(stack.close)
+        self.assertEqual("one", stack.get("host", "db"))
+
+        with open(path, "w") as file:
+            file.write('[db]\nhost = "two"\n')
+
+        layer.reload()
+        self.assertEqual("two", stack.get("host", "db"))
+
+    def test_render(self):
+        stack, defaults, host = self.create_stack()
+
+        merged = stack.merged()
+        self.assertEqual(
+            {
+                "": {"name": "app", "debug": "no"},
+                "db": {"host": "db.local", "port": "5432"},
+                "host": {"id": "1"},
+            },
+            merged.as_dict(),
+        )
+        self.assertEqual(["default port"], merged.get_option("port", "db").comment)
+
+        text_io = io.StringIO()
+        stack.render(text_io)
+        self.assertIn("# default port", text_io.getvalue())
+
+        text_io = io.StringIO()
+        stack.render(text_io, layer=1)
+        self.assertEqual(
+            '[db]\n\nhost = "db.local"\n\n[host]\n\nid = "1"\n', text_io.getvalue()
+        )
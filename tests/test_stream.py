@@ -0,0 +1,116 @@
+import io
+
+from simplini import IniConfig, IniStreamWriter
+from simplini.core import ValuePresentationStyle
+from simplini.renderer import RenderingError, ValuesRenderingStyle
+from tests.common import CaseBase
+
+
+class NonSeekableTextIO:
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, s: str) -> int:
+        self.chunks.append(s)
+        return len(s)
+
+    def tell(self) -> int:
+        raise OSError("not seekable")
+
+    def getvalue(self) -> str:
+        return "".join(self.chunks)
+
+
+class StreamWriterCases(CaseBase):
+    def test_same_output_as_config_rendering(self):
+        config = IniConfig()
+        config.unnamed_section.comment = ["unnamed section comment"]
+        config.set("foo", "bar")
+        section = config.ensure_section("section")
+        section.comment = ["section comment"]
+        section.inline_comment = "inline"
+        option = section.set("multi", "multi\nline")
+        option.comment = ["option comment"]
+        option.inline_comment = "option inline"
+        section.set("quoted", 'with "quotes" and \\ # ;')
+        config.ensure_section("empty")
+        config.trailing_comment = ["trailing", "comment"]
+
+        path = self.get_temp_path()
+        config.save(path)
+
+        text_io = io.StringIO()
+        writer = IniStreamWriter(text_io)
+        writer.begin_section("", comment=["unnamed section comment"])
+        writer.write_option("foo", "bar")
+        writer.begin_section(
+            "section", comment=["section comment"], inline_comment="inline"
+        )
+        writer.write_option(
+            "multi",
+            "multi\nline",
+            comment=["option comment"],
+            inline_comment="option inline",
+        )
+        writer.write_option("quoted", 'with "quotes" and \\ # ;')
+        writer.begin_section("empty")
+        writer.write_trailing_comment(["trailing", "comment"])
+
+        self.assertEqual(self.get_text(path), text_io.getvalue())
+
+    def test_non_seekable_output(self):
+        output = NonSeekableTextIO()
+        writer = IniStreamWriter(output)
+        writer.write_option("foo", "bar")
+        writer.begin_section("section")
+        writer.write_option("spam", "eggs")
+
+        path = self.gen_temp_config(output.getvalue())
+        self.assertEqual(
+            {"": {"foo": "bar"}, "section": {"spam": "eggs"}},
+            IniConfig.load(path).as_dict(),
+        )
+
+    def test_style_respected_with_prefer_source(self):
+        text_io = io.StringIO()
+        writer = IniStreamWriter(text_io)
+        writer.renderer.values_rendering_style = ValuesRenderingStyle.PREFER_SOURCE
+        writer.write_option("foo", "bar", style=ValuePresentationStyle.UNQUOTED)
+        writer.write_option("spam", "eggs", style=ValuePresentationStyle.QUOTED)
+
+        self.assertEqual('foo = bar\n\nspam = "eggs"\n', text_io.getvalue())
+
+    def test_duplicates_are_rejected(self):
+        writer = IniStreamWriter(io.StringIO())
+        writer.begin_section("foo")
+        writer.write_option("bar", "1")
+
+        with self.assertRaisesRegex(RenderingError, 'Option "bar" was written'):
+            writer.write_option("bar", "2")
+
+        writer.begin_section("spam")
+        # same option name in another section is fine
+        writer.write_option("bar", "3")
+
+        with self.assertRaisesRegex(RenderingError, 'Section "foo" was written'):
+            writer.begin_section("foo")
+
+    def test_unnamed_section_rules(self):
+        writer = IniStreamWriter(io.StringIO())
+        writer.flavour.allow_unnamed_section = False
+
+        with self.assertRaisesRegex(RenderingError, "Unnamed section is not allowed"):
+            writer.write_option("foo", "bar")
+
+        writer = IniStreamWriter(io.StringIO())
+        writer.begin_section("foo")
+
+        with self.assertRaisesRegex(RenderingError, "has to be the first one"):
+            writer.begin_section("")
+
+    def test_nothing_after_trailing_comment(self):
+        writer = IniStreamWriter(io.StringIO())
+        writer.write_trailing_comment(["the end"])
+
+        with self.assertRaises(RenderingError):
+            writer.write_option("foo", "bar")
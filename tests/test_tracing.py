@@ -0,0 +1,130 @@
+import json
+import os
+
+from simplini import AccessTracer, EnvironmentOverlay, IniConfig, Schema
+from simplini.journal import JOURNAL_SUFFIX
+from simplini.schema import Option
+from tests.common import SAMPLE_CONFIG, CaseBase
+
+
+class TracingCases(CaseBase):
+    def test_counts(self):
+        config = IniConfig.from_dict(SAMPLE_CONFIG)
+        tracer = config.enable_tracing()
+
+        config.get("port", "server")
+        config.get_int("port", "server")
+        config["server"]["port"]
+        self.assertIn("host", config["server"])
+        config.get_option("name")
+        config.get("missing", "server")
+        config.get("other", "missing")
+
+        self.assertEqual(3, tracer.count("port", "server"))
+        self.assertEqual(1, tracer.count("host", "server"))
+        self.assertEqual(1, tracer.count("name"))
+        self.assertEqual(1, tracer.count("missing", "server"))
+        self.assertEqual(1, tracer.count("other", "missing"))
+        self.assertEqual(0, tracer.count("timeout", "client"))
+
+        self.assertEqual([("client", "timeout")], tracer.unused())
+        self.assertEqual([(("server", "port"), 3)], tracer.hottest(1))
+
+    def test_sections_added_later(self):
+        config = IniConfig.from_dict(SAMPLE_CONFIG)
+        tracer = config.enable_tracing()
+
+        config.ensure_section("extra").set("key", "value")
+        config.replace_contents(IniConfig.from_dict({"new": {"a": "1"}}))
+        config.get("a", "new")
+
+        self.assertEqual(1, tracer.count("a", "new"))
+        self.assertEqual({"a": 1}, tracer.as_dict()["new"])
+        self.assertIs(tracer, config["new"].tracer)
+
+    def test_internal_lookups(self):
+        path = self.gen_temp_config("[server]\nport = 80\n")
+        config = IniConfig.load(path)
+        tracer = config.enable_tracing()
+
+        self.addCleanup(os.unlink, path + JOURNAL_SUFFIX)
+        config.enable_journal(path)
+        for idx in range(5):
+            config.set("port", str(idx), "server")
+        config.disable_journal()
+
+        overlay = EnvironmentOverlay(config, environ={"SERVER__PORT": "8080"})
+        self.assertEqual("8080", overlay.get("port", "server"))
+
+        self.assertEqual(0, tracer.count("port", "server"))
+        self.assertEqual([("server", "port")], tracer.unused())
+
+        # bound options are looked up once, missing ones included
+        schema = Schema({"server": {"port": Option(int), "host": Option(default="")}})
+        schema.bind(config)
+
+        self.assertEqual(1, tracer.count("port", "server"))
+        self.assertEqual(1, tracer.count("host", "server"))
+
+    def test_disable(self):
+        config = IniConfig.from_dict(SAMPLE_CONFIG)
+        tracer = config.enable_tracing()
+        config.disable_tracing()
+
+        config.get("port", "server")
+
+        self.assertEqual(0, tracer.count("port", "server"))
+        self.assertIsNone(config["server"].tracer)
+
+    def test_shared_tracer_and_reset(self):
+        tracer = AccessTracer()
+        first, second = (
+            IniConfig.from_dict(SAMPLE_CONFIG),
+            IniConfig.from_dict(SAMPLE_CONFIG),
+        )
+        first.enable_tracing(tracer)
+        second.enable_tracing(tracer)
+
+        first.get("port", "server")
+        second.get("port", "server")
+        self.assertEqual(2, tracer.count("port", "server"))
+
+        tracer.reset()
+        self.assertEqual(0, tracer.count("port", "server"))
+        self.assertEqual(4, len(tracer.unused()))
+
+    def test_dump(self):
+        config = IniConfig.from_dict(SAMPLE_CONFIG)
+        tracer = config.enable_tracing()
+        config.get("port", "server")
+        config.get("port", "server")
+        config.get("name")
+
+        path = self.get_temp_path()
+        tracer.dump(path)
+
+        with open(path, encoding="utf-8") as file:
+            records = json.load(file)
+
+        self.assertEqual(
+            {"section": "server", "option": "port", "count": 2}, records[0]
+        )
+        self.assertEqual({"section": "", "option": "name", "count": 1}, records[1])
+        self.assertEqual(4, len(records))
+
+    def test_dump_at_exit(self):
+        tracer = AccessTracer()
+        path = self.get_temp_path()
+
+        tracer.dump_at_exit(path)
+        tracer.dump_on_exit()
+        self.assertTrue(os.path.exists(path))
+
+        with open(path, "w") as file:
+            file.write("unchanged")
+
+        tracer.cancel_dump_at_exit()
+        tracer.dump_on_exit()
+
+        with open(path) as file:
+            self.assertEqual("unchanged", file.read())
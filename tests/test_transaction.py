@@ -0,0 +1,227 @@
+import contextlib
+import os
+import time
+
+from simplini import IniConfig
+from simplini.core import SimpliniError
+from simplini.interpolation import Interpolator
+from simplini.journal import JOURNAL_SUFFIX
+from simplini.stack import IniConfigStack
+from tests.common import SAMPLE_CONFIG, CaseBase
+
+
+class TransactionCases(CaseBase):
+    def test_commit(self):
+        config = IniConfig.from_dict(SAMPLE_CONFIG)
+
+        with config.transaction():
+            config.set("port", "8080", "server")
+            del config["client"]
+            config.ensure_section("new").set("key", "value")
+
+        self.assertEqual(
+            {
+                "": {"name": "app"},
+                "server": {"host": "localhost", "port": "8080"},
+                "new": {"key": "value"},
+            },
+            config.as_dict(),
+        )
+        self.assertIsNone(config.active_transaction)
+
+        # copy-on-write mode is only kept for the changed sections
+        self.assertFalse(config["new"].options_shared)
+        self.assertIsNone(config.unnamed_section.owned_options)
+
+    def test_rollback(self):
+        config = IniConfig.from_dict(SAMPLE_CONFIG)
+        expected = config.as_dict()
+        server = config["server"]
+        port = server.get_option("port")
+
+        with self.assertRaises(ValueError):
+            with config.transaction():
+                config.set("port", "8080", "server")
+                config.set("name", "other")
+                del config["server"]["host"]
+                config["client"].comment = ["client settings"]
+                config.ensure_section("client").inline_comment = "inline"
+                del config["client"]
+                config.ensure_section("new").set("key", "value")
+                config.trailing_comment = ["trailing"]
+                raise ValueError("failure")
+
+        self.assertEqual(expected, config.as_dict())
+        self.assertEqual(["server", "client"], list(config))
+        self.assertIs(server, config["server"])
+        self.assertIs(config, config["client"].owner)
+        self.assertIsNone(config["client"].comment)
+        self.assertIsNone(config["client"].inline_comment)
+        self.assertIsNone(config.trailing_comment)
+        # options existing before the transaction were left intact
+        self.assertEqual("80", port.value)
+
+        # config is usable after the rollback
+        config.set("port", "81", "server")
+        self.assertEqual("81", config.get("port", "server"))
+
+    def test_rollback_restores_replaced_contents(self):
+        config = IniConfig.from_dict(SAMPLE_CONFIG)
+        expected = config.as_dict()
+
+        with self.assertRaises(KeyError):
+            with config.transaction():
+                config.replace_contents(IniConfig.from_dict({"other": {"a": "1"}}))
+                config["missing"]
+
+        self.assertEqual(expected, config.as_dict())
+
+    def test_rollback_with_key_index(self):
+        config = IniConfig.from_dict(SAMPLE_CONFIG)
+        config.enable_key_index()
+
+        with self.assertRaises(ValueError):
+            with config.transaction():
+                config.ensure_section("Extra").set("Key", "value")
+                del config["server"]["port"]
+                raise ValueError()
+
+        self.assertIsNone(config.find_section("extra"))
+        self.assertEqual("80", config.find("PORT", "server"))
+
+    def test_notifications(self):
+        config = IniConfig.from_dict(SAMPLE_CONFIG)
+        events = []
+        config.subscribe(events.append)
+
+        with config.transaction():
+            config.set("port", "1", "server")
+            config.set("port", "2", "server")
+            config.set("host", "remote", "server")
+
+        self.assertEqual([[("server", "port"), ("server", "host")]], events)
+
+        # rolled back changes are never seen
+        events.clear()
+        with self.assertRaises(ValueError):
+            with config.transaction():
+                config.set("timeout", "10", "client")
+                raise ValueError()
+
+        self.assertEqual([], events)
+        self.assertEqual("5", config.get("timeout", "client"))
+
+    def test_caches_inside_transaction(self):
+        config = IniConfig.from_dict(SAMPLE_CONFIG)
+        config.set("url", "${server:host}:${server:port}", "client")
+        stack = IniConfigStack([IniConfig(), config])
+        interpolator = Interpolator(config)
+
+        def current():
+            return (
+                stack.get("port", "server"),
+                interpolator.get("url", "client"),
+                [name for name, _ in config.query("*", "new")],
+            )
+
+        before = current()
+        self.assertEqual(("80", "localhost:80", []), before)
+
+        with self.assertRaises(ValueError):
+            with config.transaction():
+                config.set("port", "81", "server")
+                config.set("new", "1", "client")
+                self.assertEqual(("81", "localhost:81", ["client"]), current())
+                raise ValueError()
+
+        self.assertEqual(before, current())
+
+    def test_clone_inside_transaction(self):
+        for fail in (False, True):
+            with self.subTest(fail=fail):
+                config = IniConfig.from_dict(SAMPLE_CONFIG)
+
+                with (
+                    self.assertRaises(ValueError) if fail else contextlib.nullcontext()
+                ):
+                    with config.transaction():
+                        config.get("port", "server")
+                        clone = config.clone()
+                        if fail:
+                            raise ValueError()
+
+                config.set("port", "8080", "server")
+                config.set("name", "other")
+
+                self.assertEqual("80", clone.get("port", "server"))
+                self.assertEqual("app", clone.get("name"))
+
+    def test_autosave_and_journal_see_committed_changes_only(self):
+        path = self.gen_temp_config("[server]\nport = 80\n")
+        config = IniConfig.load(path)
+        config.enable_autosave(path, debounce=0.01, max_delay=0.05)
+
+        with self.assertRaises(ValueError):
+            with config.transaction():
+                config.set("port", "8080", "server")
+                time.sleep(0.1)
+                self.assertEqual("80", IniConfig.load(path).get("port", "server"))
+                raise ValueError()
+
+        with config.transaction():
+            config.set("port", "8081", "server")
+
+        config.disable_autosave()
+        self.assertEqual("8081", IniConfig.load(path).get("port", "server"))
+
+        journal_path = path + JOURNAL_SUFFIX
+        self.addCleanup(os.unlink, journal_path)
+        config.enable_journal(path)
+
+        with self.assertRaises(ValueError):
+            with config.transaction():
+                config.set("port", "1", "server")
+                raise ValueError()
+
+        self.assertEqual(0, os.path.getsize(journal_path))
+
+        with config.transaction():
+            config.set("port", "2", "server")
+            config.set("port", "3", "server")
+
+        self.assertGreater(os.path.getsize(journal_path), 0)
+        config.disable_journal()
+        self.assertEqual("3", IniConfig.load(path).get("port", "server"))
+
+    def test_nested(self):
+        config = IniConfig.from_dict(SAMPLE_CONFIG)
+
+        with config.transaction():
+            with self.assertRaises(SimpliniError):
+                with config.transaction():
+                    pass
+
+    def test_save_on_commit(self):
+        path = self.gen_temp_config("[server]\nport = 80\n")
+        config = IniConfig.load(path)
+        mtime = os.stat(path).st_mtime_ns
+
+        with self.assertRaises(ValueError):
+            with config.transaction(save=True):
+                config.set("port", "8080", "server")
+                raise ValueError()
+
+        self.assertEqual(mtime, os.stat(path).st_mtime_ns)
+
+        with config.transaction(save=True):
+            config.set("port", "8080", "server")
+            config.set("host", "remote", "server")
+
+        self.assertEqual("8080", IniConfig.load(path).get("port", "server"))
+
+    def test_save_requires_path(self):
+        config = IniConfig.from_dict(SAMPLE_CONFIG)
+
+        with self.assertRaises(SimpliniError):
+            with config.transaction(save=True):
+                pass
@@ -0,0 +1,114 @@
+import datetime
+import gc
+import weakref
+
+from simplini import ConversionError, IniConfig, register_converter
+from tests.common import CaseBase
+
+
+class TypedAccessorsCases(CaseBase):
+    def create_config(self) -> IniConfig:
+        config = IniConfig()
+        config.set("workers", "8")
+        section = config.ensure_section("server")
+        section.set("port", "8080")
+        section.set("ratio", "0.75")
+        section.set("debug", "Yes")
+        section.set("hosts", "a.local, b.local,c.local")
+        section.set("timeout", "1h 30m")
+        section.set("interval", "2.5")
+        section.set("empty", "")
+        section.set("broken", "nope")
+        return config
+
+    def test_typed_accessors(self):
+        config = self.create_config()
+        section = config.get_section("server")
+
+        self.assertEqual(8, config.get_int("workers"))
+        self.assertEqual(8080, config.get_int("port", "server"))
+        self.assertEqual(0.75, section.get_float("ratio"))
+        self.assertIs(True, section.get_bool("debug"))
+        self.assertEqual(["a.local", "b.local", "c.local"], section.get_list("hosts"))
+        self.assertEqual([], section.get_list("empty"))
+        self.assertEqual(
+            datetime.timedelta(hours=1, minutes=30), section.get_duration("timeout")
+        )
+        self.assertEqual(
+            datetime.timedelta(seconds=2.5), config.get_duration("interval", "server")
+        )
+
+    def test_defaults(self):
+        config = self.create_config()
+
+        self.assertEqual(1, config.get_int("missing", default=1))
+        self.assertEqual(2, config.get_int("missing", "missing_section", default=2))
+        self.assertIsNone(config.get_section("server").get_bool("missing"))
+        self.assertEqual(["x"], config.get_list("missing", "server", default=["x"]))
+
+    def test_conversion_errors(self):
+        section = self.create_config().get_section("server")
+
+        with self.assertRaisesRegex(ConversionError, 'option "broken"'):
+            section.get_int("broken")
+
+        with self.assertRaises(ValueError):
+            section.get_bool("broken")
+
+        with self.assertRaises(ValueError):
+            section.get_duration("broken")
+
+        # out of range durations are conversion errors too
+        for value in ("inf", "-inf", "nan", "1e20", "99999999999999w"):
+            section.set("broken", value)
+            with self.assertRaisesRegex(ConversionError, 'option "broken"'):
+                section.get_duration("broken")
+
+    def test_memoization_and_invalidation(self):
+        config = self.create_config()
+        calls = []
+
+        def to_upper(value: str) -> str:
+            calls.append(value)
+            return value.upper()
+
+        self.assertEqual("NOPE", config.get_as("broken", to_upper, "server"))
+        self.assertEqual("NOPE", config.get_as("broken", to_upper, "server"))
+        self.assertEqual(["nope"], calls)
+
+        config.set("broken", "fixed", section_name="server")
+        self.assertEqual("FIXED", config.get_as("broken", to_upper, "server"))
+        self.assertEqual(["nope", "fixed"], calls)
+
+        config.set("port", "9090", section_name="server")
+        self.assertEqual(9090, config.get_int("port", "server"))
+
+    def test_ad_hoc_converters_are_not_kept(self):
+        config = self.create_config()
+        converter = lambda value: value.upper()  # noqa: E731
+        converter_ref = weakref.ref(converter)
+
+        self.assertEqual("NOPE", config.get_as("broken", converter, "server"))
+        self.assertEqual("nope", config.get_as("broken", str.lower, "server"))
+        del converter
+        gc.collect()
+
+        self.assertIsNone(converter_ref())
+
+    def test_shared_results_are_not_affected_by_callers(self):
+        section = self.create_config().get_section("server")
+
+        section.get_list("hosts").append("d.local")
+
+        self.assertEqual(["a.local", "b.local", "c.local"], section.get_list("hosts"))
+
+    def test_custom_converter(self):
+        register_converter("csv_ints", lambda v: tuple(int(x) for x in v.split(",")))
+
+        config = IniConfig()
+        config.set("ports", "1,2,3")
+
+        self.assertEqual((1, 2, 3), config.get_as("ports", "csv_ints"))
+
+        with self.assertRaises(KeyError):
+            config.get_as("ports", "not_registered")